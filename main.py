@@ -1,37 +1,49 @@
 import os
 import asyncio
 import subprocess
+import threading
 import time
 import json
 
-from typing import Any, Dict, Optional
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
 
 
 import decky  # pyright: ignore[reportMissingModuleSource]
 
+_IMPORT_START = time.perf_counter()
 
-from http_utils import do_request, parse_response  # pyright: ignore[reportMissingImports]
+# Only what Plugin.__init__ needs is imported here; every other helper module
+# is imported on first use or in _main.
 from config_utils import (  # pyright: ignore[reportMissingImports]
     read_config_yaml,
     load_json_settings,
     save_json_settings,
-)
-from file_utils import (  # pyright: ignore[reportMissingImports]
-    list_folder_files,
-    load_receive_history,
-    save_receive_history,
-    create_receive_history_entry,
-    write_temp_text_file,
+    diff_settings,
+    get_config_cache_stats,
+    SCOPE_HOT,
+    SCOPE_RESTART,
 )
 from notify_server import NotifyServer  # pyright: ignore[reportMissingImports]
 
+_IMPORT_MS = (time.perf_counter() - _IMPORT_START) * 1000
+
+# Notification types kept in the event log's small high-frequency ring
+_CHATTY_NOTIFICATIONS = ("device_discovered", "device_updated", "send_progress", "upload_progress")
+
 
 class Plugin:
     def __init__(self):
+        init_start = time.perf_counter()
+        # Plugin load phases in ms, logged once _main has run
+        self.startup_timings: Dict[str, float] = {"imports": round(_IMPORT_MS, 2)}
         self.loop = None
         self.process = None
         self.log_file = None
         self.backend_port = 53317
+        self.backend_ready_timeout = 10.0  # seconds to wait for the backend listener
+        self.backend_started_at: Optional[float] = None
+        self.startup_history: Deque[Dict[str, Any]] = deque(maxlen=20)
         self.config_path = os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, "localsend.yaml")
         self.upload_dir = os.path.join(decky.DECKY_PLUGIN_RUNTIME_DIR, "uploads")
         self.binary_path = os.path.join(decky.DECKY_PLUGIN_DIR, "bin", "localsend-core")
@@ -57,6 +69,29 @@ class Plugin:
         self.disable_info_logging = False
         self.scan_timeout = 500  # scan timeout in seconds, default 500
         self.network_interface = "*"  # "*" means all interfaces
+        self.log_max_bytes = 5 * 1024 * 1024  # rotate backend log at 5 MiB, 0 disables
+        self.log_backup_count = 3
+        self.log_compress = True
+        self.verify_checksum = False  # sha256 received files after the size check
+        self.dedup_received = False  # replace received duplicates with reflinks/hardlinks
+        self.free_space_margin_mb = 256  # space to keep free after an incoming session
+        self.low_space_action = "warn"  # "warn" or "reject" sessions that would not fit
+        self.log_rotate_interval = 60.0  # seconds between size checks
+        self.backend_log_path = os.path.join(decky.DECKY_PLUGIN_LOG_DIR, "localsend-backend.log")
+        self.log_rotate_task: Optional[asyncio.Task] = None
+        self.resource_sample_interval = 5.0  # seconds between backend /proc samples, 0 pauses
+        self.resource_sampler = None  # ResourceSampler, created in _main
+        self.priority_policy = "off"  # "off", "auto" (background while a game runs) or "background"
+        self.priority_foreground_signal = "steam_game"  # "steam_game" or "manual"
+        self.background_cpu_affinity = ""  # CPU list for the background profile, "" = all
+        self.priority_controller = None  # PriorityController, created in _main
+
+        # Setting name -> callback applying it to a running backend (see SETTING_SCOPES)
+        self.hot_setting_handlers: Dict[str, Callable[[], None]] = {
+            "priority_policy": self._reapply_priority,
+            "priority_foreground_signal": self._reapply_priority,
+            "background_cpu_affinity": self._reapply_priority,
+        }
         
         # Unix Domain Socket notification server
         self.socket_path = "/tmp/localsend-notify.sock"
@@ -66,17 +101,90 @@ class Plugin:
             logger_error=lambda msg: decky.logger.error(msg),
             logger_warning=lambda msg: decky.logger.warning(msg),
         )
-        self.notify_server.set_notification_handler(self._handle_notification)
-        
+        self.notify_server.set_notification_handler(self._on_notification)
+
+        # Backend crash detection / restart (BackendSupervisor, created in _main)
+        self.supervisor = None
+
+        # Every event emitted to the frontend, replayable through get_events_since (EventLog),
+        # and the queue flushing emits on the loop in submission order (EmitBatcher);
+        # both created on the first emit
+        self.event_log = None
+        self.emit_batcher = None
+
+        # Devices seen through device_discovered / device_updated notifications
+        # (DeviceRegistry, created on the first notification)
+        self.device_registry = None
+
         # Upload session tracking
         self.upload_sessions: Dict[str, Dict[str, Any]] = {}
+        # upload_end filesystem work (ThreadPoolExecutor, created on first upload) and its step timings
+        self.upload_end_pool = None
+        self.free_space_checker = None  # FreeSpaceChecker (cached statvfs), created on first upload
+        self.upload_end_timings: Deque[Dict[str, Any]] = deque(maxlen=50)
+        self.verify_pool = None  # low-priority ThreadPoolExecutor for post-receive checks
+        self.dedup_index = None  # DedupIndex, created on first deduplication
+        self.received_index = None  # ReceivedFileIndex (SQLite FTS), opened on first use
+        # Lazy helpers below are created from the upload-end worker, the verify pool and the loop
+        self._lazy_init_lock = threading.Lock()
+
+        # Text shared through Download API sessions (ShareTempStore, created on first use)
+        self.share_temp = None
+        self.share_temp_ttl = 24 * 3600.0  # seconds an unreferenced share_temp file is kept
+        self.share_temp_sweep_task: Optional[asyncio.Task] = None  # periodic sweep, every ttl / 4
+        self.share_temp_max_bytes = 64 * 1024 * 1024
+        self.dedup_totals: Dict[str, int] = {
+            "sessions": 0, "duplicates": 0, "reflinked": 0, "hardlinked": 0, "bytes_reclaimed": 0
+        }
+
+        # Outgoing sessions (OutgoingSessionStore), created on first send
+        self.outgoing_sessions = None
+        # Python-side send queue (SendQueue), created on first enqueue
+        self.send_queue = None
+
+        # Paginated folder scans (scan id -> FolderScan), dropped after folder_scan_ttl idle seconds
+        self.folder_scans: Dict[str, Any] = {}
+        self.folder_scan_ttl = 300.0
+        self.manifest_cache = None  # FolderManifestCache, created on first use
+        self.hash_cache = None  # HashCache, created on first use
+        self.send_baselines_path = os.path.join(decky.DECKY_PLUGIN_RUNTIME_DIR, "send-baselines.json")
+        # folder -> {displayPath: hash} of the last build_send_manifest, until marked as sent
+        self.pending_send_manifests: Dict[str, Dict[str, str]] = {}
         
-        # File receive history
+        # File receive history (loaded on first access or in the background after _main)
         self.receive_history_path = os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, "receive-history.json")
-        self.receive_history: list = []
+        self._receive_history: Optional[list] = None
+        # Guards loading, every mutation and every save; the upload-end worker, the
+        # verify pool, the notify thread and the loop all write history
+        self._receive_history_lock = threading.RLock()
+
+        # Per-callable latency histograms (PerfStats), set up in _main
+        self.perf_stats = None
 
+        # On-demand profiling (ProfileSession); None when inactive
+        self.profiler = None
+        self.profile_stop_handle: Optional[asyncio.TimerHandle] = None
+        self.profile_finish_task: Optional[asyncio.Task] = None
+        self.last_profile: Optional[Dict[str, Any]] = None
+
+        phase_start = time.perf_counter()
         self._load_settings()
-        self._load_receive_history()
+        self._record_startup_phase("settings", phase_start)
+        self._record_startup_phase("init", init_start)
+
+    def _record_startup_phase(self, phase: str, start: float):
+        self.startup_timings[phase] = round((time.perf_counter() - start) * 1000, 2)
+
+    @property
+    def receive_history(self) -> list:
+        if self._receive_history is None:
+            self._load_receive_history()
+        return self._receive_history
+
+    @receive_history.setter
+    def receive_history(self, value: list):
+        with self._receive_history_lock:
+            self._receive_history = value
 
     @property
     def backend_url(self) -> str:
@@ -105,6 +213,17 @@ class Plugin:
             "disable_info_logging": self.disable_info_logging,
             "download_folder": self.upload_dir,
             "scan_timeout": self.scan_timeout,
+            "log_max_bytes": self.log_max_bytes,
+            "log_backup_count": self.log_backup_count,
+            "log_compress": self.log_compress,
+            "verify_checksum": self.verify_checksum,
+            "dedup_received": self.dedup_received,
+            "free_space_margin_mb": self.free_space_margin_mb,
+            "low_space_action": self.low_space_action,
+            "resource_sample_interval": self.resource_sample_interval,
+            "priority_policy": self.priority_policy,
+            "priority_foreground_signal": self.priority_foreground_signal,
+            "background_cpu_affinity": self.background_cpu_affinity,
         }
 
     def _load_settings(self):
@@ -153,6 +272,35 @@ class Plugin:
                 self.scan_timeout = int(scan_timeout or 500)
             except (ValueError, TypeError):
                 self.scan_timeout = 500
+            try:
+                self.log_max_bytes = max(int(data.get("log_max_bytes", self.log_max_bytes)), 0)
+                self.log_backup_count = max(int(data.get("log_backup_count", self.log_backup_count)), 0)
+            except (ValueError, TypeError):
+                pass
+            self.log_compress = bool(data.get("log_compress", self.log_compress))
+            self.verify_checksum = bool(data.get("verify_checksum", self.verify_checksum))
+            self.dedup_received = bool(data.get("dedup_received", self.dedup_received))
+            try:
+                self.free_space_margin_mb = max(int(data.get("free_space_margin_mb", self.free_space_margin_mb)), 0)
+            except (ValueError, TypeError):
+                pass
+            if data.get("low_space_action") in ("warn", "reject"):
+                self.low_space_action = data["low_space_action"]
+            from resource_monitor import clamp_sample_interval  # pyright: ignore[reportMissingImports]
+
+            try:
+                self.resource_sample_interval = clamp_sample_interval(
+                    data.get("resource_sample_interval", self.resource_sample_interval)
+                )
+            except (ValueError, TypeError):
+                pass
+            from priority_utils import PRIORITY_POLICIES, FOREGROUND_SIGNALS  # pyright: ignore[reportMissingImports]
+
+            if data.get("priority_policy") in PRIORITY_POLICIES:
+                self.priority_policy = data["priority_policy"]
+            if data.get("priority_foreground_signal") in FOREGROUND_SIGNALS:
+                self.priority_foreground_signal = data["priority_foreground_signal"]
+            self.background_cpu_affinity = str(data.get("background_cpu_affinity", self.background_cpu_affinity)).strip()
             upload_dir = str(data.get("download_folder", "")).strip()
             if upload_dir:
                 self.upload_dir = upload_dir
@@ -161,19 +309,36 @@ class Plugin:
             decky.logger.warning(f"Failed to load settings: {e}")
 
     def _load_receive_history(self):
-        """Load file receive history from disk"""
-        self.receive_history = load_receive_history(
-            self.receive_history_path,
-            logger=lambda msg: decky.logger.info(msg)
-        )
+        """Load file receive history from disk (once; safe to call from any thread)"""
+        from file_utils import load_receive_history  # pyright: ignore[reportMissingImports]
+
+        with self._receive_history_lock:
+            if self._receive_history is not None:
+                return
+            start = time.perf_counter()
+            self._receive_history = load_receive_history(
+                self.receive_history_path,
+                logger=lambda msg: decky.logger.info(msg)
+            )
+            self._record_startup_phase("history", start)
 
     def _save_receive_history(self):
-        """Persist file receive history to disk"""
-        save_receive_history(
-            self.receive_history_path,
-            self.receive_history,
-            logger=lambda msg: decky.logger.error(msg)
-        )
+        """Persist file receive history to disk (holds the history lock while serializing)"""
+        from file_utils import save_receive_history  # pyright: ignore[reportMissingImports]
+
+        with self._receive_history_lock:
+            save_receive_history(
+                self.receive_history_path,
+                self.receive_history,
+                logger=lambda msg: decky.logger.error(msg)
+            )
+
+    def _update_receive_history_entry(self, entry: Dict[str, Any], **fields):
+        """Set fields on a history entry and persist (safe from any thread)"""
+        with self._receive_history_lock:
+            entry.update(fields)
+            if any(item is entry for item in self.receive_history):
+                self._save_receive_history()
 
     def _add_receive_history(
         self,
@@ -187,57 +352,42 @@ class Plugin:
         failed_files: Optional[int] = None,
         failed_file_ids: Optional[list] = None,
     ):
-        """Add a new entry to receive history"""
+        """Add a new entry to receive history; returns the entry (None when history is disabled)"""
+        from file_utils import create_receive_history_entry  # pyright: ignore[reportMissingImports]
+
         if not self.save_receive_history:
-            return
-        
-        entry = create_receive_history_entry(
-            folder_path=folder_path,
-            files=files,
-            title=title,
-            is_text=is_text,
-            text_content=text_content,
-            current_count=len(self.receive_history),
-            total_files=total_files,
-            success_files=success_files,
-            failed_files=failed_files,
-            failed_file_ids=failed_file_ids,
-        )
-        
-        self.receive_history.insert(0, entry)  # Insert at beginning (newest first)
+            return None
         
-        # Keep only last 100 records
-        if len(self.receive_history) > 100:
-            self.receive_history = self.receive_history[:100]
-        
-        self._save_receive_history()
+        with self._receive_history_lock:
+            entry = create_receive_history_entry(
+                folder_path=folder_path,
+                files=files,
+                title=title,
+                is_text=is_text,
+                text_content=text_content,
+                current_count=len(self.receive_history),
+                total_files=total_files,
+                success_files=success_files,
+                failed_files=failed_files,
+                failed_file_ids=failed_file_ids,
+            )
+
+            self.receive_history.insert(0, entry)  # Insert at beginning (newest first)
+
+            # Keep only last 100 records
+            if len(self.receive_history) > 100:
+                self.receive_history = self.receive_history[:100]
+
+            self._save_receive_history()
         if is_text:
             decky.logger.info(f"Added receive history (text): {len(text_content)} characters")
         else:
             decky.logger.info(f"Added receive history: {folder_path} ({len(files)} files)")
+        return entry
 
     def _save_settings(self):
         """Persist plugin settings to disk"""
-        settings = {
-            "alias": self.alias,
-            "legacy_mode": self.legacy_mode,
-            "use_mixed_scan": self.use_mixed_scan,
-            "skip_notify": self.skip_notify,
-            "multicast_address": self.multicast_address,
-            "multicast_port": self.multicast_port,
-            "pin": self.pin,
-            "auto_save": self.auto_save,
-            "auto_save_from_favorites": self.auto_save_from_favorites,
-            "use_https": self.use_https,
-            "network_interface": self.network_interface,
-            "notify_on_download": self.notify_on_download,
-            "save_receive_history": self.save_receive_history,
-            "use_download": self.use_download,
-            "do_not_make_session_folder": self.do_not_make_session_folder,
-            "disable_info_logging": self.disable_info_logging,
-            "download_folder": self.upload_dir,
-            "scan_timeout": self.scan_timeout,
-        }
+        settings = self._get_default_settings()
         save_json_settings(
             self.settings_path,
             settings,
@@ -249,38 +399,58 @@ class Plugin:
         os.makedirs(self.upload_dir, exist_ok=True)
         os.makedirs(decky.DECKY_PLUGIN_LOG_DIR, exist_ok=True)
 
-    def _emit_notification_safe(self, title: str, message: str):
-        """Safely emit notification from thread to main event loop"""
-        if self.loop is None or self.loop.is_closed():
-            decky.logger.warning("Event loop not available, skipping notification emit")
-            return
-        
+    def _emit(self, event: str, payload: Any) -> int:
+        """
+        Record an event in the event log and emit it to the frontend (safe from any thread).
+
+        Dict payloads are emitted with their event log sequence number as "_seq", so the
+        frontend can resume with get_events_since. Returns the sequence number.
+        """
+        seq = self._get_event_log().append(event, payload, chatty=self._is_chatty_event(event, payload))
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            decky.logger.warning(f"Event loop not available, skipping {event} emit")
+            return seq
+        if isinstance(payload, dict):
+            payload = {**payload, "_seq": seq}
+
         try:
-            asyncio.run_coroutine_threadsafe(
-                decky.emit("unix_socket_notification", {
-                    "type": "info",
-                    "title": title,
-                    "message": message,
-                }),
-                self.loop
-            )
+            # One ordered path for the loop and worker threads
+            self._get_emit_batcher().submit(event, payload)
         except Exception as e:
-            decky.logger.error(f"Failed to emit notification: {e}")
+            decky.logger.error(f"Failed to emit {event}: {e}")
+        return seq
+
+    @staticmethod
+    def _is_chatty_event(event: str, payload: Any) -> bool:
+        """High-frequency events: discovery / send progress notifications and unfinished send job updates"""
+        if not isinstance(payload, dict):
+            return False
+        if event == "unix_socket_notification":
+            return payload.get("type") in _CHATTY_NOTIFICATIONS
+        if event == "send_queue":
+            return (payload.get("job") or {}).get("state") not in ("done", "failed", "cancelled")
+        return False
+
+    def _emit_notification_safe(self, title: str, message: str):
+        """Safely emit notification from thread to main event loop"""
+        self._emit("unix_socket_notification", {
+            "type": "info",
+            "title": title,
+            "message": message,
+        })
 
     def _emit_notification_event(self, payload: dict):
         """Emit full notification payload to frontend"""
-        if self.loop is None or self.loop.is_closed():
-            decky.logger.warning("Event loop not available, skipping notification emit")
-            return
-
-        try:
-            asyncio.run_coroutine_threadsafe(
-                decky.emit("unix_socket_notification", payload),
-                self.loop
-            )
-        except Exception as e:
-            decky.logger.error(f"Failed to emit notification: {e}")
+        self._emit("unix_socket_notification", payload)
     
+    def _on_notification(self, notification: dict):
+        """Notify-thread entry point; profiles the handler while a CPU profile is active"""
+        profiler = self.profiler
+        if profiler is None:
+            return self._handle_notification(notification)
+        return profiler.run(self._handle_notification, notification)
+
     def _handle_notification(self, notification: dict):
         """Handle incoming notification from Go backend"""
         try:
@@ -300,6 +470,7 @@ class Plugin:
 
             # device_discovered / device_updated: no session payload, skip upload logic
             if notification_type in ('device_discovered', 'device_updated'):
+                self._get_device_registry().update(notification_data)
                 decky.logger.debug(f"Device notification: {notification_type} - {title}: {message}")
                 return
 
@@ -317,15 +488,12 @@ class Plugin:
                     is_text=True,
                     text_content=content
                 )
-                asyncio.run_coroutine_threadsafe(
-                    decky.emit("text_received", {
-                        "title": display_title,
-                        "content": content,
-                        "fileName": file_name,
-                        "sessionId": session_id,
-                    }),
-                    self.loop
-                )
+                self._emit("text_received", {
+                    "title": display_title,
+                    "content": content,
+                    "fileName": file_name,
+                    "sessionId": session_id,
+                })
                 decky.logger.info(f"📝 Text received (no upload) from {from_alias}: {len(content)} chars")
                 return
 
@@ -352,8 +520,10 @@ class Plugin:
                             'is_text_only': is_text_only,
                             'do_not_make_session_folder': do_not_make_session_folder,
                             'upload_folder': upload_folder,
+                            'peer': notification_data.get('from') or '',
                         }
                     }
+                self._preflight_free_space(session_id, upload_folder, total_size)
                 
                 # Save each file's information
                 for file_info in files:
@@ -371,10 +541,12 @@ class Plugin:
                         'file_type': file_type,
                         'start_time': time.time(),
                         'status': 'uploading',
-                        'is_text_only': is_text_only
+                        'is_text_only': is_text_only,
+                        'sha256': file_info.get('sha256') or '',
                     }
                 
             elif notification_type == 'upload_end':
+                self._release_free_space(session_id)
                 # New format: session-level summary (guard against null from backend)
                 total_files = notification_data.get('totalFiles') or 0
                 success_files = notification_data.get('successFiles') or 0
@@ -410,7 +582,7 @@ class Plugin:
                     else:
                         files_in_folder = []
                 else:
-                    files_in_folder = os.listdir(folder_path) if os.path.isdir(folder_path) else []
+                    files_in_folder = None  # listed by the upload-end worker
 
                 decky.logger.info(f"✅ Upload session completed: {session_id}")
                 decky.logger.info(f"   Total: {total_files}, Success: {success_files}, Failed: {failed_files}")
@@ -430,79 +602,44 @@ class Plugin:
                         file_session['end_time'] = time.time()
                         duration = file_session['end_time'] - file_session.get('start_time', 0)
                         decky.logger.info(f"   File {fid}: {file_session['status']} ({duration:.2f}s)")
-                
-                # Check if this is a text-only session
-                if is_text_only:
-                    decky.logger.info(f"📝 Text-only notification detected")
-                    # Read text content from uploaded file
-                    try:
-                        file_path = folder_path
-                        txt_files = [f for f in os.listdir(file_path) if f.endswith('.txt')]
-                        text_file_name = txt_files[0] if txt_files else ''
-                        if text_file_name and os.path.exists(os.path.join(file_path, text_file_name)):
-                            with open(os.path.join(file_path, text_file_name), 'r', encoding='utf-8') as f:
-                                text_content = f.read()
-                            
-                            # Save to receive history
-                            self._add_receive_history(
-                                folder_path=file_path,
-                                files=[text_file_name],
-                                title=title or "Text Received",
-                                is_text=True,
-                                text_content=text_content
-                            )
-                            
-                            # Send text content to frontend with special event type
-                            asyncio.run_coroutine_threadsafe(
-                                decky.emit("text_received", {
-                                    "title": title or "Text Received",
-                                    "content": text_content,
-                                    "fileName": text_file_name
-                                }),
-                                self.loop
-                            )
-                            decky.logger.info(f"📝 Text content sent to frontend: {len(text_content)} characters")
-                        else:
-                            decky.logger.warning(f"Text file not found: {file_path}")
-                    except Exception as e:
-                        decky.logger.error(f"Failed to read text content: {e}")
-                else:
-                    # Send file received notification if enabled
-                    try:
-                        # Save to receive history (use display path and actual totals)
-                        self._add_receive_history(
-                            display_folder_path,
-                            files_in_folder,
-                            title or "File Received",
-                            total_files=total_files,
-                            success_files=success_files,
-                            failed_files=failed_files,
-                            failed_file_ids=failed_file_ids,
-                        )
-                        
-                        # Send notification if enabled (folderPath = receive root; fileCount = actual total)
-                        if self.notify_on_download:
-                            asyncio.run_coroutine_threadsafe(
-                                decky.emit("file_received", {
-                                    "title": title or "File Received",
-                                    "folderPath": display_folder_path,
-                                    "fileCount": total_files,
-                                    "files": files_in_folder,
-                                    "totalFiles": total_files,
-                                    "successFiles": success_files,
-                                    "failedFiles": failed_files,
-                                    "failedFileIds": failed_file_ids
-                                }),
-                                self.loop
-                            )
-                            decky.logger.info(f"📁 File received notification sent: {display_folder_path}")
-                    except Exception as e:
-                        decky.logger.error(f"Failed to send file received notification: {e}")
+
+                # Folder listing, text read and history write run off the notify thread
+                self._submit_upload_end({
+                    "session_id": session_id,
+                    "title": title,
+                    "is_text_only": is_text_only,
+                    "folder_path": folder_path,
+                    "display_folder_path": display_folder_path,
+                    "files": files_in_folder,
+                    "total_files": total_files,
+                    "success_files": success_files,
+                    "failed_files": failed_files,
+                    "failed_file_ids": failed_file_ids,
+                    "save_paths": save_paths,
+                    "peer": notification_data.get('from')
+                    or self.upload_sessions.get(session_id, {}).get('_meta', {}).get('peer', ''),
+                    "announced": {
+                        fid: info for fid, info in self.upload_sessions.get(session_id, {}).items() if fid != '_meta'
+                    },
+                })
                     
+            elif notification_type == 'upload_cancelled':
+                self._release_free_space(session_id)
             elif notification_type == 'info':
                 decky.logger.info(f"ℹ️  {title}: {message}")
-            elif notification_type == 'send_progress':
+            elif notification_type in ('send_progress', 'send_finished'):
                 # Sender-side progress; already forwarded to frontend via _emit_notification_event
+                if notification_type == 'send_progress' and self.outgoing_sessions is not None:
+                    # upload-batch only reports files that failed before it returned
+                    self.outgoing_sessions.record_progress(
+                        session_id,
+                        str(notification_data.get('fileId') or ''),
+                        bool(notification_data.get('success')),
+                    )
+                if self.send_queue is not None and self.loop is not None:
+                    self.loop.call_soon_threadsafe(
+                        self.send_queue.handle_notification, notification_type, notification_data
+                    )
                 return
             else:
                 decky.logger.warning(f"⚠️  Unknown notification type: {notification_type}")
@@ -513,21 +650,299 @@ class Plugin:
                 f"Error processing notification: {str(e)}"
             )
 
-    def _is_running(self) -> bool:
-        return self.process is not None and self.process.poll() is None
+    def _preflight_free_space(self, session_id: str, upload_folder: str, total_size: int):
+        """Warn about (or reject) an incoming session that would not fit on disk"""
+        if not total_size or total_size <= 0:
+            return
+        if self.free_space_checker is None:
+            from disk_utils import FreeSpaceChecker  # pyright: ignore[reportMissingImports]
+
+            self.free_space_checker = FreeSpaceChecker(ttl=2.0)
+        folder = upload_folder or self.upload_dir
+        if not os.path.isabs(folder):
+            folder = os.path.join(os.path.abspath(self.upload_dir), folder)
+        result = self.free_space_checker.check(
+            folder, total_size, self.free_space_margin_mb * 1024 * 1024, reserve_as=session_id
+        )
+        if result["ok"]:
+            return
 
-    def _start_backend(self):
-        if self._is_running():
+        reject = self.low_space_action == "reject"
+        if not reject:
+            # The session goes ahead, so later sessions must see its space as used
+            self.free_space_checker.reserve(session_id, folder, total_size)
+        decky.logger.warning(
+            f"Not enough free space for session {session_id}: {total_size} bytes incoming, "
+            f"{result['free']} free in {folder} (margin {self.free_space_margin_mb} MiB)"
+            + ("; rejecting" if reject else "")
+        )
+        meta = self.upload_sessions.get(session_id, {}).get('_meta')
+        if meta is not None:
+            meta['low_space'] = True
+        mib = 1024 * 1024
+        available = (result['free'] or 0) - result['reserved']
+        self._emit_notification_event({
+            "type": "low_disk_space",
+            "title": "Not enough free space",
+            "message": (
+                f"Incoming transfer needs {total_size / mib:.1f} MiB, "
+                f"{max(available, 0) / mib:.1f} MiB available"
+                + ("; transfer rejected" if reject else "")
+            ),
+            "data": {"sessionId": session_id, "action": self.low_space_action, **result},
+        })
+        if reject and self.loop is not None:
+            from disk_utils import receive_cancel_path  # pyright: ignore[reportMissingImports]
+
+            asyncio.run_coroutine_threadsafe(
+                self._proxy_request("POST", receive_cancel_path(session_id)),
+                self.loop
+            )
+
+    def _release_free_space(self, session_id: str):
+        """Drop the free-space reservation of a finished or cancelled incoming session"""
+        if self.free_space_checker is not None and session_id:
+            self.free_space_checker.release(session_id)
+
+    def _forget_backend_sessions(self):
+        """Sessions live in the backend; drop what was kept for them when it stops or crashes"""
+        self._release_share_sessions()
+        if self.free_space_checker is not None and self.free_space_checker.clear():
+            decky.logger.info("Dropped free-space reservations of unfinished incoming sessions")
+
+    def _submit_upload_end(self, job: Dict[str, Any]):
+        """Queue the filesystem part of an upload_end notification"""
+        if self.upload_end_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # One worker keeps history entries in arrival order
+            self.upload_end_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="localsend-upload-end")
+        job["submitted"] = time.perf_counter()
+        future = self.upload_end_pool.submit(self._finish_upload_end, job)
+        future.add_done_callback(self._on_upload_end_done)
+
+    def _finish_upload_end(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """List the received folder, read text-only payloads, write history and notify the frontend"""
+        run_start = time.perf_counter()
+        timings: Dict[str, float] = {"queued": round((run_start - job["submitted"]) * 1000, 2)}
+        title = job["title"]
+        folder_path = job["folder_path"]
+
+        if job["is_text_only"]:
+            decky.logger.info(f"📝 Text-only notification detected")
+            # Read text content from uploaded file
+            try:
+                start = time.perf_counter()
+                txt_files = [f for f in os.listdir(folder_path) if f.endswith('.txt')]
+                text_file_name = txt_files[0] if txt_files else ''
+                timings["list_folder"] = round((time.perf_counter() - start) * 1000, 2)
+                if text_file_name and os.path.exists(os.path.join(folder_path, text_file_name)):
+                    start = time.perf_counter()
+                    with open(os.path.join(folder_path, text_file_name), 'r', encoding='utf-8') as f:
+                        text_content = f.read()
+                    timings["read_text"] = round((time.perf_counter() - start) * 1000, 2)
+
+                    # Save to receive history
+                    start = time.perf_counter()
+                    self._add_receive_history(
+                        folder_path=folder_path,
+                        files=[text_file_name],
+                        title=title or "Text Received",
+                        is_text=True,
+                        text_content=text_content
+                    )
+                    timings["history"] = round((time.perf_counter() - start) * 1000, 2)
+
+                    # Send text content to frontend with special event type
+                    self._emit("text_received", {
+                        "title": title or "Text Received",
+                        "content": text_content,
+                        "fileName": text_file_name
+                    })
+                    decky.logger.info(f"📝 Text content sent to frontend: {len(text_content)} characters")
+                else:
+                    decky.logger.warning(f"Text file not found: {folder_path}")
+            except Exception as e:
+                decky.logger.error(f"Failed to read text content: {e}")
+        else:
+            files_in_folder = job["files"]
+            if files_in_folder is None:
+                start = time.perf_counter()
+                files_in_folder = os.listdir(folder_path) if os.path.isdir(folder_path) else []
+                timings["list_folder"] = round((time.perf_counter() - start) * 1000, 2)
+            # Send file received notification if enabled
+            try:
+                # Save to receive history (use display path and actual totals)
+                start = time.perf_counter()
+                entry = self._add_receive_history(
+                    job["display_folder_path"],
+                    files_in_folder,
+                    title or "File Received",
+                    total_files=job["total_files"],
+                    success_files=job["success_files"],
+                    failed_files=job["failed_files"],
+                    failed_file_ids=job["failed_file_ids"],
+                )
+                timings["history"] = round((time.perf_counter() - start) * 1000, 2)
+                if job["save_paths"]:
+                    start = time.perf_counter()
+                    self._get_received_index().add_files(
+                        list(job["save_paths"].values()), session_id=job["session_id"], peer=job["peer"]
+                    )
+                    timings["index"] = round((time.perf_counter() - start) * 1000, 2)
+                    self._submit_verification(job, entry)
+
+                # Send notification if enabled (folderPath = receive root; fileCount = actual total)
+                if self.notify_on_download:
+                    self._emit("file_received", {
+                        "title": title or "File Received",
+                        "folderPath": job["display_folder_path"],
+                        "fileCount": job["total_files"],
+                        "files": files_in_folder,
+                        "totalFiles": job["total_files"],
+                        "successFiles": job["success_files"],
+                        "failedFiles": job["failed_files"],
+                        "failedFileIds": job["failed_file_ids"]
+                    })
+                    decky.logger.info(f"📁 File received notification sent: {job['display_folder_path']}")
+            except Exception as e:
+                decky.logger.error(f"Failed to send file received notification: {e}")
+
+        timings["total"] = round((time.perf_counter() - job["submitted"]) * 1000, 2)
+        return {"session_id": job["session_id"], "finished": time.time(), "timings_ms": timings}
+
+    def _submit_verification(self, job: Dict[str, Any], entry: Optional[Dict[str, Any]]):
+        """Queue size (and optional checksum) checks of saved files on the low-priority pool"""
+        from verify_utils import build_verify_list, lower_thread_priority  # pyright: ignore[reportMissingImports]
+
+        items = build_verify_list(job["save_paths"], job["announced"], skip_ids=job["failed_file_ids"])
+        if not items:
             return
-        if not os.path.exists(self.binary_path):
-            raise FileNotFoundError(f"backend binary not found: {self.binary_path}")
+        if self.verify_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
 
-        self._ensure_dirs()
-        log_path = os.path.join(decky.DECKY_PLUGIN_LOG_DIR, "localsend-backend.log")
-        self.log_file = open(log_path, "a", encoding="utf-8")
-        env = os.environ.copy()
+            self.verify_pool = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="localsend-verify",
+                initializer=lower_thread_priority,
+            )
+        self.verify_pool.submit(self._verify_received, job["session_id"], items, entry)
+
+    def _verify_received(self, session_id: str, items: list, entry: Optional[Dict[str, Any]]):
+        """Verify saved files and attach the result to their receive history entry"""
+        from verify_utils import verify_received_files  # pyright: ignore[reportMissingImports]
+
+        try:
+            # With dedup on, the verification digests seed the hash cache it reads
+            hash_cache = self._get_hash_cache() if self.verify_checksum and self.dedup_received else None
+            result = verify_received_files(
+                items,
+                checksum=self.verify_checksum,
+                hash_cache=hash_cache,
+                logger=lambda msg: decky.logger.error(msg)
+            )
+            fields: Dict[str, Any] = {"verification": result}
+            if self.dedup_received:
+                bad = set(result["missing"]) | set(result["mismatched"])
+                fields["dedup"] = self._dedup_received([i["path"] for i in items if i["fileId"] not in bad])
+            if entry is not None:
+                self._update_receive_history_entry(entry, **fields)
+            if result["status"] != "ok":
+                decky.logger.warning(
+                    f"Verification of session {session_id}: {result['status']} "
+                    f"(missing={result['missing']}, mismatched={result['mismatched']})"
+                )
+            self._emit("receive_verified", {
+                "sessionId": session_id,
+                "historyId": entry["id"] if entry is not None else "",
+                **result,
+            })
+        except Exception as e:
+            decky.logger.error(f"Failed to verify session {session_id}: {e}")
+
+    def _get_event_log(self):
+        with self._lazy_init_lock:
+            if self.event_log is None:
+                from event_log import EventLog  # pyright: ignore[reportMissingImports]
+
+                self.event_log = EventLog(capacity=500, chatty_capacity=100, max_text_chars=512)
+            return self.event_log
 
-        # Build startup command
+    def _get_emit_batcher(self):
+        with self._lazy_init_lock:
+            if self.emit_batcher is None:
+                from emit_batcher import EmitBatcher  # pyright: ignore[reportMissingImports]
+
+                self.emit_batcher = EmitBatcher(
+                    emit=decky.emit,
+                    get_loop=lambda: self.loop,
+                    logger_error=lambda msg: decky.logger.error(msg),
+                )
+            return self.emit_batcher
+
+    def _get_device_registry(self):
+        with self._lazy_init_lock:
+            if self.device_registry is None:
+                from device_registry import DeviceRegistry  # pyright: ignore[reportMissingImports]
+
+                self.device_registry = DeviceRegistry(ttl=300.0)
+            return self.device_registry
+
+    def _get_received_index(self):
+        with self._lazy_init_lock:
+            if self.received_index is None:
+                from received_index import ReceivedFileIndex  # pyright: ignore[reportMissingImports]
+
+                self.received_index = ReceivedFileIndex(
+                    os.path.join(decky.DECKY_PLUGIN_RUNTIME_DIR, "received-files.db"),
+                    logger=lambda msg: decky.logger.error(msg)
+                )
+            return self.received_index
+
+    def _dedup_received(self, paths: list) -> Dict[str, Any]:
+        """Replace received files already stored elsewhere with reflinks/hardlinks"""
+        from dedup_utils import DedupIndex, dedup_files  # pyright: ignore[reportMissingImports]
+
+        if self.dedup_index is None:
+            self.dedup_index = DedupIndex(
+                os.path.join(decky.DECKY_PLUGIN_RUNTIME_DIR, "dedup-index.json"),
+                logger=lambda msg: decky.logger.error(msg)
+            )
+        hash_cache = self._get_hash_cache()
+        result = dedup_files(
+            paths,
+            self.dedup_index,
+            hash_cache=hash_cache,
+            logger=lambda msg: decky.logger.warning(msg)
+        )
+        hash_cache.save()
+        linked = result.pop("linked_paths")
+        if linked:
+            # Links carry the original's mtime; keep the search index in step
+            self._get_received_index().refresh(linked)
+        self.dedup_totals["sessions"] += 1
+        for key in ("duplicates", "reflinked", "hardlinked", "bytes_reclaimed"):
+            self.dedup_totals[key] += result[key]
+        if result["duplicates"]:
+            decky.logger.info(
+                f"Deduplicated {result['duplicates']} received files, reclaimed {result['bytes_reclaimed']} bytes"
+            )
+        return result
+
+    def _on_upload_end_done(self, future):
+        try:
+            result = future.result()
+        except Exception as e:
+            decky.logger.error(f"Upload finalization failed: {e}")
+            return
+        self.upload_end_timings.append(result)
+        decky.logger.debug(f"Upload {result['session_id']} finalized: {result['timings_ms']}")
+
+    def _is_running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def _build_backend_cmd(self) -> list:
+        """Build the backend command line from current settings"""
         log_level = "none" if self.disable_info_logging else "prod"
         cmd = [
             self.binary_path,
@@ -559,7 +974,25 @@ class Plugin:
             cmd.append("-useDownload")
         if self.do_not_make_session_folder:
             cmd.append("-doNotMakeSessionFolder")
+        return cmd
+
+    def _start_backend(self) -> bool:
+        """Spawn the backend process. Returns True if a new process was started."""
+        if self._is_running():
+            return False
+        if not os.path.exists(self.binary_path):
+            raise FileNotFoundError(f"backend binary not found: {self.binary_path}")
 
+        self._ensure_dirs()
+        if self.log_file:
+            # Left open by a process that exited on its own
+            self.log_file.close()
+        self._rotate_backend_log()
+        self.log_file = open(self.backend_log_path, "a", encoding="utf-8")
+        env = os.environ.copy()
+        cmd = self._build_backend_cmd()
+
+        self.backend_started_at = time.monotonic()
         self.process = subprocess.Popen(
             cmd,
             stdout=self.log_file,
@@ -567,8 +1000,87 @@ class Plugin:
             env=env,
         )
         decky.logger.info(f"localsend backend started with config: {self.config_path}")
+        return True
+
+    async def _wait_backend_ready(self, reason: str = "") -> bool:
+        """Wait until the backend accepts connections and record time-to-ready"""
+        from backend_utils import wait_for_port, create_startup_record  # pyright: ignore[reportMissingImports]
+
+        started_at = self.backend_started_at or time.monotonic()
+        process = self.process
+        loop = asyncio.get_event_loop()
+        ready = await loop.run_in_executor(
+            None,
+            lambda: wait_for_port(
+                "127.0.0.1",
+                self.backend_port,
+                timeout=self.backend_ready_timeout,
+                is_alive=lambda: process is not None and process.poll() is None,
+                logger=lambda msg: decky.logger.warning(msg),
+            )
+        )
+        record = create_startup_record(
+            started_at,
+            ready,
+            reason=reason,
+            pid=process.pid if process is not None else None,
+        )
+        self.startup_history.append(record)
+        if ready:
+            decky.logger.info(f"localsend backend ready in {record['time_to_ready_ms']:.0f} ms")
+        else:
+            decky.logger.error(f"localsend backend not ready after {record['time_to_ready_ms']:.0f} ms")
+        return ready
+
+    def _rotate_backend_log(self) -> bool:
+        from log_utils import rotate_log  # pyright: ignore[reportMissingImports]
+
+        rotated = rotate_log(
+            self.backend_log_path,
+            self.log_max_bytes,
+            self.log_backup_count,
+            compress=self.log_compress,
+            logger=lambda msg: decky.logger.error(msg)
+        )
+        if rotated:
+            decky.logger.info(f"Rotated backend log: {self.backend_log_path}")
+        return rotated
+
+    async def _rotate_backend_log_loop(self):
+        """Periodically rotate the backend log while the plugin is loaded"""
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(self.log_rotate_interval)
+            try:
+                await loop.run_in_executor(None, self._rotate_backend_log)
+            except Exception as e:
+                decky.logger.error(f"Backend log rotation failed: {e}")
+
+    async def _restart_backend_after_crash(self) -> bool:
+        """Restart callback used by the supervisor"""
+        self._start_backend()
+        return await self._wait_backend_ready(reason="supervisor")
+
+    def _on_backend_exit(self, exit_code: Optional[int], will_restart: bool, delay: float):
+        """Notify frontend that the backend exited without being asked to"""
+        self._forget_backend_sessions()
+        if will_restart:
+            message = f"Backend exited with code {exit_code}, restarting in {delay:.0f}s"
+        else:
+            message = f"Backend keeps crashing (last exit code {exit_code}), not restarting"
+        self._emit_notification_event({
+            "type": "backend_exited",
+            "title": "LocalSend backend stopped",
+            "message": message,
+            "data": {
+                "exitCode": exit_code,
+                "willRestart": will_restart,
+                "restartDelay": delay,
+            },
+        })
 
     def _stop_backend(self):
+        self._forget_backend_sessions()
         if not self._is_running():
             return
         self.process.terminate()
@@ -587,8 +1099,12 @@ class Plugin:
     async def start_backend(self):
         try:
             self.notify_server.start()
-            self._start_backend()
-            return {"running": True, "url": self.backend_url}
+            ready = True
+            if self.supervisor is not None:
+                self.supervisor.reset()
+            if self._start_backend():
+                ready = await self._wait_backend_ready(reason="user")
+            return {"running": self._is_running(), "ready": ready, "url": self.backend_url}
         except Exception as error:
             decky.logger.error(f"failed to start backend: {error}")
             return {"running": False, "error": str(error), "url": self.backend_url}
@@ -598,9 +1114,140 @@ class Plugin:
         return {"running": False, "url": self.backend_url}
 
     async def get_backend_status(self):
-        return {"running": self._is_running(), "url": self.backend_url}
+        return {
+            "running": self._is_running(),
+            "url": self.backend_url,
+            "supervisor": self.supervisor.get_metrics() if self.supervisor is not None else None,
+            "priority": self.priority_controller.get_status() if self.priority_controller is not None else None,
+        }
+
+    # used in frontend to drive the "manual" priority foreground signal.
+    async def set_foreground_active(self, active: bool):
+        """Report whether something latency-sensitive is in the foreground (priority_foreground_signal="manual")"""
+        if self.priority_controller is None:
+            return {"success": False, "error": "Priority controller not started"}
+        self.priority_controller.set_foreground(active)
+        loop = asyncio.get_event_loop()
+        status = await loop.run_in_executor(None, self.priority_controller.evaluate)
+        return {"success": True, "priority": status}
+
+    def _reapply_priority(self):
+        """Re-evaluate the backend priority profile now instead of at the next poll"""
+        if self.priority_controller is None:
+            return
+        loop = asyncio.get_event_loop()
+        asyncio.ensure_future(loop.run_in_executor(None, lambda: self.priority_controller.evaluate(force=True)))
+
+    # used in frontend to show recent backend output.
+    async def tail_backend_log(self, lines: int = 100, since_offset: Optional[int] = None):
+        """Get the last lines of the backend log; pass the returned offset back to poll for new output"""
+        from log_utils import tail_log  # pyright: ignore[reportMissingImports]
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: tail_log(
+                self.backend_log_path,
+                lines=lines,
+                since_offset=since_offset,
+                logger=lambda msg: decky.logger.error(msg)
+            )
+        )
+
+    # used in frontend to inspect backend cold-start latency.
+    async def get_backend_startup_history(self):
+        """Get recent backend startup records (newest last) with a summary"""
+        from backend_utils import summarize_startup_history  # pyright: ignore[reportMissingImports]
+
+        history = list(self.startup_history)
+        return {
+            "history": history,
+            "summary": summarize_startup_history(history),
+        }
+
+    # used in frontend to chart backend CPU, memory and disk usage.
+    async def get_backend_resources(self, limit: int = 0):
+        """Get recent /proc samples of the backend process (oldest first)"""
+        if self.resource_sampler is None:
+            return {"running": self._is_running(), "interval": self.resource_sample_interval, "latest": None, "samples": []}
+        result = self.resource_sampler.get_samples(limit=int(limit or 0))
+        result["running"] = self._is_running()
+        return result
+
+    # used in frontend to inspect per-callable latency and error counts.
+    async def get_perf_stats(self, reset: bool = False):
+        """Get call counts, error counts and latency histograms of the plugin callables"""
+        if self.perf_stats is None:
+            return {"error": "Plugin not started"}
+        stats = self.perf_stats.snapshot(reset=bool(reset))
+        stats["upload_end"] = list(self.upload_end_timings)
+        if reset:
+            self.upload_end_timings.clear()
+        return stats
+
+    # used in frontend to profile the plugin (cProfile or tracemalloc).
+    async def start_profiling(self, kind: str = "cpu", duration: float = 30.0, top_n: int = 20):
+        """
+        Start a profiling session that stops itself after duration seconds.
+
+        CPU profiles cover the event loop and the notify thread. Raw profiles
+        are written to the plugin log directory.
+        """
+        from profiling_utils import ProfileSession, MAX_PROFILE_DURATION  # pyright: ignore[reportMissingImports]
+
+        if self.profiler is not None:
+            return {"success": False, "error": f"A {self.profiler.kind} profile is already running"}
+        if self.profile_finish_task is not None and not self.profile_finish_task.done():
+            return {"success": False, "error": "The previous profile is still being written"}
+        try:
+            duration = min(max(float(duration), 1.0), MAX_PROFILE_DURATION)
+            session = ProfileSession(
+                kind,
+                decky.DECKY_PLUGIN_LOG_DIR,
+                top_n=top_n,
+                logger=lambda msg: decky.logger.error(msg),
+            )
+            session.start()
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        self.profiler = session
+        self.profile_stop_handle = asyncio.get_event_loop().call_later(duration, self._schedule_finish_profiling)
+        decky.logger.info(f"Started {kind} profile for {duration}s")
+        return {"success": True, "kind": kind, "duration": duration, "started_at": session.started_at}
+
+    async def stop_profiling(self):
+        """Stop the running profile, or return the result of the last one"""
+        if self.profiler is not None:
+            return await self._finish_profiling()
+        if self.profile_finish_task is not None and not self.profile_finish_task.done():
+            return await asyncio.shield(self.profile_finish_task)
+        if self.last_profile is not None:
+            return self.last_profile
+        return {"success": False, "error": "No profiling session"}
+
+    def _schedule_finish_profiling(self):
+        self.profile_stop_handle = None
+        self.profile_finish_task = asyncio.ensure_future(self._finish_profiling())
+
+    async def _finish_profiling(self) -> Dict[str, Any]:
+        session = self.profiler
+        if self.profile_stop_handle is not None:
+            self.profile_stop_handle.cancel()
+            self.profile_stop_handle = None
+        if session is None:
+            return {"success": False, "error": "No profiling session"}
+        self.profiler = None
+        # Stop collecting on the loop thread; writing and summarizing can take seconds
+        session.disable()
+        result = await asyncio.get_event_loop().run_in_executor(None, session.stop)
+        self.last_profile = result
+        if result["success"]:
+            decky.logger.info(f"Wrote {session.kind} profile ({result['duration']}s) to {result['path']}")
+        return result
 
     async def _proxy_request(self, method: str, path: str, **kwargs):
+        from http_utils import do_request, parse_response  # pyright: ignore[reportMissingImports]
+
         if not self._is_running():
             return {"error": "Backend not running"}, 503
 
@@ -650,13 +1297,199 @@ class Plugin:
             kwargs['headers'] = {'Content-Type': 'application/octet-stream'}
 
         data, status = await self._proxy_request("POST", path, **kwargs)
+        if json_data is not None:
+            self._record_outgoing(path, json_data, data, status)
+            self._track_share_session("POST", path, json_data, data, status)
         return {"data": data, "status": status}
 
+    def _get_outgoing_sessions(self):
+        if self.outgoing_sessions is None:
+            from send_utils import OutgoingSessionStore  # pyright: ignore[reportMissingImports]
+
+            self.outgoing_sessions = OutgoingSessionStore()
+        return self.outgoing_sessions
+
+    def _record_outgoing(self, path: str, request: dict, response: Any, status: int, retry_of: str = ""):
+        """Remember prepare-upload / upload-batch traffic so failed files can be resent"""
+        from send_utils import PREPARE_UPLOAD_PATH, UPLOAD_BATCH_PATH  # pyright: ignore[reportMissingImports]
+
+        endpoint = path.split("?", 1)[0]
+        try:
+            if endpoint == PREPARE_UPLOAD_PATH and status == 200:
+                return self._get_outgoing_sessions().record_prepare(request, response, retry_of=retry_of)
+            if endpoint == UPLOAD_BATCH_PATH:
+                self._get_outgoing_sessions().record_batch(request, response)
+        except Exception as e:
+            decky.logger.warning(f"Failed to record outgoing session: {e}")
+        return ""
+
+    async def _backend_post(self, path: str, body: dict):
+        """POST to the backend on behalf of the plugin, recording outgoing sessions"""
+        data, status = await self._proxy_request("POST", path, json=body)
+        self._record_outgoing(path, body, data, status)
+        return data, status
+
+    def _get_send_queue(self):
+        if self.send_queue is None:
+            from send_queue import SendQueue  # pyright: ignore[reportMissingImports]
+
+            self.send_queue = SendQueue(
+                post=self._backend_post,
+                emit=lambda payload: self._emit("send_queue", payload),
+                logger_info=lambda msg: decky.logger.info(msg),
+                logger_error=lambda msg: decky.logger.error(msg),
+            )
+        return self.send_queue
+
+    # used in frontend to queue a transfer that keeps running when the panel is closed.
+    async def enqueue_send(self, target_fingerprint: str, files: list = None, folders: list = None, pin: str = ""):
+        """Queue files/folders for sending to a device"""
+        if not target_fingerprint:
+            return {"success": False, "error": "Missing target fingerprint"}
+        if not files and not folders:
+            return {"success": False, "error": "Nothing to send"}
+        job = self._get_send_queue().submit(target_fingerprint, files, folders, pin)
+        return {"success": True, "job": job}
+
+    # used in frontend to send one selection to several devices at once.
+    async def enqueue_fanout_send(
+        self,
+        target_fingerprints: list,
+        files: list = None,
+        folders: list = None,
+        pin: str = "",
+        max_parallel: int = 2,
+    ):
+        """Send the same files/folders to several devices; max_parallel targets upload at a time"""
+        targets = [t for t in (target_fingerprints or []) if t]
+        if not targets:
+            return {"success": False, "error": "No targets"}
+        if not files and not folders:
+            return {"success": False, "error": "Nothing to send"}
+        try:
+            max_parallel = int(max_parallel)
+        except (ValueError, TypeError):
+            max_parallel = 2
+        group = self._get_send_queue().submit_fanout(targets, files, folders, pin, max_parallel=max_parallel)
+        return {"success": True, "group": group}
+
+    async def get_fanout_send(self, group_id: str):
+        """Get aggregated and per-target progress of a fan-out send"""
+        group = self._get_send_queue().get_group(group_id)
+        if group is None:
+            return {"success": False, "error": "Group not found"}
+        return {"success": True, "group": group}
+
+    async def cancel_send_job(self, job_id: str):
+        """Cancel a queued or running send job"""
+        if self.send_queue is None or not self.send_queue.cancel(job_id):
+            return {"success": False, "error": "Job not found or already finished"}
+        return {"success": True}
+
+    async def get_send_queue(self):
+        """Get queue depth and all known send jobs"""
+        queue = self._get_send_queue()
+        return {"status": queue.get_status(), "jobs": queue.get_jobs()}
+
+    # used in frontend to list recent outgoing sessions and their failed files.
+    async def get_outgoing_sessions(self):
+        """Get recent outgoing sessions, newest first"""
+        return self._get_outgoing_sessions().list_sessions()
+
+    # used in frontend to resend only the files that failed in an outgoing session.
+    async def retry_failed(self, session_id: str, pin: str = ""):
+        """Run a new prepare-upload / upload-batch for the failed files of an outgoing session"""
+        from urllib.parse import quote
+        from send_utils import (  # pyright: ignore[reportMissingImports]
+            PREPARE_UPLOAD_PATH,
+            UPLOAD_BATCH_PATH,
+            build_batch_files,
+            parse_batch_results,
+        )
+
+        store = self._get_outgoing_sessions()
+        session = store.get(session_id)
+        if session is None:
+            return {"success": False, "error": "Session not found"}
+        retryable, unretryable = store.failed_items(session_id)
+        if not retryable:
+            return {
+                "success": False,
+                "error": "No retryable failed files",
+                "unretryableFileIds": unretryable,
+            }
+
+        prepare_path = PREPARE_UPLOAD_PATH + (f"?pin={quote(pin)}" if pin else "")
+        prepare_body = {"targetTo": session["target"], "files": retryable}
+        data, status = await self._proxy_request("POST", prepare_path, json=prepare_body)
+        if status == 401:
+            return {"success": False, "pinRequired": True, "error": "PIN required"}
+        new_session_id = self._record_outgoing(prepare_path, prepare_body, data, status, retry_of=session_id)
+        if status != 200 or not new_session_id:
+            error = data.get("error") if isinstance(data, dict) else None
+            return {"success": False, "error": error or f"Prepare upload failed: {status}"}
+
+        tokens = store.get(new_session_id)["tokens"]
+        batch_body = {"sessionId": new_session_id, "files": build_batch_files(retryable, tokens)}
+        data, status = await self._proxy_request("POST", UPLOAD_BATCH_PATH, json=batch_body)
+        self._record_outgoing(UPLOAD_BATCH_PATH, batch_body, data, status)
+        succeeded, failed = parse_batch_results(data)
+        store.clear_failed(session_id, succeeded)
+        decky.logger.info(
+            f"Retried {len(retryable)} failed files of {session_id} as {new_session_id}: "
+            f"{len(succeeded)} ok, {len(failed)} failed"
+        )
+        return {
+            "success": status in (200, 207),
+            "status": status,
+            "sessionId": new_session_id,
+            "retried": len(retryable),
+            "succeededFileIds": succeeded,
+            "failedFileIds": failed,
+            "unretryableFileIds": unretryable,
+        }
+
     # used in frontend to delete data from backend.
     async def proxy_delete(self, path: str):
         data, status = await self._proxy_request("DELETE", path)
+        self._track_share_session("DELETE", path, None, data, status)
         return {"data": data, "status": status}
 
+    # used in frontend to list nearby devices without a backend round trip.
+    async def get_devices(self):
+        """Get devices announced by the backend within the registry TTL, most recently seen first"""
+        registry = self._get_device_registry()
+        return {"devices": registry.get_devices(), "ttl": registry.ttl}
+
+    # used in frontend to find received files by name or sender.
+    async def search_received_files(self, query: str = "", limit: int = 50):
+        """Full-text search over received files (name, peer); empty query lists the newest"""
+        index = self._get_received_index()
+        loop = asyncio.get_event_loop()
+        try:
+            results = await loop.run_in_executor(None, lambda: index.search(query, limit))
+        except Exception as e:
+            return {"success": False, "error": str(e), "results": []}
+        return {"success": True, "results": results}
+
+    # used in frontend to show how much space deduplication saved.
+    async def get_dedup_stats(self):
+        """Get received-file deduplication totals since plugin load"""
+        indexed = 0
+        if self.dedup_index is not None:
+            loop = asyncio.get_event_loop()
+            indexed = await loop.run_in_executor(None, lambda: len(self.dedup_index))
+        return {"enabled": self.dedup_received, "indexed": indexed, **self.dedup_totals}
+
+    # used in frontend to catch up on events emitted while the panel was closed.
+    async def get_events_since(self, seq: int = 0, limit: int = 0):
+        """Get emitted events with a sequence number greater than seq, oldest first"""
+        event_log = self._get_event_log()
+        try:
+            return event_log.since(int(seq or 0), limit=int(limit or 0))
+        except (ValueError, TypeError) as e:
+            return {"events": [], "last_seq": event_log.last_seq, "error": str(e)}
+
     # used in frontend to get upload session records.
     async def get_upload_sessions(self):
         """Get upload session records"""
@@ -683,27 +1516,35 @@ class Plugin:
     
     # used in frontend to get notification server status.
     async def get_notify_server_status(self):
-        """Get notification server status"""
-        return self.notify_server.get_status()
+        """Get notification server status and event batching counters"""
+        status = self.notify_server.get_status()
+        status["emit_batches"] = self.emit_batcher.get_metrics() if self.emit_batcher is not None else None
+        return status
 
     # Receive history API
     async def get_receive_history(self):
         """Get file receive history"""
-        return self.receive_history
+        # Copies, so worker threads updating entries cannot race the response serialization
+        with self._receive_history_lock:
+            return [dict(item) for item in self.receive_history]
 
     async def clear_receive_history(self):
         """Clear file receive history"""
-        self.receive_history.clear()
-        self._save_receive_history()
+        with self._receive_history_lock:
+            self.receive_history.clear()
+            self._save_receive_history()
         decky.logger.info("Receive history cleared")
         return {"success": True}
 
     async def delete_receive_history_item(self, item_id: str):
         """Delete a single receive history item"""
-        original_len = len(self.receive_history)
-        self.receive_history = [item for item in self.receive_history if item.get("id") != item_id]
-        if len(self.receive_history) < original_len:
-            self._save_receive_history()
+        with self._receive_history_lock:
+            original_len = len(self.receive_history)
+            self.receive_history = [item for item in self.receive_history if item.get("id") != item_id]
+            deleted = len(self.receive_history) < original_len
+            if deleted:
+                self._save_receive_history()
+        if deleted:
             decky.logger.info(f"Deleted receive history item: {item_id}")
             return {"success": True}
         return {"success": False, "error": "Item not found"}
@@ -736,8 +1577,23 @@ class Plugin:
             "do_not_make_session_folder": self.do_not_make_session_folder,
             "disable_info_logging": self.disable_info_logging,
             "scan_timeout": self.scan_timeout,
+            "log_max_bytes": self.log_max_bytes,
+            "log_backup_count": self.log_backup_count,
+            "log_compress": self.log_compress,
+            "verify_checksum": self.verify_checksum,
+            "dedup_received": self.dedup_received,
+            "free_space_margin_mb": self.free_space_margin_mb,
+            "low_space_action": self.low_space_action,
+            "resource_sample_interval": self.resource_sample_interval,
+            "priority_policy": self.priority_policy,
+            "priority_foreground_signal": self.priority_foreground_signal,
+            "background_cpu_affinity": self.background_cpu_affinity,
         }
 
+    async def get_config_cache_stats(self):
+        """Get hit/miss counters of the localsend.yaml / plugin-settings.json parse cache"""
+        return get_config_cache_stats()
+
     async def set_backend_config(self, config: dict):
         alias = str(config.get("alias", "")).strip()
         download_folder = str(config.get("download_folder", "")).strip()
@@ -761,6 +1617,45 @@ class Plugin:
             scan_timeout = int(scan_timeout_raw or 500)
         except (ValueError, TypeError):
             scan_timeout = 500
+        # Fields added after the settings page keep their value when not sent
+        try:
+            log_max_bytes = max(int(config.get("log_max_bytes", self.log_max_bytes)), 0)
+            log_backup_count = max(int(config.get("log_backup_count", self.log_backup_count)), 0)
+        except (ValueError, TypeError):
+            log_max_bytes = self.log_max_bytes
+            log_backup_count = self.log_backup_count
+        log_compress = bool(config.get("log_compress", self.log_compress))
+        verify_checksum = bool(config.get("verify_checksum", self.verify_checksum))
+        dedup_received = bool(config.get("dedup_received", self.dedup_received))
+        try:
+            free_space_margin_mb = max(int(config.get("free_space_margin_mb", self.free_space_margin_mb)), 0)
+        except (ValueError, TypeError):
+            free_space_margin_mb = self.free_space_margin_mb
+        low_space_action = config.get("low_space_action", self.low_space_action)
+        if low_space_action not in ("warn", "reject"):
+            low_space_action = self.low_space_action
+        from resource_monitor import clamp_sample_interval  # pyright: ignore[reportMissingImports]
+
+        try:
+            resource_sample_interval = clamp_sample_interval(
+                config.get("resource_sample_interval", self.resource_sample_interval)
+            )
+        except (ValueError, TypeError):
+            resource_sample_interval = self.resource_sample_interval
+        from priority_utils import PRIORITY_POLICIES, FOREGROUND_SIGNALS, parse_cpu_list  # pyright: ignore[reportMissingImports]
+
+        priority_policy = config.get("priority_policy", self.priority_policy)
+        if priority_policy not in PRIORITY_POLICIES:
+            priority_policy = self.priority_policy
+        priority_foreground_signal = config.get("priority_foreground_signal", self.priority_foreground_signal)
+        if priority_foreground_signal not in FOREGROUND_SIGNALS:
+            priority_foreground_signal = self.priority_foreground_signal
+        background_cpu_affinity = str(config.get("background_cpu_affinity", self.background_cpu_affinity)).strip()
+        if background_cpu_affinity and parse_cpu_list(background_cpu_affinity) is None:
+            background_cpu_affinity = self.background_cpu_affinity
+
+        old_settings = self._get_default_settings()
+        old_cmd = self._build_backend_cmd()
 
         self.alias = alias
 
@@ -786,49 +1681,303 @@ class Plugin:
         self.do_not_make_session_folder = do_not_make_session_folder
         self.disable_info_logging = disable_info_logging
         self.scan_timeout = scan_timeout
+        self.log_max_bytes = log_max_bytes
+        self.log_backup_count = log_backup_count
+        self.log_compress = log_compress
+        self.verify_checksum = verify_checksum
+        self.dedup_received = dedup_received
+        self.free_space_margin_mb = free_space_margin_mb
+        self.low_space_action = low_space_action
+        self.resource_sample_interval = resource_sample_interval
+        if self.resource_sampler is not None:
+            self.resource_sampler.interval = resource_sample_interval
+        self.priority_policy = priority_policy
+        self.priority_foreground_signal = priority_foreground_signal
+        self.background_cpu_affinity = background_cpu_affinity
+        if self.priority_controller is not None:
+            self.priority_controller.configure(priority_policy, priority_foreground_signal, background_cpu_affinity)
 
         self._save_settings()
         self._ensure_dirs()
 
+        changes = diff_settings(old_settings, self._get_default_settings())
+        restart_fields = changes[SCOPE_RESTART]
         restarted = False
         try:
             if self._is_running():
-                self._stop_backend()
-                self._start_backend()
-                restarted = True
+                if self._build_backend_cmd() != old_cmd:
+                    decky.logger.info(f"Backend command line changed ({', '.join(restart_fields)}), restarting")
+                    self._stop_backend()
+                    self._start_backend()
+                    restarted = True
+                    await self._wait_backend_ready(reason="config")
+                elif changes[SCOPE_HOT]:
+                    self._apply_hot_settings(changes[SCOPE_HOT])
         except Exception as e:
             decky.logger.error(f"Failed to restart backend: {e}")
             return {
                 "success": False,
                 "error": str(e),
                 "restarted": restarted,
+                "restart_fields": restart_fields,
+                "changes": changes,
                 "running": self._is_running(),
             }
 
         return {
             "success": True,
             "restarted": restarted,
+            "restart_fields": restart_fields if restarted else [],
+            "changes": changes,
             "running": self._is_running(),
         }
 
+    def _apply_hot_settings(self, fields: list):
+        """Apply hot-reloadable settings to the running backend"""
+        # Fields sharing a handler (e.g. the priority settings) apply it once
+        handlers: Dict[Callable[[], None], list] = {}
+        for field in fields:
+            handler = self.hot_setting_handlers.get(field)
+            if handler is not None:
+                handlers.setdefault(handler, []).append(field)
+        for handler, names in handlers.items():
+            applied = ", ".join(names)
+            try:
+                handler()
+                decky.logger.info(f"Applied setting without restart: {applied}")
+            except Exception as e:
+                decky.logger.error(f"Failed to apply setting {applied}: {e}")
+
+    def _get_manifest_cache(self):
+        if self.manifest_cache is None:
+            from manifest_cache import FolderManifestCache  # pyright: ignore[reportMissingImports]
+
+            self.manifest_cache = FolderManifestCache(
+                os.path.join(decky.DECKY_PLUGIN_RUNTIME_DIR, "folder-manifests"),
+                logger=lambda msg: decky.logger.error(msg)
+            )
+        return self.manifest_cache
+
+    def _get_hash_cache(self):
+        with self._lazy_init_lock:
+            if self.hash_cache is None:
+                from hash_utils import HashCache  # pyright: ignore[reportMissingImports]
+
+                self.hash_cache = HashCache(
+                    os.path.join(decky.DECKY_PLUGIN_RUNTIME_DIR, "hash-cache.json"),
+                    logger=lambda msg: decky.logger.error(msg)
+                )
+            return self.hash_cache
+
     # used in frontend to list all files in a folder recursively.
     async def list_folder_files(self, folder_path: str):
         """List all files in a folder recursively, returning their paths relative to the folder"""
-        return list_folder_files(
-            folder_path,
+        if not folder_path or not os.path.isdir(folder_path):
+            return {"success": False, "error": "Invalid folder path", "files": []}
+        cache = self._get_manifest_cache()
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, lambda: cache.get_manifest(folder_path))
+
+    def _build_send_manifest(self, folder_path: str, algorithm: str, peer_fingerprint: str) -> Dict[str, Any]:
+        from hash_utils import hash_files  # pyright: ignore[reportMissingImports]
+
+        listing = self._get_manifest_cache().get_manifest(folder_path)
+        if not listing.get("success"):
+            return listing
+        hash_cache = self._get_hash_cache()
+        files = listing["files"]
+        start = time.perf_counter()
+        hashed, cached = hash_files(
+            files,
+            algorithm,
+            cache=hash_cache,
+            max_workers=min(4, os.cpu_count() or 1),
+            logger=lambda msg: decky.logger.warning(msg)
+        )
+        hash_cache.save()
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        decky.logger.info(f"Send manifest for {folder_path}: {hashed} hashed, {cached} cached in {elapsed_ms} ms")
+
+        hashes = {f["displayPath"]: f["hash"] for f in files if f.get("hash")}
+        folder_key = os.path.normpath(folder_path)
+        self.pending_send_manifests[folder_key] = hashes
+        result = {
+            "success": True,
+            "folderName": listing["folderName"],
+            "algorithm": algorithm,
+            "files": files,
+            "count": len(files),
+            "bytes": sum(f.get("size", 0) for f in files),
+            "hashedFiles": hashed,
+            "cachedHashes": cached,
+            "elapsedMs": elapsed_ms,
+        }
+        if peer_fingerprint:
+            baselines = load_json_settings(self.send_baselines_path, {})
+            baseline = baselines.get(peer_fingerprint, {}).get(folder_key, {})
+            changed = []
+            for f in files:
+                f["changed"] = baseline.get(f["displayPath"]) != f.get("hash")
+                if f["changed"]:
+                    changed.append(f["path"])
+            result["changedFiles"] = changed
+            result["changedBytes"] = sum(f.get("size", 0) for f in files if f["changed"])
+            result["removedFiles"] = sorted(set(baseline) - set(hashes))
+            result["hasBaseline"] = bool(baseline)
+        return result
+
+    # used in frontend to find files changed since the last send to a peer.
+    async def build_send_manifest(self, folder_path: str, algorithm: str = "sha256", peer_fingerprint: str = ""):
+        """List a folder with per-file content hashes; with a peer, flag files changed since the last send to it"""
+        from hash_utils import SUPPORTED_ALGORITHMS  # pyright: ignore[reportMissingImports]
+
+        if not folder_path or not os.path.isdir(folder_path):
+            return {"success": False, "error": "Invalid folder path", "files": []}
+        if algorithm not in SUPPORTED_ALGORITHMS:
+            return {"success": False, "error": f"Unsupported algorithm: {algorithm}", "files": []}
+        loop = asyncio.get_event_loop()
+        try:
+            return await loop.run_in_executor(
+                None,
+                lambda: self._build_send_manifest(folder_path, algorithm, peer_fingerprint)
+            )
+        except Exception as e:
+            decky.logger.error(f"Failed to build send manifest: {e}")
+            return {"success": False, "error": str(e), "files": []}
+
+    async def mark_send_manifest_sent(self, folder_path: str, peer_fingerprint: str):
+        """Record the last built manifest of a folder as what the peer now has"""
+        folder_key = os.path.normpath(folder_path or "")
+        hashes = self.pending_send_manifests.get(folder_key)
+        if hashes is None or not peer_fingerprint:
+            return {"success": False, "error": "No manifest built for this folder"}
+        baselines = load_json_settings(self.send_baselines_path, {})
+        baselines.setdefault(peer_fingerprint, {})[folder_key] = hashes
+        save_json_settings(
+            self.send_baselines_path,
+            baselines,
             logger=lambda msg: decky.logger.error(msg)
         )
+        return {"success": True, "count": len(hashes)}
+
+    async def get_folder_manifest_stats(self):
+        """Get folder manifest cache counters and disk usage"""
+        return self._get_manifest_cache().get_stats()
+
+    async def clear_folder_manifests(self, folder_path: str = ""):
+        """Drop the cached manifest of one folder, or all of them when no folder is given"""
+        self._get_manifest_cache().invalidate(folder_path or None)
+        return {"success": True}
+
+    def _prune_folder_scans(self):
+        now = time.monotonic()
+        for scan_id, scan in list(self.folder_scans.items()):
+            if scan.done or now - scan.last_access > self.folder_scan_ttl:
+                scan.cancel()
+                self.folder_scans.pop(scan_id, None)
+
+    # used in frontend to enumerate a folder page by page.
+    async def start_folder_scan(self, folder_path: str, page_size: int = 500, include_files: bool = True):
+        """Start a paginated folder scan and return its first page with a scanId cursor"""
+        import uuid
+        from file_utils import FolderScan  # pyright: ignore[reportMissingImports]
+
+        if not folder_path or not os.path.isdir(folder_path):
+            return {"success": False, "error": "Invalid folder path", "files": [], "done": True}
+        self._prune_folder_scans()
+        scan_id = uuid.uuid4().hex
+        self.folder_scans[scan_id] = FolderScan(folder_path, page_size=page_size, include_files=include_files)
+        return await self.next_folder_scan_page(scan_id)
+
+    async def next_folder_scan_page(self, scan_id: str):
+        """Get the next page of a folder scan; the scan is released once a page reports done"""
+        scan = self.folder_scans.get(scan_id)
+        if scan is None:
+            return {"success": False, "error": "Scan not found", "scanId": scan_id, "files": [], "done": True}
+        loop = asyncio.get_event_loop()
+        page = await loop.run_in_executor(None, scan.next_page)
+        if page["done"]:
+            self.folder_scans.pop(scan_id, None)
+        if not page["success"]:
+            decky.logger.error(f"Folder scan failed: {page.get('error')}")
+        return {"scanId": scan_id, **page}
+
+    async def cancel_folder_scan(self, scan_id: str):
+        """Cancel a running folder scan"""
+        scan = self.folder_scans.pop(scan_id, None)
+        if scan is None:
+            return {"success": False, "error": "Scan not found"}
+        scan.cancel()
+        return {"success": True}
 
     async def write_temp_text_file(self, text_content: str, file_name: str):
         """Write text to a temp file for share session. Returns { success, path? } or { success: false, error? }"""
-        share_temp_dir = os.path.join(self.upload_dir, "share_temp")
-        return write_temp_text_file(
-            base_dir=share_temp_dir,
-            text_content=text_content,
-            file_name=file_name or "text.txt",
-            logger=lambda msg: decky.logger.error(msg)
+        store = self._get_share_temp()
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: store.write_text(text_content, file_name or "text.txt")
         )
 
+    def _get_share_temp(self):
+        share_temp_dir = os.path.join(self.upload_dir, "share_temp")
+        if self.share_temp is None or self.share_temp.base_dir != share_temp_dir:
+            from share_temp import ShareTempStore  # pyright: ignore[reportMissingImports]
+
+            store = ShareTempStore(
+                share_temp_dir,
+                ttl=self.share_temp_ttl,
+                max_bytes=self.share_temp_max_bytes,
+                logger=lambda msg: decky.logger.error(msg)
+            )
+            if self.share_temp is not None:
+                # upload_dir changed; share sessions still open keep their files
+                store.adopt_sessions(self.share_temp)
+            self.share_temp = store
+        return self.share_temp
+
+    def _track_share_session(self, method: str, path: str, request: Any, response: Any, status: int):
+        """Reference share_temp files from created share sessions and release them on close"""
+        from urllib.parse import urlsplit, parse_qs
+        from share_temp import CREATE_SHARE_SESSION_PATH, CLOSE_SHARE_SESSION_PATH  # pyright: ignore[reportMissingImports]
+
+        parts = urlsplit(path)
+        try:
+            if method == "POST" and parts.path == CREATE_SHARE_SESSION_PATH and status == 200:
+                session_id = str(((response or {}).get("data") or {}).get("sessionId") or "")
+                urls = [str(f.get("fileUrl") or "") for f in ((request or {}).get("files") or {}).values()]
+                paths = [u[len("file://"):] if u.startswith("file://") else u for u in urls]
+                self._get_share_temp().bind_session(session_id, paths)
+            elif method == "DELETE" and parts.path == CLOSE_SHARE_SESSION_PATH and status == 200:
+                session_id = (parse_qs(parts.query).get("sessionId") or [""])[0]
+                if self._get_share_temp().release_session(session_id):
+                    asyncio.ensure_future(self._sweep_share_temp())
+        except Exception as e:
+            decky.logger.warning(f"Failed to track share session: {e}")
+
+    def _release_share_sessions(self):
+        """Share sessions live in the backend; drop their share_temp references when it stops"""
+        if self.share_temp is not None and self.share_temp.release_all():
+            decky.logger.info("Released share_temp references of closed share sessions")
+
+    async def _sweep_share_temp(self):
+        """Remove expired / over-quota share_temp files that no share session references"""
+        store = self._get_share_temp()
+        loop = asyncio.get_event_loop()
+        try:
+            result = await loop.run_in_executor(None, store.collect)
+            if result["removed"]:
+                decky.logger.info(f"share_temp sweep removed {result['removed']} files ({result['removed_bytes']} bytes)")
+        except Exception as e:
+            decky.logger.error(f"share_temp sweep failed: {e}")
+
+    async def _sweep_share_temp_loop(self):
+        """Sweep share_temp periodically so a long-running plugin still expires unreferenced files"""
+        # The first sweep runs at startup (_main)
+        while True:
+            await asyncio.sleep(max(self.share_temp_ttl / 4, 60.0))
+            await self._sweep_share_temp()
+
     async def factory_reset(self):
         """Reset all settings to default and delete config files"""
         try:
@@ -868,11 +2017,33 @@ class Plugin:
             self.use_download = False
             self.disable_info_logging = True
             self.scan_timeout = 500
+            self.log_max_bytes = 5 * 1024 * 1024
+            self.log_backup_count = 3
+            self.log_compress = True
+            self.verify_checksum = False
+            self.dedup_received = False
+            self.free_space_margin_mb = 256
+            self.low_space_action = "warn"
+            self.resource_sample_interval = 5.0
+            if self.resource_sampler is not None:
+                self.resource_sampler.interval = self.resource_sample_interval
+                self.resource_sampler.clear()
+            self.priority_policy = "off"
+            self.priority_foreground_signal = "steam_game"
+            self.background_cpu_affinity = ""
+            if self.priority_controller is not None:
+                self.priority_controller.configure("off", "steam_game", "")
+                self._reapply_priority()
             self.upload_dir = os.path.join(decky.DECKY_PLUGIN_RUNTIME_DIR, "uploads")
             
-            # Clear upload sessions and receive history
+            # Clear upload sessions, folder manifests and receive history
+            self._get_manifest_cache().invalidate()
             self.upload_sessions.clear()
-            self.receive_history.clear()
+            if self.device_registry is not None:
+                self.device_registry.clear()
+            if self.received_index is not None:
+                self.received_index.clear()
+            self.receive_history = []
             
             decky.logger.info("Factory reset completed")
             return {"success": True, "message": "Factory reset completed"}
@@ -884,15 +2055,118 @@ class Plugin:
 
     # BASE decky python-backend.
     async def _main(self):
+        main_start = time.perf_counter()
         self.loop = asyncio.get_event_loop()
+        self._setup_perf_stats()
+        phase_start = time.perf_counter()
         self.notify_server.start()
+        self._record_startup_phase("notify_server", phase_start)
+        from supervisor import BackendSupervisor  # pyright: ignore[reportMissingImports]
+
+        self.supervisor = BackendSupervisor(
+            get_process=lambda: self.process,
+            restart=self._restart_backend_after_crash,
+            on_unexpected_exit=self._on_backend_exit,
+            logger_info=lambda msg: decky.logger.info(msg),
+            logger_error=lambda msg: decky.logger.error(msg),
+            logger_warning=lambda msg: decky.logger.warning(msg),
+        )
+        self.supervisor.start()
+        self.log_rotate_task = asyncio.ensure_future(self._rotate_backend_log_loop())
+        from resource_monitor import ResourceSampler  # pyright: ignore[reportMissingImports]
+        from priority_utils import PriorityController  # pyright: ignore[reportMissingImports]
+
+        self.resource_sampler = ResourceSampler(
+            get_pid=lambda: self.process.pid if self._is_running() else None,
+            interval=self.resource_sample_interval,
+            logger_info=lambda msg: decky.logger.info(msg),
+            logger_error=lambda msg: decky.logger.error(msg),
+        )
+        self.resource_sampler.start()
+        self.priority_controller = PriorityController(
+            get_pid=lambda: self.process.pid if self._is_running() else None,
+            policy=self.priority_policy,
+            signal=self.priority_foreground_signal,
+            background_cpus=self.background_cpu_affinity,
+            logger_info=lambda msg: decky.logger.info(msg),
+            logger_error=lambda msg: decky.logger.error(msg),
+        )
+        self.priority_controller.start()
+        self._record_startup_phase("main", main_start)
         decky.logger.info("localsend plugin loaded")
+        # Warm the receive history off the event loop
+        asyncio.ensure_future(self._preload_receive_history())
+        # Share sessions do not survive a restart, so nothing in share_temp is referenced yet
+        asyncio.ensure_future(self._sweep_share_temp())
+        self.share_temp_sweep_task = asyncio.ensure_future(self._sweep_share_temp_loop())
+
+    def _setup_perf_stats(self):
+        """Wrap the public coroutines with latency histograms; proxy calls are broken down by path"""
+        from perf_stats import PerfStats, instrument_coroutines, normalize_path  # pyright: ignore[reportMissingImports]
+
+        if self.perf_stats is not None:
+            return
+        self.perf_stats = PerfStats()
+        path_label = lambda path, *args, **kwargs: normalize_path(path)
+        instrument_coroutines(
+            self,
+            self.perf_stats,
+            labels={"proxy_get": path_label, "proxy_post": path_label, "proxy_delete": path_label},
+            exclude=("get_perf_stats",),
+        )
+
+    async def _preload_receive_history(self):
+        try:
+            await self.loop.run_in_executor(None, self._load_receive_history)
+        except Exception as e:
+            decky.logger.error(f"Failed to preload receive history: {e}")
+        timings = " ".join(f"{phase}={ms:.1f}ms" for phase, ms in self.startup_timings.items())
+        decky.logger.info(f"Plugin startup timings: {timings}")
+
+    async def _cancel_background_tasks(self):
+        if self.profiler is not None:
+            await self._finish_profiling()
+        elif self.profile_finish_task is not None and not self.profile_finish_task.done():
+            await asyncio.shield(self.profile_finish_task)
+        if self.send_queue is not None:
+            self.send_queue.cancel_all()
+        if self.supervisor is not None:
+            await self.supervisor.stop()
+        if self.resource_sampler is not None:
+            await self.resource_sampler.stop()
+        if self.priority_controller is not None:
+            await self.priority_controller.stop()
+        if self.upload_end_pool is not None:
+            # Let queued history writes finish
+            pool, self.upload_end_pool = self.upload_end_pool, None
+            await asyncio.get_event_loop().run_in_executor(None, pool.shutdown)
+        if self.verify_pool is not None:
+            self.verify_pool.shutdown(wait=False, cancel_futures=True)
+            self.verify_pool = None
+        if self.received_index is not None:
+            self.received_index.close()
+        if self.log_rotate_task is not None:
+            self.log_rotate_task.cancel()
+            try:
+                await self.log_rotate_task
+            except asyncio.CancelledError:
+                pass
+            self.log_rotate_task = None
+        if self.share_temp_sweep_task is not None:
+            self.share_temp_sweep_task.cancel()
+            try:
+                await self.share_temp_sweep_task
+            except asyncio.CancelledError:
+                pass
+            self.share_temp_sweep_task = None
 
     async def _unload(self):
+        await self._cancel_background_tasks()
         self._stop_backend()
         self.notify_server.stop()
 
     async def _uninstall(self):
+        await self._cancel_background_tasks()
         self._stop_backend()
         self.notify_server.stop()
 
@@ -1,40 +1,106 @@
 """
 LocalSend Decky Plugin - Python Modules
 
+Helpers are imported lazily on first attribute access, so importing the
+package does not pull in ssl/urllib and friends until they are used.
 """
 
-from .http_utils import get_ssl_context, do_request, parse_response
-from .config_utils import (
-    read_config_yaml,
-    update_config_yaml,
-    format_yaml_value,
-    load_json_settings,
-    save_json_settings,
-)
-from .file_utils import (
-    list_folder_files,
-    load_receive_history,
-    save_receive_history,
-    create_receive_history_entry,
-)
-from .notify_server import NotifyServer
-
-__all__ = [
+import importlib
+
+# exported name -> submodule
+_EXPORTS = {
     # http_utils
-    'get_ssl_context',
-    'do_request',
-    'parse_response',
+    'get_ssl_context': 'http_utils',
+    'do_request': 'http_utils',
+    'parse_response': 'http_utils',
     # config_utils
-    'read_config_yaml',
-    'update_config_yaml',
-    'format_yaml_value',
-    'load_json_settings',
-    'save_json_settings',
+    'read_config_yaml': 'config_utils',
+    'update_config_yaml': 'config_utils',
+    'format_yaml_value': 'config_utils',
+    'load_json_settings': 'config_utils',
+    'save_json_settings': 'config_utils',
+    'diff_settings': 'config_utils',
+    'SETTING_SCOPES': 'config_utils',
+    'get_config_cache_stats': 'config_utils',
+    'invalidate_config_cache': 'config_utils',
     # file_utils
-    'list_folder_files',
-    'load_receive_history',
-    'save_receive_history',
-    'create_receive_history_entry',
+    'list_folder_files': 'file_utils',
+    'load_receive_history': 'file_utils',
+    'save_receive_history': 'file_utils',
+    'create_receive_history_entry': 'file_utils',
+    'iter_folder_files': 'file_utils',
+    'FolderScan': 'file_utils',
     # notify_server
-    'NotifyServer',
-]
+    'NotifyServer': 'notify_server',
+    # backend_utils
+    'wait_for_port': 'backend_utils',
+    'create_startup_record': 'backend_utils',
+    'summarize_startup_history': 'backend_utils',
+    # supervisor
+    'BackendSupervisor': 'supervisor',
+    # log_utils
+    'rotate_log': 'log_utils',
+    'tail_log': 'log_utils',
+    # manifest_cache
+    'FolderManifestCache': 'manifest_cache',
+    # hash_utils
+    'hash_file': 'hash_utils',
+    'hash_files': 'hash_utils',
+    'HashCache': 'hash_utils',
+    # send_utils
+    'OutgoingSessionStore': 'send_utils',
+    'parse_prepare_upload': 'send_utils',
+    'parse_batch_results': 'send_utils',
+    'build_batch_files': 'send_utils',
+    # send_queue
+    'SendQueue': 'send_queue',
+    # perf_stats
+    'PerfStats': 'perf_stats',
+    'instrument_coroutines': 'perf_stats',
+    'normalize_path': 'perf_stats',
+    # event_log
+    'EventLog': 'event_log',
+    # emit_batcher
+    'EmitBatcher': 'emit_batcher',
+    # verify_utils
+    'verify_received_files': 'verify_utils',
+    'build_verify_list': 'verify_utils',
+    'lower_thread_priority': 'verify_utils',
+    # dedup_utils
+    'DedupIndex': 'dedup_utils',
+    'dedup_files': 'dedup_utils',
+    'replace_with_link': 'dedup_utils',
+    # received_index
+    'ReceivedFileIndex': 'received_index',
+    # share_temp
+    'ShareTempStore': 'share_temp',
+    # disk_utils
+    'FreeSpaceChecker': 'disk_utils',
+    # device_registry
+    'DeviceRegistry': 'device_registry',
+    # resource_monitor
+    'ResourceSampler': 'resource_monitor',
+    'read_proc_sample': 'resource_monitor',
+    # priority_utils
+    'PriorityController': 'priority_utils',
+    'apply_profile': 'priority_utils',
+    'parse_cpu_list': 'priority_utils',
+    # profiling_utils
+    'ProfileSession': 'profiling_utils',
+    'PROFILE_KINDS': 'profiling_utils',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
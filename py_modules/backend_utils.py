@@ -0,0 +1,109 @@
+"""
+Backend process utilities (readiness probing, startup metrics).
+Note: This module does NOT use decky directly. Logging is done via callbacks.
+"""
+
+import time
+import socket
+from typing import Callable, Dict, Any, List, Optional
+
+
+def wait_for_port(
+    host: str,
+    port: int,
+    timeout: float = 10.0,
+    interval: float = 0.05,
+    max_interval: float = 0.5,
+    is_alive: Callable[[], bool] = None,
+    logger: Callable[[str], None] = None
+) -> bool:
+    """
+    Block until a TCP listener accepts connections on host:port.
+
+    Args:
+        host: Host to probe
+        port: Port to probe
+        timeout: Deadline in seconds
+        interval: Initial delay between probes (doubles up to max_interval)
+        max_interval: Upper bound for the delay between probes
+        is_alive: Optional callback; probing stops early when it returns False
+        logger: Optional logging callback for errors
+
+    Returns:
+        True if the port became reachable before the deadline, False otherwise
+    """
+    deadline = time.monotonic() + timeout
+    delay = interval
+    while True:
+        if is_alive is not None and not is_alive():
+            if logger:
+                logger(f"Process exited before {host}:{port} became ready")
+            return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            with socket.create_connection((host, port), timeout=min(1.0, remaining)):
+                return True
+        except OSError:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_interval)
+    if logger:
+        logger(f"Timed out after {timeout:.1f}s waiting for {host}:{port}")
+    return False
+
+
+def summarize_startup_history(history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarize backend startup records.
+
+    Args:
+        history: Startup records, each with "ready" and "time_to_ready_ms"
+
+    Returns:
+        Dictionary with count, failures and min/avg/max time-to-ready of successful starts
+    """
+    ready_times = [h["time_to_ready_ms"] for h in history if h.get("ready")]
+    summary: Dict[str, Any] = {
+        "count": len(history),
+        "failures": len(history) - len(ready_times),
+        "min_ms": None,
+        "avg_ms": None,
+        "max_ms": None,
+    }
+    if ready_times:
+        summary["min_ms"] = round(min(ready_times), 1)
+        summary["avg_ms"] = round(sum(ready_times) / len(ready_times), 1)
+        summary["max_ms"] = round(max(ready_times), 1)
+    return summary
+
+
+def create_startup_record(
+    started_at: float,
+    ready: bool,
+    reason: str = "",
+    pid: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Create a backend startup record.
+
+    Args:
+        started_at: time.monotonic() value taken right before the process was spawned
+        ready: Whether the backend became ready before the deadline
+        reason: What triggered the start (e.g. "user", "config")
+        pid: Backend process id
+
+    Returns:
+        Startup record dictionary
+    """
+    return {
+        "timestamp": time.time(),
+        "ready": ready,
+        "time_to_ready_ms": round((time.monotonic() - started_at) * 1000, 1),
+        "reason": reason,
+        "pid": pid,
+    }
@@ -3,8 +3,47 @@ Configuration utilities for reading and writing YAML-like config files.
 """
 
 import os
+import copy
 import json
-from typing import Dict, Any, Callable, Optional
+import threading
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+
+# Parsed config files keyed by path, validated by (st_mtime_ns, st_size)
+_config_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+_config_cache_lock = threading.Lock()
+_config_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _cache_lookup(path: str, st: os.stat_result) -> Optional[Any]:
+    key = (st.st_mtime_ns, st.st_size)
+    with _config_cache_lock:
+        cached = _config_cache.get(path)
+        if cached is not None and cached[0] == key:
+            _config_cache_stats["hits"] += 1
+            return cached[1]
+        _config_cache_stats["misses"] += 1
+    return None
+
+
+def _cache_store(path: str, st: os.stat_result, value: Any) -> None:
+    with _config_cache_lock:
+        _config_cache[path] = ((st.st_mtime_ns, st.st_size), value)
+
+
+def invalidate_config_cache(path: Optional[str] = None) -> None:
+    """Drop the cached parse of one file, or of all files when path is None."""
+    with _config_cache_lock:
+        if path is None:
+            _config_cache.clear()
+        else:
+            _config_cache.pop(path, None)
+
+
+def get_config_cache_stats() -> Dict[str, int]:
+    """Get config cache hit/miss counters and the number of cached files."""
+    with _config_cache_lock:
+        return {**_config_cache_stats, "entries": len(_config_cache)}
 
 
 def read_config_yaml(
@@ -13,6 +52,9 @@ def read_config_yaml(
 ) -> Dict[str, Any]:
     """
     Read a simple YAML config file.
+
+    The parsed result is cached and only re-read when the file's mtime or
+    size changes.
     
     Args:
         config_path: Path to the config file
@@ -21,17 +63,19 @@ def read_config_yaml(
     Returns:
         Dictionary of config values
     """
-    # Ensure directory exists
     try:
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
+        st = os.stat(config_path)
+    except FileNotFoundError:
+        return {}
     except Exception as e:
         if logger:
-            logger(f"Failed to create config directory: {e}")
-        return {}
-    
-    if not os.path.exists(config_path):
+            logger(f"Failed to read config: {e}")
         return {}
-    
+
+    cached = _cache_lookup(config_path, st)
+    if cached is not None:
+        return dict(cached)
+
     try:
         with open(config_path, "r", encoding="utf-8") as f:
             lines = f.readlines()
@@ -58,7 +102,8 @@ def read_config_yaml(
             except ValueError:
                 pass
         config[key] = value
-    return config
+    _cache_store(config_path, st, config)
+    return dict(config)
 
 
 def format_yaml_value(value: Any) -> str:
@@ -115,6 +160,7 @@ def update_config_yaml(
             continue
         lines.append(f"{key}: {format_yaml_value(value)}\n")
 
+    invalidate_config_cache(config_path)
     try:
         with open(config_path, "w", encoding="utf-8") as f:
             f.writelines(lines)
@@ -130,6 +176,9 @@ def load_json_settings(
 ) -> Dict[str, Any]:
     """
     Load JSON settings file, creating with defaults if it doesn't exist.
+
+    The decoded settings are cached and only re-read when the file's mtime
+    or size changes.
     
     Args:
         settings_path: Path to the settings file
@@ -140,20 +189,28 @@ def load_json_settings(
         Dictionary of settings
     """
     try:
-        os.makedirs(os.path.dirname(settings_path), exist_ok=True)
-        
-        # Create default settings file if it doesn't exist
-        if not os.path.exists(settings_path):
+        try:
+            st = os.stat(settings_path)
+        except FileNotFoundError:
+            # Create default settings file if it doesn't exist
             if logger:
                 logger(f"Settings file not found, creating default: {settings_path}")
+            os.makedirs(os.path.dirname(settings_path), exist_ok=True)
+            invalidate_config_cache(settings_path)
             with open(settings_path, "w", encoding="utf-8") as f:
                 json.dump(defaults, f, ensure_ascii=True, indent=2)
             return defaults.copy()
-        
+
+        # Callers may modify nested values (e.g. send baselines), so never hand out the cached object
+        cached = _cache_lookup(settings_path, st)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
         # Load existing settings
         with open(settings_path, "r", encoding="utf-8") as f:
             data = json.load(f)
-        return data
+        _cache_store(settings_path, st, data)
+        return copy.deepcopy(data)
     except Exception as e:
         if logger:
             logger(f"Failed to load settings: {e}")
@@ -178,6 +235,7 @@ def save_json_settings(
     """
     try:
         os.makedirs(os.path.dirname(settings_path), exist_ok=True)
+        invalidate_config_cache(settings_path)
         with open(settings_path, "w", encoding="utf-8") as f:
             json.dump(settings, f, ensure_ascii=True, indent=2)
         return True
@@ -185,3 +243,65 @@ def save_json_settings(
         if logger:
             logger(f"Failed to save settings: {e}")
         return False
+
+
+# How a changed plugin setting takes effect
+SCOPE_PLUGIN = "plugin"    # only read by the plugin, backend untouched
+SCOPE_HOT = "hot"          # applied to the running backend without a restart
+SCOPE_RESTART = "restart"  # part of the backend command line
+
+SETTING_SCOPES: Dict[str, str] = {
+    "notify_on_download": SCOPE_PLUGIN,
+    "save_receive_history": SCOPE_PLUGIN,
+    "legacy_mode": SCOPE_PLUGIN,
+    "use_mixed_scan": SCOPE_PLUGIN,
+    "log_max_bytes": SCOPE_PLUGIN,
+    "log_backup_count": SCOPE_PLUGIN,
+    "log_compress": SCOPE_PLUGIN,
+    "resource_sample_interval": SCOPE_PLUGIN,
+    "verify_checksum": SCOPE_PLUGIN,
+    "dedup_received": SCOPE_PLUGIN,
+    "free_space_margin_mb": SCOPE_PLUGIN,
+    "low_space_action": SCOPE_PLUGIN,
+    "priority_policy": SCOPE_HOT,
+    "priority_foreground_signal": SCOPE_HOT,
+    "background_cpu_affinity": SCOPE_HOT,
+    "alias": SCOPE_RESTART,
+    "download_folder": SCOPE_RESTART,
+    "skip_notify": SCOPE_RESTART,
+    "multicast_address": SCOPE_RESTART,
+    "multicast_port": SCOPE_RESTART,
+    "pin": SCOPE_RESTART,
+    "auto_save": SCOPE_RESTART,
+    "auto_save_from_favorites": SCOPE_RESTART,
+    "use_https": SCOPE_RESTART,
+    "network_interface": SCOPE_RESTART,
+    "use_download": SCOPE_RESTART,
+    "do_not_make_session_folder": SCOPE_RESTART,
+    "disable_info_logging": SCOPE_RESTART,
+    "scan_timeout": SCOPE_RESTART,
+}
+
+
+def diff_settings(
+    old: Dict[str, Any],
+    new: Dict[str, Any]
+) -> Dict[str, List[str]]:
+    """
+    Compare two settings dictionaries and classify the changed keys.
+
+    Keys missing from SETTING_SCOPES are treated as restart-required.
+
+    Args:
+        old: Settings before the update
+        new: Settings after the update
+
+    Returns:
+        Dictionary mapping each scope to the sorted list of changed keys
+    """
+    changes: Dict[str, List[str]] = {SCOPE_PLUGIN: [], SCOPE_HOT: [], SCOPE_RESTART: []}
+    for key in sorted(set(old) | set(new)):
+        if old.get(key) == new.get(key):
+            continue
+        changes[SETTING_SCOPES.get(key, SCOPE_RESTART)].append(key)
+    return changes
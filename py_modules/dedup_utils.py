@@ -0,0 +1,209 @@
+"""
+Deduplication of received files by content hash.
+Note: This module does NOT use decky directly. Logging is done via callbacks.
+
+Duplicates are replaced with a reflink (copy-on-write clone, btrfs/xfs) when
+the filesystem supports it, otherwise with a hardlink to the first copy.
+Reflinks stay independent copies; hardlinked files share edits, which is why
+deduplication is opt-in.
+"""
+
+import os
+import json
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, Optional
+
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+
+def reflink(src: str, dst: str):
+    """Create dst as a copy-on-write clone of src (Linux FICLONE); raises OSError if unsupported."""
+    import fcntl
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+
+
+def replace_with_link(original: str, duplicate: str) -> str:
+    """
+    Atomically replace duplicate with a reflink or hardlink of original.
+
+    Returns:
+        "reflink" or "hardlink"
+    """
+    tmp_path = os.path.join(os.path.dirname(duplicate), f".{os.path.basename(duplicate)}.dedup-tmp")
+    try:
+        try:
+            reflink(original, tmp_path)
+            shutil.copystat(duplicate, tmp_path)
+            method = "reflink"
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            os.link(original, tmp_path)
+            method = "hardlink"
+        os.replace(tmp_path, duplicate)
+        return method
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class DedupIndex:
+    """Persistent (size, digest) -> canonical file index, LRU-bounded."""
+
+    def __init__(self, index_path: str, max_entries: int = 20000, logger: Callable[[str], None] = None):
+        """
+        Args:
+            index_path: JSON file backing the index
+            max_entries: Maximum number of indexed digests
+            logger: Optional logging callback for errors
+        """
+        self.index_path = index_path
+        self.max_entries = max_entries
+        self._log = logger or (lambda msg: None)
+        self._lock = threading.Lock()
+        self._entries: Optional["OrderedDict[str, Dict[str, Any]]"] = None
+        self._dirty = False
+
+    def _load(self) -> "OrderedDict[str, Dict[str, Any]]":
+        if self._entries is None:
+            self._entries = OrderedDict()
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._entries.update(json.load(f))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self._log(f"Failed to load dedup index: {e}")
+        return self._entries
+
+    def lookup(self, size: int, digest: str) -> Optional[str]:
+        """Path of an indexed file with this content that still looks unchanged, or None."""
+        key = f"{size}:{digest}"
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            try:
+                st = os.stat(entry["path"])
+                unchanged = st.st_size == size and st.st_mtime_ns == entry["mtime_ns"]
+            except OSError:
+                unchanged = False
+            if not unchanged:
+                del entries[key]
+                self._dirty = True
+                return None
+            entries.move_to_end(key)
+            return entry["path"]
+
+    def add(self, size: int, digest: str, path: str):
+        key = f"{size}:{digest}"
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        with self._lock:
+            entries = self._load()
+            entries[key] = {"path": path, "mtime_ns": mtime_ns}
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._dirty = True
+
+    def save(self) -> bool:
+        """Write the index to disk if it changed."""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return True
+            data = dict(self._entries)
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+            return True
+        except Exception as e:
+            self._log(f"Failed to save dedup index: {e}")
+            return False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()
+            self._dirty = True
+
+
+def dedup_files(
+    paths: List[str],
+    index: DedupIndex,
+    hash_cache=None,
+    max_workers: int = 2,
+    min_size: int = 4096,
+    logger: Callable[[str], None] = None
+) -> Dict[str, Any]:
+    """
+    Hash files and replace the ones whose content is already indexed with links.
+
+    Files that are not duplicates are added to the index.
+
+    Args:
+        paths: Files to check
+        index: Persistent dedup index
+        hash_cache: Optional HashCache for the digests
+        max_workers: Hashing threads
+        min_size: Files smaller than this are skipped (links would not save a block)
+        logger: Optional logging callback for errors
+
+    Returns:
+        { checked, duplicates, reflinked, hardlinked, bytes_reclaimed, errors, linked_paths }
+        where linked_paths lists the files that were replaced (their mtime changed)
+    """
+    from hash_utils import hash_files  # pyright: ignore[reportMissingImports]
+
+    files = [{"path": p} for p in paths if os.path.isfile(p) and os.path.getsize(p) >= min_size]
+    hash_files(files, "sha256", cache=hash_cache, max_workers=max_workers, logger=logger)
+
+    result = {
+        "checked": len(files),
+        "duplicates": 0,
+        "reflinked": 0,
+        "hardlinked": 0,
+        "bytes_reclaimed": 0,
+        "errors": 0,
+        "linked_paths": [],
+    }
+    for entry in files:
+        digest = entry.get("hash")
+        if not digest:
+            result["errors"] += 1
+            continue
+        path, size = entry["path"], entry["size"]
+        original = index.lookup(size, digest)
+        if original is None or os.path.realpath(original) == os.path.realpath(path):
+            index.add(size, digest, path)
+            continue
+        try:
+            if os.path.samefile(original, path):
+                continue
+            result["duplicates"] += 1
+            method = replace_with_link(original, path)
+            result["reflinked" if method == "reflink" else "hardlinked"] += 1
+            result["bytes_reclaimed"] += size
+            result["linked_paths"].append(path)
+        except OSError as e:
+            # e.g. different filesystem (EXDEV) or permission denied
+            result["errors"] += 1
+            if logger:
+                logger(f"Failed to deduplicate {path}: {e}")
+    index.save()
+    return result
@@ -0,0 +1,78 @@
+"""
+In-memory registry of discovered LocalSend devices.
+Note: This module does NOT use decky directly.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List
+
+# Fields copied from device_discovered / device_updated notification data
+DEVICE_FIELDS = ("alias", "ip_address", "port", "protocol", "deviceType", "deviceModel")
+
+
+class DeviceRegistry:
+    """Devices keyed by fingerprint with last-seen timestamps and TTL expiry."""
+
+    def __init__(self, ttl: float = 300.0, max_devices: int = 256):
+        """
+        Args:
+            ttl: Seconds after the last notification before a device is dropped (0 keeps forever)
+            max_devices: Upper bound on remembered devices; least recently seen are dropped first
+        """
+        self.ttl = ttl
+        self.max_devices = max_devices
+        self._devices: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, data: Dict[str, Any]) -> bool:
+        """
+        Merge a device notification into the registry.
+
+        Returns:
+            True if the device was not known before
+        """
+        fingerprint = str(data.get("fingerprint") or "")
+        if not fingerprint:
+            return False
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            device = self._devices.get(fingerprint)
+            is_new = device is None
+            if is_new:
+                device = self._devices[fingerprint] = {"fingerprint": fingerprint, "firstSeen": now, "seenCount": 0}
+            for field in DEVICE_FIELDS:
+                if data.get(field) is not None:
+                    device[field] = data[field]
+            device["lastSeen"] = now
+            device["seenCount"] += 1
+            self._devices.move_to_end(fingerprint)
+            while len(self._devices) > self.max_devices:
+                self._devices.popitem(last=False)
+        return is_new
+
+    def _expire(self, now: float):
+        if self.ttl <= 0:
+            return
+        # Entries are ordered by lastSeen, so expired ones are at the front
+        while self._devices:
+            fingerprint, device = next(iter(self._devices.items()))
+            if now - device["lastSeen"] <= self.ttl:
+                break
+            del self._devices[fingerprint]
+
+    def get_devices(self) -> List[Dict[str, Any]]:
+        """Live devices, most recently seen first."""
+        with self._lock:
+            self._expire(time.time())
+            return [dict(device) for device in reversed(self._devices.values())]
+
+    def remove(self, fingerprint: str) -> bool:
+        with self._lock:
+            return self._devices.pop(fingerprint, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._devices.clear()
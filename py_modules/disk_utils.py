@@ -0,0 +1,161 @@
+"""
+Free-space checks for incoming transfers.
+Note: This module does NOT use decky directly.
+"""
+
+import os
+import time
+import threading
+from urllib.parse import quote
+from typing import Dict, Any, Optional, Tuple
+
+# Receiver-side cancel of an incoming session (/api/self/v1/cancel cancels our own sends)
+RECEIVE_CANCEL_PATH = "/api/localsend/v2/cancel"
+
+
+def receive_cancel_path(session_id: str) -> str:
+    """Backend path that cancels the incoming session session_id."""
+    return f"{RECEIVE_CANCEL_PATH}?sessionId={quote(session_id)}"
+
+
+def existing_ancestor(path: str) -> str:
+    """Nearest existing directory at or above path (session folders may not exist yet)."""
+    path = os.path.abspath(path)
+    while not os.path.isdir(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+class FreeSpaceChecker:
+    """
+    os.statvfs with a short per-directory cache, so bursts of sessions stat once.
+
+    Accepted sessions reserve their announced size until released (upload_end
+    or cancel), so sessions arriving within the cache window are checked
+    against the space the earlier ones will use. Bytes already written show
+    up in statvfs, so only the part of the reservations not yet covered by
+    the drop in free space since the oldest one was made counts as used.
+    """
+
+    def __init__(self, ttl: float = 2.0, max_age: float = 6 * 3600.0):
+        """
+        Args:
+            ttl: Seconds a statvfs result is reused
+            max_age: Seconds after which a reservation that was never released is dropped
+        """
+        self.ttl = ttl
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, int]] = {}
+        # session id -> { device, size, free (when reserved, or None), created }
+        self._reservations: Dict[str, Dict[str, Any]] = {}
+
+    def free_bytes(self, path: str) -> Optional[int]:
+        """Bytes available to unprivileged users on the filesystem holding path (None on error)."""
+        directory = existing_ancestor(path)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(directory)
+            if cached is not None and now - cached[0] < self.ttl:
+                return cached[1]
+        try:
+            st = os.statvfs(directory)
+        except OSError:
+            return None
+        free = st.f_bavail * st.f_frsize
+        with self._lock:
+            self._cache[directory] = (now, free)
+        return free
+
+    @staticmethod
+    def _device(path: str) -> Optional[int]:
+        try:
+            return os.stat(existing_ancestor(path)).st_dev
+        except OSError:
+            return None
+
+    def _prune(self, now: float):
+        """Drop expired reservations (caller holds the lock)."""
+        if self.max_age > 0:
+            for session_id in [s for s, r in self._reservations.items() if now - r["created"] > self.max_age]:
+                del self._reservations[session_id]
+
+    def _outstanding(self, device: Optional[int], free: Optional[int]) -> int:
+        """Reserved bytes on device not written yet (caller holds the lock)."""
+        entries = [r for r in self._reservations.values() if r["device"] == device]
+        reserved = sum(r["size"] for r in entries)
+        if not entries or free is None:
+            return reserved
+        baseline = min(entries, key=lambda r: r["created"])["free"]
+        if baseline is None:
+            return reserved
+        return reserved - min(reserved, max(baseline - free, 0))
+
+    def check(self, path: str, required: int, margin: int = 0, reserve_as: str = "") -> Dict[str, Any]:
+        """
+        Check whether required bytes fit on the filesystem of path while keeping margin free.
+
+        Space reserved by other accepted sessions on the same filesystem and not
+        written yet counts as used.
+
+        Args:
+            path: Destination directory
+            required: Bytes about to be written
+            margin: Bytes that must stay free
+            reserve_as: Session id to reserve required bytes for when the check passes
+
+        Returns:
+            { ok, path, free, reserved, required, margin }; ok is True when free space is unknown
+        """
+        free = self.free_bytes(path)
+        device = self._device(path)
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            reserved = self._outstanding(device, free)
+            ok = free is None or free - reserved - max(int(required), 0) >= max(int(margin), 0)
+            if ok and reserve_as and device is not None:
+                self._reservations[reserve_as] = {
+                    "device": device, "size": max(int(required), 0), "free": free, "created": now,
+                }
+        return {"ok": ok, "path": path, "free": free, "reserved": reserved, "required": required, "margin": margin}
+
+    def reserve(self, session_id: str, path: str, size: int):
+        """Reserve size bytes on the filesystem of path for session_id (e.g. accepted despite a warning)."""
+        device = self._device(path)
+        if device is None or not session_id:
+            return
+        free = self.free_bytes(path)
+        with self._lock:
+            self._reservations[session_id] = {
+                "device": device, "size": max(int(size), 0), "free": free, "created": time.monotonic(),
+            }
+
+    def release(self, session_id: str) -> int:
+        """Drop the reservation of a finished or cancelled session; returns the released bytes."""
+        with self._lock:
+            size = self._reservations.pop(session_id, {}).get("size", 0)
+        if size:
+            # Written bytes are now visible to statvfs
+            self.invalidate()
+        return size
+
+    def clear(self) -> int:
+        """Drop every reservation (the backend and its sessions went away); returns the count."""
+        with self._lock:
+            count = len(self._reservations)
+            self._reservations.clear()
+        self.invalidate()
+        return count
+
+    def get_reservations(self) -> Dict[str, int]:
+        with self._lock:
+            self._prune(time.monotonic())
+            return {session_id: r["size"] for session_id, r in self._reservations.items()}
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
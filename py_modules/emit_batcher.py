@@ -0,0 +1,107 @@
+"""
+Batched cross-thread event emission.
+Note: This module does NOT use decky directly. All callbacks are passed in.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class EmitBatcher:
+    """
+    Collect events submitted from any thread and emit them from the event loop.
+
+    Instead of one run_coroutine_threadsafe() per event (a future, a task and a
+    loop wake-up each), events are queued and a single call_soon_threadsafe()
+    flush is scheduled per loop tick. A single drain task emits the queue
+    sequentially, so events keep their submission order across batches and
+    across threads as long as every emit goes through submit().
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[str, Any], Awaitable[Any]],
+        get_loop: Callable[[], Optional[asyncio.AbstractEventLoop]],
+        logger_error: Callable[[str], None] = None,
+    ):
+        """
+        Args:
+            emit: Coroutine function (event, payload) delivering one event
+            get_loop: Callback returning the event loop to emit on
+            logger_error: Callback for error logging
+        """
+        self._emit = emit
+        self._get_loop = get_loop
+        self._log_error = logger_error or (lambda msg: None)
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, Any]] = []
+        self._scheduled = False
+        self._drain_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.batches = 0
+        self.events = 0
+        self.max_batch_size = 0
+        self.last_batch_size = 0
+
+    def submit(self, event: str, payload: Any) -> bool:
+        """
+        Queue an event from any thread, including the loop thread.
+
+        Returns:
+            False if there is no usable event loop (the event is dropped)
+        """
+        loop = self._get_loop()
+        if loop is None or loop.is_closed():
+            return False
+        with self._lock:
+            self._pending.append((event, payload))
+            if self._scheduled:
+                return True
+            self._scheduled = True
+        try:
+            loop.call_soon_threadsafe(self._flush)
+        except RuntimeError as e:
+            with self._lock:
+                self._scheduled = False
+            self._log_error(f"Failed to schedule event flush: {e}")
+            return False
+        return True
+
+    def _flush(self):
+        with self._lock:
+            self._scheduled = False
+        # A running drain task picks up the new events after its current batch
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.ensure_future(self._drain())
+
+    async def _drain(self):
+        while True:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            self.batches += 1
+            self.events += len(batch)
+            self.last_batch_size = len(batch)
+            if len(batch) > self.max_batch_size:
+                self.max_batch_size = len(batch)
+            for event, payload in batch:
+                try:
+                    await self._emit(event, payload)
+                except Exception as e:
+                    self._log_error(f"Failed to emit {event}: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get batch counters."""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "batches": self.batches,
+            "events": self.events,
+            "avg_batch_size": round(self.events / self.batches, 2) if self.batches else None,
+            "max_batch_size": self.max_batch_size,
+            "last_batch_size": self.last_batch_size,
+            "pending": pending,
+        }
@@ -0,0 +1,115 @@
+"""
+Sequenced ring buffer of events emitted to the frontend.
+Note: This module does NOT use decky directly.
+
+High-frequency events (device discovery, send progress) go to a separate,
+smaller ring so a burst of them cannot evict the events a reconnecting UI
+needs. Text contents are stored as a size-capped preview.
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Deque, Dict, Any
+
+# Payload keys that may carry received text, stored as a preview
+TEXT_KEYS = ("content", "message")
+
+
+def cap_text(payload: Any, max_chars: int) -> Any:
+    """Copy of payload with long TEXT_KEYS values (top level and under "data") cut to max_chars."""
+    if not isinstance(payload, dict) or max_chars <= 0:
+        return payload
+    capped = None
+    for key in TEXT_KEYS:
+        value = payload.get(key)
+        if isinstance(value, str) and len(value) > max_chars:
+            if capped is None:
+                capped = dict(payload)
+            capped[key] = value[:max_chars]
+            capped[f"{key}Truncated"] = True
+    data = payload.get("data")
+    if isinstance(data, dict):
+        capped_data = cap_text(data, max_chars)
+        if capped_data is not data:
+            if capped is None:
+                capped = dict(payload)
+            capped["data"] = capped_data
+    return payload if capped is None else capped
+
+
+class EventLog:
+    """
+    Keeps the last emitted events with increasing sequence numbers.
+
+    A frontend that was closed or missed events can ask for everything after
+    the last sequence number it saw instead of re-fetching full state.
+    """
+
+    def __init__(self, capacity: int = 500, chatty_capacity: int = 100, max_text_chars: int = 512):
+        """
+        Args:
+            capacity: Events kept in the main ring
+            chatty_capacity: High-frequency events kept in their own ring
+            max_text_chars: Length of the stored text previews (0 = keep full text)
+        """
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=max(1, capacity))
+        self._chatty: Deque[Dict[str, Any]] = deque(maxlen=max(1, chatty_capacity))
+        self.max_text_chars = max_text_chars
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._dropped_seq = 0  # newest sequence number evicted from the main ring
+
+    def append(self, event: str, payload: Any, chatty: bool = False) -> int:
+        """Record an event and return its sequence number; chatty events use the smaller ring."""
+        payload = cap_text(payload, self.max_text_chars)
+        with self._lock:
+            self._seq += 1
+            entry = {"seq": self._seq, "time": time.time(), "event": event, "payload": payload}
+            if chatty:
+                self._chatty.append(entry)
+            else:
+                if len(self._events) == self._events.maxlen:
+                    self._dropped_seq = self._events[0]["seq"]
+                self._events.append(entry)
+            return self._seq
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def since(self, seq: int = 0, limit: int = 0) -> Dict[str, Any]:
+        """
+        Get events with a sequence number greater than seq, oldest first.
+
+        Args:
+            seq: Last sequence number the caller has seen (0 = from the start of the buffer)
+            limit: Maximum number of events to return (0 = no limit)
+
+        Returns:
+            { events, last_seq, oldest_seq, truncated }; truncated is True when events
+            after seq were already dropped from the main buffer (dropped high-frequency
+            events do not count)
+        """
+        with self._lock:
+            events = [e for e in self._events if e["seq"] > seq]
+            chatty = [e for e in self._chatty if e["seq"] > seq]
+            oldest = self._events[0]["seq"] if self._events else self._seq + 1
+            last_seq = self._seq
+            dropped = self._dropped_seq
+        if chatty:
+            events = sorted(events + chatty, key=lambda e: e["seq"])
+        if limit and limit > 0:
+            events = events[:limit]
+        return {
+            "events": events,
+            "last_seq": last_seq,
+            "oldest_seq": oldest,
+            "truncated": seq < dropped,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._chatty.clear()
+            self._dropped_seq = self._seq
@@ -7,7 +7,129 @@ import os
 import glob
 import time
 import json
-from typing import Dict, List, Any, Callable, Optional
+import threading
+from typing import Dict, List, Any, Callable, Iterator, Optional
+
+
+def iter_folder_files(
+    folder_path: str,
+    cancel_event: Optional[threading.Event] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Enumerate files below a folder with os.scandir, depth first.
+
+    Size and mtime come from the directory entry's stat, and display paths are
+    built incrementally instead of calling os.path.relpath per file.
+    Symlinked directories are not followed (same as os.walk).
+
+    Args:
+        folder_path: Path to the folder
+        cancel_event: Optional event; enumeration stops once it is set
+
+    Yields:
+        { path, displayPath, fileName, size, mtime } per file
+    """
+    base_name = os.path.basename(os.path.normpath(folder_path))
+    # (absolute dir, display prefix)
+    stack = [(folder_path, base_name)]
+    while stack:
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        current_dir, display_dir = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append((entry.path, display_dir + os.sep + entry.name))
+                            continue
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    yield {
+                        "path": entry.path,
+                        "displayPath": display_dir + os.sep + entry.name,
+                        "fileName": entry.name,
+                        "size": st.st_size,
+                        "mtime": st.st_mtime,
+                    }
+        except OSError:
+            if current_dir == folder_path:
+                raise
+            continue
+        # Reverse so subdirectories are visited in scandir order
+        stack.extend(reversed(subdirs))
+
+
+class FolderScan:
+    """Paginated, cancellable enumeration of a folder (see iter_folder_files)."""
+
+    def __init__(self, folder_path: str, page_size: int = 500, include_files: bool = True):
+        """
+        Args:
+            folder_path: Path to the folder
+            page_size: Files per page
+            include_files: Return file entries; when False pages only carry totals
+        """
+        self.folder_path = folder_path
+        self.folder_name = os.path.basename(os.path.normpath(folder_path))
+        self.page_size = max(int(page_size), 1)
+        self.include_files = include_files
+        self.cancel_event = threading.Event()
+        self.count = 0
+        self.total_bytes = 0
+        self.done = False
+        self.last_access = time.monotonic()
+        self._lock = threading.Lock()
+        self._iterator = iter_folder_files(folder_path, self.cancel_event)
+
+    def cancel(self):
+        """Stop the scan; the next page is returned empty and marked done."""
+        self.cancel_event.set()
+
+    def next_page(self) -> Dict[str, Any]:
+        """
+        Read the next page.
+
+        Returns:
+            { success, files, done, cancelled, totals: { count, bytes }, folderName, error? }
+        """
+        with self._lock:
+            self.last_access = time.monotonic()
+            files = []
+            error = None
+            if not self.done:
+                try:
+                    for file_info in self._iterator:
+                        self.count += 1
+                        self.total_bytes += file_info["size"]
+                        if self.include_files:
+                            files.append(file_info)
+                        if self.count % self.page_size == 0:
+                            break
+                    else:
+                        self.done = True
+                except Exception as e:
+                    error = str(e)
+                    self.done = True
+            if self.cancel_event.is_set():
+                self.done = True
+            result: Dict[str, Any] = {
+                "success": error is None,
+                "files": files,
+                "done": self.done,
+                "cancelled": self.cancel_event.is_set(),
+                "totals": {"count": self.count, "bytes": self.total_bytes},
+                "folderName": self.folder_name,
+            }
+            if error is not None:
+                result["error"] = error
+            return result
 
 
 def list_folder_files(
@@ -28,21 +150,9 @@ def list_folder_files(
         return {"success": False, "error": "Invalid folder path", "files": []}
     
     try:
-        files = []
         base_name = os.path.basename(os.path.normpath(folder_path))
-        
-        for root, _, filenames in os.walk(folder_path):
-            for filename in filenames:
-                abs_path = os.path.join(root, filename)
-                rel_path = os.path.relpath(abs_path, folder_path)
-                # Display path includes the folder name for clarity
-                display_path = os.path.join(base_name, rel_path)
-                
-                files.append({
-                    "path": abs_path,
-                    "displayPath": display_path,
-                    "fileName": filename,
-                })
+        # Display path includes the folder name for clarity
+        files = list(iter_folder_files(folder_path))
         
         return {
             "success": True,
@@ -112,8 +222,11 @@ def save_receive_history(
     """
     try:
         os.makedirs(os.path.dirname(history_path), exist_ok=True)
-        with open(history_path, "w", encoding="utf-8") as f:
+        # Write a temp file and rename it so a crash never leaves a truncated history
+        tmp_path = history_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(history, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, history_path)
         return True
     except Exception as e:
         if logger:
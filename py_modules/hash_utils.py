@@ -0,0 +1,177 @@
+"""
+Content hashing for outgoing folder manifests.
+Note: This module does NOT use decky directly. Logging is done via callbacks.
+
+hashlib releases the GIL while digesting large buffers, so a thread pool is
+enough to hash several files in parallel without the cost of spawning
+processes on the handheld.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+SUPPORTED_ALGORITHMS = ("sha256", "sha1", "md5", "blake2b", "blake2s")
+HASH_BUFFER_SIZE = 1024 * 1024
+
+
+def hash_file(path: str, algorithm: str = "sha256", buffer_size: int = HASH_BUFFER_SIZE) -> str:
+    """
+    Hash a file with large buffered reads.
+
+    Args:
+        path: File path
+        algorithm: One of SUPPORTED_ALGORITHMS
+        buffer_size: Read buffer size in bytes
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.new(algorithm)
+    buf = bytearray(buffer_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+class HashCache:
+    """Persistent digest cache keyed by (algorithm, path, size, mtime_ns), LRU-bounded."""
+
+    def __init__(
+        self,
+        cache_path: str,
+        max_entries: int = 50000,
+        logger: Callable[[str], None] = None,
+    ):
+        """
+        Args:
+            cache_path: JSON file backing the cache
+            max_entries: Maximum number of cached digests
+            logger: Optional logging callback for errors
+        """
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self._log = logger or (lambda msg: None)
+        self._lock = threading.Lock()
+        self._entries: Optional["OrderedDict[str, str]"] = None
+        self._dirty = False
+
+    @staticmethod
+    def _key(algorithm: str, path: str, size: int, mtime_ns: int) -> str:
+        return f"{algorithm}:{size}:{mtime_ns}:{path}"
+
+    def _load(self) -> "OrderedDict[str, str]":
+        if self._entries is None:
+            self._entries = OrderedDict()
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    self._entries.update(json.load(f))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self._log(f"Failed to load hash cache: {e}")
+        return self._entries
+
+    def get(self, algorithm: str, path: str, size: int, mtime_ns: int) -> Optional[str]:
+        key = self._key(algorithm, path, size, mtime_ns)
+        with self._lock:
+            entries = self._load()
+            value = entries.get(key)
+            if value is not None:
+                entries.move_to_end(key)
+            return value
+
+    def put(self, algorithm: str, path: str, size: int, mtime_ns: int, digest: str):
+        key = self._key(algorithm, path, size, mtime_ns)
+        with self._lock:
+            entries = self._load()
+            entries[key] = digest
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._dirty = True
+
+    def save(self) -> bool:
+        """Write the cache to disk if it changed."""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return True
+            data = dict(self._entries)
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.cache_path)
+            return True
+        except Exception as e:
+            self._log(f"Failed to save hash cache: {e}")
+            return False
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()
+            self._dirty = True
+
+
+def hash_files(
+    files: List[Dict[str, Any]],
+    algorithm: str,
+    cache: Optional[HashCache] = None,
+    max_workers: int = 4,
+    logger: Callable[[str], None] = None
+) -> Tuple[int, int]:
+    """
+    Add "hash" (and a fresh "size") to each file entry, hashing in a thread pool.
+
+    Files whose (path, size, mtime_ns) is in the cache are not read again.
+    Entries that cannot be read get "hash": None and an "error".
+
+    Args:
+        files: Entries with a "path" key; updated in place
+        algorithm: One of SUPPORTED_ALGORITHMS
+        cache: Optional digest cache
+        max_workers: Hashing threads
+        logger: Optional logging callback for errors
+
+    Returns:
+        Tuple of (files hashed, files served from cache)
+    """
+    counters = {"hashed": 0, "cached": 0}
+    counter_lock = threading.Lock()
+
+    def work(entry: Dict[str, Any]):
+        path = entry["path"]
+        try:
+            st = os.stat(path)
+            entry["size"] = st.st_size
+            digest = cache.get(algorithm, path, st.st_size, st.st_mtime_ns) if cache else None
+            if digest is not None:
+                with counter_lock:
+                    counters["cached"] += 1
+            else:
+                digest = hash_file(path, algorithm)
+                if cache:
+                    cache.put(algorithm, path, st.st_size, st.st_mtime_ns, digest)
+                with counter_lock:
+                    counters["hashed"] += 1
+            entry["hash"] = digest
+        except Exception as e:
+            entry["hash"] = None
+            entry["error"] = str(e)
+            if logger:
+                logger(f"Failed to hash {path}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="localsend-hash") as pool:
+        list(pool.map(work, files))
+    return counters["hashed"], counters["cached"]
@@ -0,0 +1,152 @@
+"""
+Log file utilities (rotation and tail reading).
+Note: This module does NOT use decky directly. Logging is done via callbacks.
+"""
+
+import os
+import gzip
+import shutil
+from typing import Dict, Any, Callable, List, Optional
+
+TAIL_BLOCK_SIZE = 8192
+
+
+def _segment_path(log_path: str, index: int, compress: bool) -> str:
+    return f"{log_path}.{index}.gz" if compress else f"{log_path}.{index}"
+
+
+def rotate_log(
+    log_path: str,
+    max_bytes: int,
+    backup_count: int,
+    compress: bool = False,
+    logger: Callable[[str], None] = None
+) -> bool:
+    """
+    Rotate a log file by size using copy-and-truncate.
+
+    The backend keeps its log file descriptor open in append mode, so the file
+    is copied to "<log>.1" (or "<log>.1.gz") and truncated in place rather than
+    renamed; subsequent writes land at the start of the emptied file.
+
+    Args:
+        log_path: Path to the active log file
+        max_bytes: Rotate once the file reaches this size (0 disables rotation)
+        backup_count: Number of rotated segments to keep
+        compress: Gzip rotated segments
+        logger: Optional logging callback for errors
+
+    Returns:
+        True if the file was rotated, False otherwise
+    """
+    try:
+        if max_bytes <= 0 or os.path.getsize(log_path) < max_bytes:
+            return False
+    except OSError:
+        return False
+
+    try:
+        if backup_count <= 0:
+            os.truncate(log_path, 0)
+            return True
+
+        # Drop the oldest segment (either flavour, compress may have been toggled)
+        for compressed in (True, False):
+            oldest = _segment_path(log_path, backup_count, compressed)
+            if os.path.exists(oldest):
+                os.remove(oldest)
+
+        # Shift <log>.N -> <log>.N+1
+        for index in range(backup_count - 1, 0, -1):
+            for compressed in (True, False):
+                src = _segment_path(log_path, index, compressed)
+                if os.path.exists(src):
+                    os.replace(src, _segment_path(log_path, index + 1, compressed))
+
+        target = _segment_path(log_path, 1, compress)
+        with open(log_path, "rb") as src_file:
+            if compress:
+                with gzip.open(target, "wb", compresslevel=6) as dst_file:
+                    shutil.copyfileobj(src_file, dst_file, 1024 * 1024)
+            else:
+                with open(target, "wb") as dst_file:
+                    shutil.copyfileobj(src_file, dst_file, 1024 * 1024)
+        os.truncate(log_path, 0)
+        return True
+    except Exception as e:
+        if logger:
+            logger(f"Failed to rotate log {log_path}: {e}")
+        return False
+
+
+def _read_last_lines(f, size: int, lines: int, start: int = 0) -> bytes:
+    """Read backwards from the end of f until `lines` newlines are found or `start` is reached."""
+    pos = size
+    chunks: List[bytes] = []
+    newlines = 0
+    # A trailing newline terminates the last line, it does not start a new one
+    needed = lines + 1
+    while pos > start and newlines < needed:
+        read_size = min(TAIL_BLOCK_SIZE, pos - start)
+        pos -= read_size
+        f.seek(pos)
+        chunk = f.read(read_size)
+        chunks.append(chunk)
+        newlines += chunk.count(b"\n")
+    return b"".join(reversed(chunks))
+
+
+def tail_log(
+    log_path: str,
+    lines: int = 100,
+    since_offset: Optional[int] = None,
+    max_bytes: int = 256 * 1024,
+    logger: Callable[[str], None] = None
+) -> Dict[str, Any]:
+    """
+    Read the end of a log file without loading the whole file.
+
+    Args:
+        log_path: Path to the log file
+        lines: Maximum number of lines to return
+        since_offset: Offset returned by a previous call; only newer output is returned.
+            If the file shrank below it (rotation), the tail is returned and "reset" is set.
+        max_bytes: Upper bound on bytes read from disk
+        logger: Optional logging callback for errors
+
+    Returns:
+        { success, lines, offset, size, reset?, error? }; pass "offset" back as since_offset
+    """
+    lines = max(int(lines or 0), 0)
+    try:
+        with open(log_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            reset = since_offset is not None and since_offset > size
+            start = 0
+            if since_offset is not None and not reset:
+                start = since_offset
+            start = max(start, size - max_bytes)
+
+            if lines == 0 or size == start:
+                data = b""
+            else:
+                data = _read_last_lines(f, size, lines, start)
+
+        text_lines = data.decode("utf-8", errors="replace").splitlines()
+        if len(text_lines) > lines:
+            text_lines = text_lines[-lines:] if lines else []
+        result: Dict[str, Any] = {
+            "success": True,
+            "lines": text_lines,
+            "offset": size,
+            "size": size,
+        }
+        if reset:
+            result["reset"] = True
+        return result
+    except FileNotFoundError:
+        return {"success": True, "lines": [], "offset": 0, "size": 0}
+    except Exception as e:
+        if logger:
+            logger(f"Failed to read log {log_path}: {e}")
+        return {"success": False, "error": str(e), "lines": [], "offset": since_offset or 0}
@@ -0,0 +1,294 @@
+"""
+Persistent folder manifest cache with directory-mtime change detection.
+Note: This module does NOT use decky directly. Logging is done via callbacks.
+
+A manifest records, per directory below a root folder, the directory's
+st_mtime_ns, its files (name, size, mtime) and its subdirectory names.
+Adding, removing or renaming an entry updates the parent directory's mtime,
+so a rescan only has to stat each directory and re-list those whose mtime
+changed. In-place edits of a file do not touch the directory mtime; the
+size/mtime reported for such a file stay stale until its directory changes.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+MANIFEST_VERSION = 1
+
+
+def _scan_dir(path: str) -> Tuple[List[list], List[str]]:
+    files: List[list] = []
+    subdirs: List[str] = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                    continue
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            files.append([entry.name, st.st_size, st.st_mtime])
+    return files, subdirs
+
+
+def refresh_manifest(
+    folder_path: str,
+    previous: Optional[Dict[str, Any]] = None
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Build or refresh a folder manifest.
+
+    Args:
+        folder_path: Root folder
+        previous: Manifest from an earlier scan of the same folder
+
+    Returns:
+        Tuple of (manifest, number of directories that had to be re-listed)
+    """
+    old_dirs = (previous or {}).get("dirs", {})
+    dirs: Dict[str, Dict[str, Any]] = {}
+    rescanned = 0
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        abs_dir = os.path.join(folder_path, rel) if rel else folder_path
+        try:
+            mtime_ns = os.stat(abs_dir).st_mtime_ns
+        except OSError:
+            if not rel:
+                raise
+            continue
+        cached = old_dirs.get(rel)
+        if cached is not None and cached.get("mtime_ns") == mtime_ns:
+            node = cached
+        else:
+            try:
+                files, subdirs = _scan_dir(abs_dir)
+            except OSError:
+                if not rel:
+                    raise
+                continue
+            node = {"mtime_ns": mtime_ns, "files": files, "subdirs": subdirs}
+            rescanned += 1
+        dirs[rel] = node
+        for name in reversed(node["subdirs"]):
+            stack.append(rel + os.sep + name if rel else name)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "root": folder_path,
+        "scanned_at": time.time(),
+        "dirs": dirs,
+        "count": sum(len(d["files"]) for d in dirs.values()),
+        "bytes": sum(f[1] for d in dirs.values() for f in d["files"]),
+    }
+    return manifest, rescanned
+
+
+def manifest_files(manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expand a manifest into list_folder_files-style entries."""
+    root = manifest["root"]
+    base_name = os.path.basename(os.path.normpath(root))
+    files = []
+    for rel, node in manifest["dirs"].items():
+        abs_dir = os.path.join(root, rel) if rel else root
+        display_dir = base_name + os.sep + rel if rel else base_name
+        for name, size, mtime in node["files"]:
+            files.append({
+                "path": os.path.join(abs_dir, name),
+                "displayPath": display_dir + os.sep + name,
+                "fileName": name,
+                "size": size,
+                "mtime": mtime,
+            })
+    return files
+
+
+class FolderManifestCache:
+    """Folder manifests persisted as one JSON file per folder, LRU-evicted by total size."""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_total_bytes: int = 16 * 1024 * 1024,
+        max_memory_entries: int = 8,
+        logger: Callable[[str], None] = None,
+    ):
+        """
+        Args:
+            cache_dir: Directory holding the manifest files
+            max_total_bytes: Upper bound for the manifest files on disk
+            max_memory_entries: Manifests kept decoded in memory
+            logger: Optional logging callback for errors
+        """
+        self.cache_dir = cache_dir
+        self.max_total_bytes = max_total_bytes
+        self.max_memory_entries = max_memory_entries
+        self._log = logger or (lambda msg: None)
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # manifest file name -> size on disk, least recently used first
+        self._disk_index: Optional["OrderedDict[str, int]"] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _file_name(self, folder_path: str) -> str:
+        return hashlib.sha1(folder_path.encode("utf-8", "surrogateescape")).hexdigest() + ".json"
+
+    def _load_disk_index(self) -> "OrderedDict[str, int]":
+        if self._disk_index is None:
+            entries = []
+            try:
+                with os.scandir(self.cache_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith(".json"):
+                            st = entry.stat()
+                            entries.append((st.st_mtime, entry.name, st.st_size))
+            except FileNotFoundError:
+                pass
+            entries.sort()
+            self._disk_index = OrderedDict((name, size) for _, name, size in entries)
+        return self._disk_index
+
+    def _read(self, folder_path: str) -> Optional[Dict[str, Any]]:
+        manifest = self._memory.get(folder_path)
+        if manifest is not None:
+            self._memory.move_to_end(folder_path)
+            return manifest
+        path = os.path.join(self.cache_dir, self._file_name(folder_path))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self._log(f"Failed to read folder manifest {path}: {e}")
+            return None
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("root") != folder_path:
+            return None
+        self._remember(folder_path, manifest)
+        return manifest
+
+    def _remember(self, folder_path: str, manifest: Dict[str, Any]):
+        self._memory[folder_path] = manifest
+        self._memory.move_to_end(folder_path)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _write(self, folder_path: str, manifest: Dict[str, Any]):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        name = self._file_name(folder_path)
+        path = os.path.join(self.cache_dir, name)
+        tmp_path = path + ".tmp"
+        data = json.dumps(manifest, ensure_ascii=False, separators=(",", ":"))
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        index = self._load_disk_index()
+        index[name] = os.path.getsize(path)
+        index.move_to_end(name)
+        self._evict(keep=name)
+
+    def _touch(self, folder_path: str):
+        name = self._file_name(folder_path)
+        index = self._load_disk_index()
+        if name in index:
+            index.move_to_end(name)
+            try:
+                os.utime(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    def _evict(self, keep: str):
+        index = self._load_disk_index()
+        total = sum(index.values())
+        for name in list(index):
+            if total <= self.max_total_bytes:
+                break
+            if name == keep:
+                continue
+            total -= index.pop(name)
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+        for folder_path in [p for p in self._memory if self._file_name(p) not in index]:
+            self._memory.pop(folder_path, None)
+
+    def get_manifest(self, folder_path: str) -> Dict[str, Any]:
+        """
+        Get the manifest of a folder, rescanning only directories whose mtime changed.
+
+        Args:
+            folder_path: Root folder
+
+        Returns:
+            { success, files, folderName, count, bytes, cached, rescannedDirs, error? }
+        """
+        folder_path = os.path.normpath(folder_path)
+        base_name = os.path.basename(folder_path)
+        try:
+            with self._lock:
+                previous = self._read(folder_path)
+                manifest, rescanned = refresh_manifest(folder_path, previous)
+                if previous is not None and rescanned == 0:
+                    self.hits += 1
+                    manifest = previous
+                    self._touch(folder_path)
+                else:
+                    self.misses += 1
+                    self._remember(folder_path, manifest)
+                    try:
+                        self._write(folder_path, manifest)
+                    except Exception as e:
+                        self._log(f"Failed to write folder manifest: {e}")
+            return {
+                "success": True,
+                "files": manifest_files(manifest),
+                "folderName": base_name,
+                "count": manifest["count"],
+                "bytes": manifest["bytes"],
+                "cached": rescanned == 0 and previous is not None,
+                "rescannedDirs": rescanned,
+            }
+        except Exception as e:
+            self._log(f"Failed to build folder manifest: {e}")
+            return {"success": False, "error": str(e), "files": []}
+
+    def invalidate(self, folder_path: Optional[str] = None):
+        """Drop the manifest of one folder, or every manifest when folder_path is None."""
+        with self._lock:
+            index = self._load_disk_index()
+            if folder_path is None:
+                names = list(index)
+                self._memory.clear()
+            else:
+                folder_path = os.path.normpath(folder_path)
+                names = [self._file_name(folder_path)]
+                self._memory.pop(folder_path, None)
+            for name in names:
+                index.pop(name, None)
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters and disk usage."""
+        with self._lock:
+            index = self._load_disk_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "manifests": len(index),
+                "bytes": sum(index.values()),
+                "max_bytes": self.max_total_bytes,
+            }
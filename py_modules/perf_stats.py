@@ -0,0 +1,179 @@
+"""
+Per-call latency histograms and counters for plugin callables.
+Note: This module does NOT use decky directly.
+"""
+
+import re
+import time
+import bisect
+import inspect
+import functools
+import threading
+from typing import Callable, Dict, Any, Iterable, List, Optional
+
+# Upper bounds in ms: 0.1ms * 2^k up to ~26s, plus an overflow bucket
+BUCKET_BOUNDS_MS: List[float] = [round(0.1 * (2 ** k), 1) for k in range(19)]
+MAX_KEYS = 256
+OVERFLOW_KEY = "<other>"
+
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F]{16,}|[0-9a-fA-F-]{32,36}|\d+)$")
+
+
+def normalize_path(path: str) -> str:
+    """Drop the query string and replace id-like path segments with ':id'."""
+    path = str(path or "").split("?", 1)[0]
+    return "/".join(":id" if _ID_SEGMENT.match(seg) else seg for seg in path.split("/"))
+
+
+def is_error_result(result: Any) -> bool:
+    """Treat {"success": False} and {"status": >= 400} results as errors."""
+    if not isinstance(result, dict):
+        return False
+    if result.get("success") is False:
+        return True
+    status = result.get("status")
+    return isinstance(status, int) and status >= 400
+
+
+class _Series:
+    __slots__ = ("calls", "errors", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th percentile."""
+        if not self.calls:
+            return None
+        rank = q * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else round(self.max_ms, 1)
+        return round(self.max_ms, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": list(self.buckets),
+        }
+
+
+class PerfStats:
+    """Thread-safe call counters and fixed log-scale latency histograms."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._series: Dict[str, _Series] = {}
+        self._since = time.time()
+
+    def record(self, key: str, elapsed_ms: float, error: bool = False):
+        """Record one call."""
+        index = bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if len(self._series) >= MAX_KEYS:
+                    key = OVERFLOW_KEY
+                series = self._series.setdefault(key, _Series())
+            series.calls += 1
+            series.total_ms += elapsed_ms
+            if elapsed_ms > series.max_ms:
+                series.max_ms = elapsed_ms
+            series.buckets[index] += 1
+            if error:
+                series.errors += 1
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Any]:
+        """
+        Get all series.
+
+        Args:
+            reset: Clear the counters after taking the snapshot
+
+        Returns:
+            { enabled, since, bucket_bounds_ms, calls: {key: series} }
+        """
+        with self._lock:
+            result = {
+                "enabled": self.enabled,
+                "since": self._since,
+                "bucket_bounds_ms": BUCKET_BOUNDS_MS,
+                "calls": {key: series.to_dict() for key, series in sorted(self._series.items())},
+            }
+            if reset:
+                self._series = {}
+                self._since = time.time()
+        return result
+
+    def wrap(self, name: str, func: Callable, label: Optional[Callable[..., str]] = None) -> Callable:
+        """
+        Wrap a coroutine function so each call is recorded.
+
+        Args:
+            name: Series name
+            func: Coroutine function (bound method)
+            label: Optional callback (*args, **kwargs) -> suffix appended to the series name
+
+        Returns:
+            Wrapped coroutine function
+        """
+        stats = self
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not stats.enabled:
+                return await func(*args, **kwargs)
+            key = name
+            if label is not None:
+                try:
+                    key = f"{name} {label(*args, **kwargs)}"
+                except Exception:
+                    pass
+            start = time.perf_counter()
+            error = True
+            try:
+                result = await func(*args, **kwargs)
+                error = is_error_result(result)
+                return result
+            finally:
+                stats.record(key, (time.perf_counter() - start) * 1000, error)
+
+        return wrapper
+
+
+def instrument_coroutines(
+    obj: Any,
+    stats: PerfStats,
+    labels: Optional[Dict[str, Callable[..., str]]] = None,
+    exclude: Iterable[str] = (),
+):
+    """
+    Replace every public coroutine method of obj with an instrumented instance attribute.
+
+    Args:
+        obj: Instance to instrument
+        stats: Collector
+        labels: Optional per-method label callbacks (see PerfStats.wrap)
+        exclude: Method names to leave untouched
+    """
+    labels = labels or {}
+    excluded = set(exclude)
+    for cls in reversed(type(obj).__mro__):
+        for name, attr in vars(cls).items():
+            if name.startswith("_") or name in excluded or not inspect.iscoroutinefunction(attr):
+                continue
+            setattr(obj, name, stats.wrap(name, getattr(obj, name), labels.get(name)))
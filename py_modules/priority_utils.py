@@ -0,0 +1,262 @@
+"""
+CPU / IO scheduling profiles for the backend process while a game is running.
+Note: This module does NOT use decky directly. All callbacks are passed in.
+
+Linux keeps nice, ioprio and CPU affinity per thread, so profiles are applied
+to every thread in /proc/<pid>/task. Without CAP_SYS_NICE a lowered nice
+value cannot be raised again; the normal profile then takes effect on the
+next backend start.
+"""
+
+import os
+import time
+import errno
+import threading
+import asyncio
+import platform
+from typing import Callable, Dict, Any, List, Optional, Set
+
+PRIORITY_POLICIES = ("off", "auto", "background")
+FOREGROUND_SIGNALS = ("steam_game", "manual")
+
+IOPRIO_CLASS_BE = 2
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_WHO_PROCESS = 1
+_SYS_IOPRIO_SET = {"x86_64": 251, "aarch64": 30, "armv7l": 314, "i686": 289}
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "normal": {"nice": 0, "io_class": IOPRIO_CLASS_BE, "io_level": 4},
+    "background": {"nice": 10, "io_class": IOPRIO_CLASS_IDLE, "io_level": 0},
+}
+
+_libc = None
+
+
+def ioprio_set(tid: int, io_class: int, level: int):
+    """Set the IO priority of a thread via the ioprio_set syscall; raises OSError."""
+    global _libc
+    nr = _SYS_IOPRIO_SET.get(platform.machine())
+    if nr is None:
+        raise OSError(errno.ENOSYS, f"ioprio_set not known on {platform.machine()}")
+    import ctypes
+
+    if _libc is None:
+        _libc = ctypes.CDLL(None, use_errno=True)
+    if _libc.syscall(nr, IOPRIO_WHO_PROCESS, tid, (io_class << IOPRIO_CLASS_SHIFT) | level) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+
+
+def parse_cpu_list(spec: str) -> Optional[Set[int]]:
+    """Parse "0-2,5" into {0, 1, 2, 5}; empty or invalid specs give None."""
+    cpus: Set[int] = set()
+    try:
+        for part in (spec or "").split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "-" in part:
+                low, high = part.split("-", 1)
+                cpus.update(range(int(low), int(high) + 1))
+            else:
+                cpus.add(int(part))
+    except ValueError:
+        return None
+    return cpus or None
+
+
+def list_threads(pid: int) -> List[int]:
+    try:
+        return [int(tid) for tid in os.listdir(f"/proc/{pid}/task")]
+    except OSError:
+        return [pid]
+
+
+def apply_profile(pid: int, profile: str, cpus: Optional[Set[int]] = None) -> Dict[str, Any]:
+    """
+    Apply a profile from PROFILES to every thread of pid.
+
+    Args:
+        pid: Backend process id
+        profile: "normal" or "background"
+        cpus: CPU set for the background profile (None leaves affinity alone;
+              the normal profile always restores all CPUs)
+
+    Returns:
+        { profile, threads, errors: {setting: message} }
+    """
+    settings = PROFILES[profile]
+    errors: Dict[str, str] = {}
+    if profile == "normal":
+        cpus = set(range(os.cpu_count() or 1))
+    threads = list_threads(pid)
+    for tid in threads:
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, settings["nice"])
+        except OSError as e:
+            errors.setdefault("nice", str(e))
+        try:
+            ioprio_set(tid, settings["io_class"], settings["io_level"])
+        except OSError as e:
+            errors.setdefault("ioprio", str(e))
+        if cpus:
+            try:
+                os.sched_setaffinity(tid, cpus)
+            except (OSError, AttributeError) as e:
+                errors.setdefault("affinity", str(e))
+    return {"profile": profile, "threads": len(threads), "errors": errors}
+
+
+def steam_game_running(proc_root: str = "/proc") -> bool:
+    """Detect a running Steam game: Steam launches games through `reaper SteamLaunch AppId=...`."""
+    try:
+        pids = [name for name in os.listdir(proc_root) if name.isdigit()]
+    except OSError:
+        return False
+    for pid in pids:
+        try:
+            with open(os.path.join(proc_root, pid, "comm"), "r") as f:
+                if f.read().strip() != "reaper":
+                    continue
+            with open(os.path.join(proc_root, pid, "cmdline"), "rb") as f:
+                if b"SteamLaunch" in f.read():
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+class PriorityController:
+    """Switch the backend between the normal and background profiles."""
+
+    def __init__(
+        self,
+        get_pid: Callable[[], Optional[int]],
+        policy: str = "off",
+        signal: str = "steam_game",
+        background_cpus: str = "",
+        poll_interval: float = 5.0,
+        logger_info: Callable[[str], None] = None,
+        logger_error: Callable[[str], None] = None,
+    ):
+        """
+        Args:
+            get_pid: Callback returning the backend pid (or None when not running)
+            policy: "off", "auto" (background while the foreground signal is active) or "background"
+            signal: "steam_game" (detect a running game) or "manual" (set_foreground)
+            background_cpus: CPU list for the background profile, e.g. "0-1" ("" = all)
+            poll_interval: Seconds between checks
+            logger_info: Callback for info logging
+            logger_error: Callback for error logging
+        """
+        self._get_pid = get_pid
+        self.policy = policy
+        self.signal = signal
+        self.background_cpus = background_cpus
+        self.poll_interval = poll_interval
+        self._log_info = logger_info or (lambda msg: None)
+        self._log_error = logger_error or (lambda msg: None)
+
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self.manual_foreground = False
+        self.foreground_active = False
+        self.profile = "normal"
+        self._applied_pid: Optional[int] = None
+        self.applied_at: Optional[float] = None
+        self.last_errors: Dict[str, str] = {}
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> bool:
+        """Start the policy task on the running event loop."""
+        if self.is_running():
+            return True
+        self._task = asyncio.ensure_future(self._run())
+        return True
+
+    async def stop(self):
+        """Stop the policy task."""
+        if not self.is_running():
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def configure(self, policy: str, signal: str, background_cpus: str):
+        self.policy = policy
+        self.signal = signal
+        self.background_cpus = background_cpus
+
+    def set_foreground(self, active: bool):
+        """Foreground signal for signal="manual" (e.g. reported by the frontend)."""
+        self.manual_foreground = bool(active)
+
+    def _wanted_profile(self) -> str:
+        if self.policy == "background":
+            return "background"
+        if self.policy != "auto":
+            self.foreground_active = False
+            return "normal"
+        if self.signal == "manual":
+            self.foreground_active = self.manual_foreground
+        else:
+            self.foreground_active = steam_game_running()
+        return "background" if self.foreground_active else "normal"
+
+    def evaluate(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Apply the wanted profile if it or the backend pid changed.
+
+        Blocking (/proc scan and syscalls); call from an executor on the loop.
+        """
+        with self._lock:
+            return self._evaluate(force)
+
+    def _evaluate(self, force: bool) -> Dict[str, Any]:
+        pid = self._get_pid()
+        wanted = self._wanted_profile()
+        if pid is None:
+            self._applied_pid = None
+            return self.get_status()
+        if pid != self._applied_pid:
+            # A freshly started backend runs with the normal profile
+            self._applied_pid, self.profile = pid, "normal"
+        if wanted == self.profile and not (force and wanted == "background"):
+            return self.get_status()
+        result = apply_profile(pid, wanted, parse_cpu_list(self.background_cpus))
+        self.profile = wanted
+        self.applied_at = time.time()
+        self.last_errors = result["errors"]
+        self._log_info(f"Backend priority profile: {wanted} ({result['threads']} threads)")
+        if result["errors"]:
+            self._log_error(f"Backend priority profile {wanted} partially applied: {result['errors']}")
+        return self.get_status()
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.evaluate)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._log_error(f"Backend priority policy error: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "signal": self.signal,
+            "background_cpus": self.background_cpus,
+            "foreground_active": self.foreground_active,
+            "profile": self.profile,
+            "pid": self._applied_pid,
+            "applied_at": self.applied_at,
+            "errors": self.last_errors,
+        }
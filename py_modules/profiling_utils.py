@@ -0,0 +1,176 @@
+"""
+On-demand CPU (cProfile) and memory (tracemalloc) profiling sessions.
+Note: This module does NOT use decky directly. Logging is done via callbacks.
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Any, Callable, List, Optional
+
+PROFILE_KINDS = ("cpu", "memory")
+MAX_PROFILE_DURATION = 600.0
+
+
+class ProfileSession:
+    """
+    A single profiling session.
+
+    CPU: the thread that calls start() (the event loop) is profiled until
+    disable(); other threads opt in per call through run(), so nothing stays
+    hooked into them once the session ends. Memory: tracemalloc snapshots
+    taken at start and stop are compared.
+
+    disable() is cheap and must run on the thread that called start();
+    stop() writes the raw profile and can run on an executor thread.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        output_dir: str,
+        top_n: int = 20,
+        logger: Callable[[str], None] = None,
+    ):
+        """
+        Args:
+            kind: One of PROFILE_KINDS
+            output_dir: Directory the raw profile is written to
+            top_n: Number of entries in the returned summary
+            logger: Optional logging callback for errors
+        """
+        if kind not in PROFILE_KINDS:
+            raise ValueError(f"Unsupported profile kind: {kind}")
+        self.kind = kind
+        self.output_dir = output_dir
+        self.top_n = max(1, int(top_n))
+        self._log = logger or (lambda msg: None)
+        self.started_at: Optional[float] = None
+        self._main_profile = None
+        self._thread_profiles: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+        self._active = False
+        self._started_tracemalloc = False
+        self._start_snapshot = None
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def start(self):
+        """Start profiling; CPU profiling covers the calling thread."""
+        if self.kind == "cpu":
+            import cProfile
+
+            self._main_profile = cProfile.Profile()
+            self._main_profile.enable()
+        else:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._start_snapshot = tracemalloc.take_snapshot()
+        self.started_at = time.time()
+        self._active = True
+
+    def run(self, func: Callable, *args, **kwargs):
+        """Call func, profiling it if this is a CPU session on another thread."""
+        if not self._active or self.kind != "cpu":
+            return func(*args, **kwargs)
+        import cProfile
+
+        ident = threading.get_ident()
+        with self._lock:
+            profile = self._thread_profiles.get(ident)
+            if profile is None:
+                profile = self._thread_profiles[ident] = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler already covers this thread
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+
+    def disable(self):
+        """Stop collecting; call on the thread that called start()."""
+        self._active = False
+        if self.kind == "cpu" and self._main_profile is not None:
+            self._main_profile.disable()
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        Stop profiling, write the raw profile and summarize it.
+
+        Blocking (pstats / tracemalloc snapshot and file writes); call disable()
+        first when running this on an executor thread.
+
+        Returns:
+            { success, kind, duration, path, summary, error? }
+        """
+        if self._active:
+            self.disable()
+        duration = round(time.time() - (self.started_at or time.time()), 3)
+        started = self.started_at or time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started)) + f"-{int(started * 1000) % 1000:03d}"
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            if self.kind == "cpu":
+                path = os.path.join(self.output_dir, f"profile-cpu-{stamp}.prof")
+                summary = self._stop_cpu(path)
+            else:
+                path = os.path.join(self.output_dir, f"profile-memory-{stamp}.tracemalloc")
+                summary = self._stop_memory(path)
+        except Exception as e:
+            self._log(f"Failed to finish {self.kind} profile: {e}")
+            return {"success": False, "kind": self.kind, "duration": duration, "error": str(e)}
+        return {"success": True, "kind": self.kind, "duration": duration, "path": path, "summary": summary}
+
+    def _stop_cpu(self, path: str) -> List[Dict[str, Any]]:
+        import pstats
+
+        stats = pstats.Stats(self._main_profile)
+        with self._lock:
+            thread_profiles = list(self._thread_profiles.values())
+            self._thread_profiles = {}
+        for profile in thread_profiles:
+            try:
+                stats.add(profile)
+            except TypeError:
+                # Profile never ran (enable() was refused)
+                pass
+        stats.dump_stats(path)
+        stats.sort_stats("cumulative")
+        summary = []
+        for func in stats.fcn_list[:self.top_n]:
+            _, ncalls, tottime, cumtime, _ = stats.stats[func]
+            filename, lineno, name = func
+            summary.append({
+                "function": f"{filename}:{lineno}({name})",
+                "calls": ncalls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            })
+        return summary
+
+    def _stop_memory(self, path: str) -> List[Dict[str, Any]]:
+        import tracemalloc
+
+        snapshot = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        snapshot.dump(path)
+        summary = []
+        for stat in snapshot.compare_to(self._start_snapshot, "lineno")[:self.top_n]:
+            summary.append({
+                "location": str(stat.traceback[0]),
+                "size_kib": round(stat.size / 1024, 1),
+                "size_diff_kib": round(stat.size_diff / 1024, 1),
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            })
+        self._start_snapshot = None
+        return summary
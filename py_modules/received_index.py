@@ -0,0 +1,192 @@
+"""
+SQLite full-text index of received files.
+Note: This module does NOT use decky directly. Logging is done via callbacks.
+
+Names and peers are indexed with FTS5 when the bundled SQLite has it;
+otherwise searches fall back to LIKE on the plain table.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import threading
+from typing import Dict, Any, Callable, List, Optional
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class ReceivedFileIndex:
+    """Searchable record of every file saved by the receiver (name, size, mtime, session, peer)."""
+
+    def __init__(self, db_path: str, logger: Callable[[str], None] = None):
+        """
+        Args:
+            db_path: SQLite database file
+            logger: Optional logging callback for errors
+        """
+        self.db_path = db_path
+        self._log = logger or (lambda msg: None)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.fts = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS received_files ("
+                " id INTEGER PRIMARY KEY,"
+                " path TEXT UNIQUE NOT NULL,"
+                " name TEXT NOT NULL,"
+                " size INTEGER,"
+                " mtime REAL,"
+                " session_id TEXT,"
+                " peer TEXT,"
+                " received_at REAL)"
+            )
+            try:
+                conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS received_fts USING fts5(name, peer)")
+                self.fts = True
+            except sqlite3.OperationalError:
+                self.fts = False
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def add_files(self, paths: List[str], session_id: str = "", peer: str = "") -> int:
+        """
+        Index saved files; a path that is already indexed is updated.
+
+        Returns:
+            Number of files indexed (missing files are skipped)
+        """
+        rows = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            rows.append((path, os.path.basename(path), st.st_size, st.st_mtime))
+        if not rows:
+            return 0
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    for path, name, size, mtime in rows:
+                        old = conn.execute("SELECT id FROM received_files WHERE path = ?", (path,)).fetchone()
+                        if old is not None:
+                            conn.execute("DELETE FROM received_files WHERE id = ?", (old[0],))
+                            if self.fts:
+                                conn.execute("DELETE FROM received_fts WHERE rowid = ?", (old[0],))
+                        cur = conn.execute(
+                            "INSERT INTO received_files (path, name, size, mtime, session_id, peer, received_at)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (path, name, size, mtime, session_id, peer, now),
+                        )
+                        if self.fts:
+                            conn.execute(
+                                "INSERT INTO received_fts (rowid, name, peer) VALUES (?, ?, ?)",
+                                (cur.lastrowid, name, peer),
+                            )
+        except sqlite3.Error as e:
+            self._log(f"Failed to index received files: {e}")
+            return 0
+        return len(rows)
+
+    def refresh(self, paths: List[str]) -> int:
+        """
+        Update size and mtime of indexed files that changed on disk (e.g. replaced by a link).
+
+        Returns:
+            Number of rows updated
+        """
+        rows = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            rows.append((st.st_size, st.st_mtime, path))
+        if not rows:
+            return 0
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    cur = conn.executemany("UPDATE received_files SET size = ?, mtime = ? WHERE path = ?", rows)
+                    return cur.rowcount
+        except sqlite3.Error as e:
+            self._log(f"Failed to refresh received file index: {e}")
+            return 0
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Find received files whose name or peer matches every word of query (prefix match).
+
+        An empty query returns the most recently received files.
+
+        Args:
+            query: Free text
+            limit: Maximum number of results
+
+        Returns:
+            Rows (path, name, size, mtime, sessionId, peer, receivedAt, exists), best match first
+        """
+        tokens = _TOKEN.findall(query or "")
+        limit = max(1, min(int(limit or 50), 500))
+        columns = "f.path, f.name, f.size, f.mtime, f.session_id, f.peer, f.received_at"
+        with self._lock:
+            conn = self._connect()
+            if not tokens:
+                rows = conn.execute(
+                    f"SELECT {columns} FROM received_files f ORDER BY f.received_at DESC LIMIT ?", (limit,)
+                ).fetchall()
+            elif self.fts:
+                match = " ".join(f'"{token}"*' for token in tokens)
+                rows = conn.execute(
+                    f"SELECT {columns} FROM received_fts JOIN received_files f ON f.id = received_fts.rowid"
+                    " WHERE received_fts MATCH ? ORDER BY bm25(received_fts), f.received_at DESC LIMIT ?",
+                    (match, limit),
+                ).fetchall()
+            else:
+                where = " AND ".join("(f.name LIKE ? OR f.peer LIKE ?)" for _ in tokens)
+                params: List[Any] = []
+                for token in tokens:
+                    params += [f"%{token}%", f"%{token}%"]
+                rows = conn.execute(
+                    f"SELECT {columns} FROM received_files f WHERE {where} ORDER BY f.received_at DESC LIMIT ?",
+                    (*params, limit),
+                ).fetchall()
+        return [
+            {
+                "path": path,
+                "name": name,
+                "size": size,
+                "mtime": mtime,
+                "sessionId": session_id,
+                "peer": peer,
+                "receivedAt": received_at,
+                "exists": os.path.exists(path),
+            }
+            for path, name, size, mtime, session_id, peer, received_at in rows
+        ]
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM received_files")
+                if self.fts:
+                    conn.execute("DELETE FROM received_fts")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,215 @@
+"""
+Backend process resource sampling from /proc.
+Note: This module does NOT use decky directly. All callbacks are passed in.
+"""
+
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Callable, Deque, Dict, Any, Optional
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+DISABLED_POLL_INTERVAL = 5.0
+MIN_SAMPLE_INTERVAL = 1.0
+
+
+def clamp_sample_interval(value: float) -> float:
+    """0 (or less) pauses sampling; anything else is at least MIN_SAMPLE_INTERVAL."""
+    value = float(value)
+    if value <= 0:
+        return 0.0
+    return max(value, MIN_SAMPLE_INTERVAL)
+
+
+def read_proc_sample(pid: int, proc_root: str = "/proc") -> Optional[Dict[str, Any]]:
+    """
+    Read raw counters of a process from /proc/<pid>/{stat,status,io}.
+
+    Args:
+        pid: Process id
+        proc_root: procfs mount point
+
+    Returns:
+        { time, cpu_seconds, threads, rss_bytes, read_bytes, write_bytes } or None
+        if the process is gone; io counters are None when /proc/<pid>/io is unreadable
+    """
+    base = os.path.join(proc_root, str(pid))
+    try:
+        with open(os.path.join(base, "stat"), "r") as f:
+            stat = f.read()
+        # comm may contain spaces and parentheses; fields resume after the last ')'
+        fields = stat[stat.rindex(")") + 2:].split()
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        threads = int(fields[17])
+
+        rss_bytes = None
+        with open(os.path.join(base, "status"), "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss_bytes = int(line.split()[1]) * 1024
+                    break
+    except (OSError, ValueError, IndexError):
+        return None
+
+    read_bytes = write_bytes = None
+    try:
+        with open(os.path.join(base, "io"), "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key == "read_bytes":
+                    read_bytes = int(value)
+                elif key == "write_bytes":
+                    write_bytes = int(value)
+    except (OSError, ValueError):
+        pass
+
+    return {
+        "time": time.monotonic(),
+        "cpu_seconds": cpu_seconds,
+        "threads": threads,
+        "rss_bytes": rss_bytes,
+        "read_bytes": read_bytes,
+        "write_bytes": write_bytes,
+    }
+
+
+def _rate(current: Optional[int], previous: Optional[int], elapsed: float) -> Optional[float]:
+    if current is None or previous is None or elapsed <= 0:
+        return None
+    return round(max(current - previous, 0) / elapsed, 1)
+
+
+class ResourceSampler:
+    """Periodically sample the backend process into a fixed-size ring buffer."""
+
+    def __init__(
+        self,
+        get_pid: Callable[[], Optional[int]],
+        interval: float = 5.0,
+        capacity: int = 360,
+        logger_info: Callable[[str], None] = None,
+        logger_error: Callable[[str], None] = None,
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            get_pid: Callback returning the backend pid (or None when not running)
+            interval: Seconds between samples; 0 pauses sampling
+            capacity: Number of samples kept
+            logger_info: Callback for info logging
+            logger_error: Callback for error logging
+        """
+        self._get_pid = get_pid
+        self.interval = interval
+        self._log_info = logger_info or (lambda msg: None)
+        self._log_error = logger_error or (lambda msg: None)
+
+        self._task: Optional[asyncio.Task] = None
+        self._samples: Deque[Dict[str, Any]] = deque(maxlen=max(1, capacity))
+        self._previous: Optional[Dict[str, Any]] = None
+        self._previous_pid: Optional[int] = None
+
+    def is_running(self) -> bool:
+        """Check if the sampler task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> bool:
+        """Start the sampler task on the running event loop."""
+        if self.is_running():
+            return True
+        self._task = asyncio.ensure_future(self._run())
+        self._log_info("Backend resource sampler started")
+        return True
+
+    async def stop(self):
+        """Stop the sampler task."""
+        if not self.is_running():
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def sample(self) -> Optional[Dict[str, Any]]:
+        """
+        Take one sample and append it to the ring buffer.
+
+        The first sample after a (re)start only sets the baseline for rates.
+
+        Returns:
+            The appended sample, or None
+        """
+        pid = self._get_pid()
+        raw = read_proc_sample(pid) if pid is not None else None
+        if raw is None:
+            self._previous = None
+            self._previous_pid = None
+            return None
+        previous = self._previous if self._previous_pid == pid else None
+        self._previous, self._previous_pid = raw, pid
+        if previous is None:
+            return None
+
+        elapsed = raw["time"] - previous["time"]
+        cpu_percent = None
+        if elapsed > 0:
+            cpu_percent = round(max(raw["cpu_seconds"] - previous["cpu_seconds"], 0) / elapsed * 100, 1)
+        entry = {
+            "time": time.time(),
+            "pid": pid,
+            "cpu_percent": cpu_percent,
+            "rss_bytes": raw["rss_bytes"],
+            "threads": raw["threads"],
+            "read_bytes_per_sec": _rate(raw["read_bytes"], previous["read_bytes"], elapsed),
+            "write_bytes_per_sec": _rate(raw["write_bytes"], previous["write_bytes"], elapsed),
+        }
+        self._samples.append(entry)
+        return entry
+
+    async def _run(self):
+        while True:
+            interval = self.interval
+            if interval <= 0:
+                self._previous = None
+                await asyncio.sleep(DISABLED_POLL_INTERVAL)
+                continue
+            try:
+                self.sample()
+            except Exception as e:
+                self._log_error(f"Backend resource sampler error: {e}")
+            await asyncio.sleep(max(interval, MIN_SAMPLE_INTERVAL))
+
+    def get_samples(self, limit: int = 0) -> Dict[str, Any]:
+        """
+        Get buffered samples (oldest first) with a summary.
+
+        Args:
+            limit: Return only the newest N samples (0 = all)
+
+        Returns:
+            { interval, capacity, latest, samples, summary }
+        """
+        samples = list(self._samples)
+        if limit and limit > 0:
+            samples = samples[-limit:]
+        cpu = [s["cpu_percent"] for s in samples if s["cpu_percent"] is not None]
+        rss = [s["rss_bytes"] for s in samples if s["rss_bytes"] is not None]
+        return {
+            "interval": self.interval,
+            "capacity": self._samples.maxlen,
+            "latest": samples[-1] if samples else None,
+            "samples": samples,
+            "summary": {
+                "count": len(samples),
+                "avg_cpu_percent": round(sum(cpu) / len(cpu), 1) if cpu else None,
+                "max_cpu_percent": max(cpu) if cpu else None,
+                "max_rss_bytes": max(rss) if rss else None,
+            },
+        }
+
+    def clear(self):
+        self._samples.clear()
@@ -0,0 +1,491 @@
+"""
+Outbound send queue with global and per-target concurrency limits.
+Note: This module does NOT use decky directly. All callbacks are passed in.
+
+Jobs run on the plugin's event loop, so they keep going when the Quick
+Access panel is closed. The backend performs the actual transfer after
+upload-batch; per-file progress and completion arrive as send_progress /
+send_finished notifications, which are routed to handle_notification.
+
+A fan-out group sends one selection to several targets: the file map is
+built once, every target's prepare-upload (which waits for the receiver to
+accept) is issued at once, and only the upload phase is limited by the
+group's own parallelism budget instead of max_concurrent.
+"""
+
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from urllib.parse import quote
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
+
+PREPARE_UPLOAD_PATH = "/api/self/v1/prepare-upload"
+UPLOAD_BATCH_PATH = "/api/self/v1/upload-batch"
+CANCEL_PATH = "/api/self/v1/cancel"
+
+STATE_QUEUED = "queued"
+STATE_PREPARING = "preparing"
+STATE_WAITING = "waiting"  # prepared, waiting for the fan-out group's upload budget
+STATE_SENDING = "sending"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+STATE_CANCELLED = "cancelled"
+FINAL_STATES = (STATE_DONE, STATE_FAILED, STATE_CANCELLED)
+
+
+def build_prepare_body(
+    target: str,
+    files: List[str],
+    folders: List[str],
+    id_prefix: str
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Build a prepare-upload request body for local files and folders.
+
+    Returns:
+        Tuple of (request body, {fileId: file entry} for the individual files)
+    """
+    files_map = {
+        f"{id_prefix}-{index}": {"id": f"{id_prefix}-{index}", "fileUrl": f"file://{path}"}
+        for index, path in enumerate(files)
+    }
+    body: Dict[str, Any] = {"targetTo": target}
+    if folders:
+        body["useFolderUpload"] = True
+        body["folderPaths"] = list(folders)
+    if files_map or not folders:
+        body["files"] = files_map
+    return body, files_map
+
+
+def rekey_files_map(files_map: Dict[str, Dict[str, Any]], id_prefix: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Copy a shared fan-out file map with ids under id_prefix.
+
+    File ids route notifications back to their job when no session id is known
+    yet, so every target of a fan-out group needs ids carrying its own job id.
+    """
+    rekeyed: Dict[str, Dict[str, Any]] = {}
+    for file_id, info in files_map.items():
+        new_id = f"{id_prefix}-{file_id.rsplit('-', 1)[-1]}"
+        rekeyed[new_id] = {**info, "id": new_id}
+    return rekeyed
+
+
+def build_batch_body(
+    session_id: str,
+    files_map: Dict[str, Dict[str, Any]],
+    tokens: Dict[str, str],
+    folders: List[str]
+) -> Dict[str, Any]:
+    """Build an upload-batch request body matching build_prepare_body."""
+    body: Dict[str, Any] = {
+        "sessionId": session_id,
+        "files": [
+            {"fileId": file_id, "token": tokens.get(file_id, ""), "fileUrl": info["fileUrl"]}
+            for file_id, info in files_map.items()
+        ],
+    }
+    if folders:
+        body["useFolderUpload"] = True
+        body["folderPaths"] = list(folders)
+        if not body["files"]:
+            del body["files"]
+    return body
+
+
+class SendQueue:
+    """Queue of outgoing transfers driven through the backend API."""
+
+    def __init__(
+        self,
+        post: Callable[[str, Dict[str, Any]], Awaitable[Tuple[Any, int]]],
+        emit: Callable[[Dict[str, Any]], None] = None,
+        max_concurrent: int = 2,
+        max_per_target: int = 1,
+        idle_timeout: float = 300.0,
+        max_finished: int = 50,
+        logger_info: Callable[[str], None] = None,
+        logger_error: Callable[[str], None] = None,
+    ):
+        """
+        Args:
+            post: Coroutine (path, json body) -> (response body, status) against the backend
+            emit: Callback receiving a job/queue update payload
+            max_concurrent: Jobs sending at the same time
+            max_per_target: Jobs sending to the same device at the same time
+            idle_timeout: Seconds without progress before a sending job is given up (failed unless every file reported)
+            max_finished: Finished jobs kept for get_jobs()
+            logger_info: Callback for info logging
+            logger_error: Callback for error logging
+        """
+        self._post = post
+        self._emit = emit or (lambda payload: None)
+        self.max_concurrent = max_concurrent
+        self.max_per_target = max_per_target
+        self.idle_timeout = idle_timeout
+        self.max_finished = max_finished
+        self._log_info = logger_info or (lambda msg: None)
+        self._log_error = logger_error or (lambda msg: None)
+
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._groups: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+        self._session_jobs: Dict[str, str] = {}
+
+    # ---- public API -------------------------------------------------------
+
+    def submit(
+        self,
+        target: str,
+        files: Optional[List[str]] = None,
+        folders: Optional[List[str]] = None,
+        pin: str = "",
+    ) -> Dict[str, Any]:
+        """
+        Queue a transfer.
+
+        Args:
+            target: Target device fingerprint
+            files: Absolute paths of individual files
+            folders: Absolute paths of folders
+            pin: Optional PIN for the target
+
+        Returns:
+            Job summary
+        """
+        job = self._new_job(target, files, folders, pin)
+        self._notify(job)
+        self._pump()
+        return self._summary(job)
+
+    def submit_fanout(
+        self,
+        targets: List[str],
+        files: Optional[List[str]] = None,
+        folders: Optional[List[str]] = None,
+        pin: str = "",
+        max_parallel: int = 2,
+    ) -> Dict[str, Any]:
+        """
+        Send one selection to several targets.
+
+        Args:
+            targets: Target device fingerprints (duplicates are ignored)
+            files: Absolute paths of individual files
+            folders: Absolute paths of folders
+            pin: Optional PIN used for every target
+            max_parallel: Targets uploading at the same time
+
+        Returns:
+            Group summary (see get_group)
+        """
+        group_id = uuid.uuid4().hex[:12]
+        _, files_map = build_prepare_body("", list(files or []), list(folders or []), group_id)
+        group = {
+            "id": group_id,
+            "jobs": [],
+            "max_parallel": max(int(max_parallel), 1),
+            "semaphore": asyncio.Semaphore(max(int(max_parallel), 1)),
+            "created": time.time(),
+        }
+        self._groups[group_id] = group
+        for target in dict.fromkeys(targets):
+            job = self._new_job(target, files, folders, pin, group_id=group_id, files_map=files_map)
+            group["jobs"].append(job["id"])
+            self._notify(job)
+        self._pump()
+        return self.get_group(group_id)
+
+    def get_group(self, group_id: str) -> Optional[Dict[str, Any]]:
+        """Aggregated and per-target progress of a fan-out group."""
+        group = self._groups.get(group_id)
+        if group is None:
+            return None
+        jobs = [self._summary(self._jobs[j]) for j in group["jobs"] if j in self._jobs]
+        states = {job["state"] for job in jobs}
+        return {
+            "id": group_id,
+            "done": states <= set(FINAL_STATES),
+            "max_parallel": group["max_parallel"],
+            "targets": jobs,
+            "totals": {
+                "targets": len(jobs),
+                "total": sum(job["total"] for job in jobs),
+                "completed": sum(job["completed"] for job in jobs),
+                "failed": sum(job["failed"] for job in jobs),
+                "targets_done": sum(1 for job in jobs if job["state"] == STATE_DONE),
+                "targets_failed": sum(1 for job in jobs if job["state"] in (STATE_FAILED, STATE_CANCELLED)),
+            },
+            "created": group["created"],
+        }
+
+    def _new_job(
+        self,
+        target: str,
+        files: Optional[List[str]],
+        folders: Optional[List[str]],
+        pin: str,
+        group_id: str = "",
+        files_map: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "id": job_id,
+            "target": target,
+            "files": list(files or []),
+            "folders": list(folders or []),
+            "pin": pin,
+            "state": STATE_QUEUED,
+            "session_id": "",
+            "total": 0,
+            "completed": 0,
+            "failed": 0,
+            "failed_file_ids": [],
+            "error": "",
+            "created": time.time(),
+            "started": None,
+            "finished": None,
+            "last_progress": None,
+            "group": group_id,
+            "files_map": files_map,
+        }
+        self._jobs[job_id] = job
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job."""
+        job = self._jobs.get(job_id)
+        if job is None or job["state"] in FINAL_STATES:
+            return False
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+        else:
+            self._finish(job, STATE_CANCELLED)
+        return True
+
+    def cancel_all(self):
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+
+    def handle_notification(self, notification_type: str, data: Dict[str, Any]):
+        """Route a backend send_progress / send_finished notification to its job (loop thread only)."""
+        job = self._job_for_session(str(data.get("sessionId") or ""), str(data.get("fileId") or ""))
+        if job is None:
+            return
+        if notification_type == "send_progress":
+            if data.get("success"):
+                job["completed"] += 1
+            else:
+                job["failed"] += 1
+                file_id = str(data.get("fileId") or "")
+                if file_id:
+                    job["failed_file_ids"].append(file_id)
+            job["last_progress"] = time.monotonic()
+            self._notify(job)
+            if job["total"] and job["completed"] + job["failed"] >= job["total"]:
+                self._wake(job)
+        elif notification_type == "send_finished":
+            reason = str(data.get("reason") or "completed")
+            if reason != "completed":
+                job["error"] = reason
+            job["finish_reason"] = reason
+            self._wake(job)
+
+    def get_jobs(self) -> List[Dict[str, Any]]:
+        """Summaries of all known jobs, oldest first."""
+        return [self._summary(job) for job in self._jobs.values()]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Queue depth and running jobs."""
+        queued = sum(1 for j in self._jobs.values() if j["state"] == STATE_QUEUED)
+        return {
+            "queued": queued,
+            "running": len(self._tasks),
+            "max_concurrent": self.max_concurrent,
+            "max_per_target": self.max_per_target,
+        }
+
+    # ---- scheduling -------------------------------------------------------
+
+    def _running_for(self, target: str) -> int:
+        return sum(1 for job_id in self._tasks if self._jobs[job_id]["target"] == target)
+
+    def _pump(self):
+        running = sum(1 for job_id in self._tasks if not self._jobs[job_id]["group"])
+        for job in list(self._jobs.values()):
+            if job["state"] != STATE_QUEUED or self._running_for(job["target"]) >= self.max_per_target:
+                continue
+            if not job["group"]:
+                # Fan-out jobs are limited by their group's budget in _send
+                if running >= self.max_concurrent:
+                    continue
+                running += 1
+            self._events[job["id"]] = asyncio.Event()
+            self._tasks[job["id"]] = asyncio.ensure_future(self._run(job))
+
+    async def _run(self, job: Dict[str, Any]):
+        try:
+            await self._send(job)
+        except asyncio.CancelledError:
+            if job["session_id"]:
+                try:
+                    await self._post(f"{CANCEL_PATH}?sessionId={quote(job['session_id'])}", {})
+                except Exception as e:
+                    self._log_error(f"Failed to cancel session {job['session_id']}: {e}")
+            self._finish(job, STATE_CANCELLED)
+        except Exception as e:
+            job["error"] = str(e)
+            self._log_error(f"Send job {job['id']} failed: {e}")
+            self._finish(job, STATE_FAILED)
+        finally:
+            self._tasks.pop(job["id"], None)
+            self._events.pop(job["id"], None)
+            self._session_jobs.pop(job["session_id"], None)
+            self._prune()
+            self._pump()
+
+    async def _send(self, job: Dict[str, Any]):
+        job["state"] = STATE_PREPARING
+        job["started"] = time.time()
+        self._notify(job)
+
+        if job["files_map"] is not None:
+            files_map = rekey_files_map(job["files_map"], job["id"])
+            prepare_body, _ = build_prepare_body(job["target"], [], job["folders"], job["id"])
+            if files_map or not job["folders"]:
+                prepare_body["files"] = files_map
+        else:
+            prepare_body, files_map = build_prepare_body(job["target"], job["files"], job["folders"], job["id"])
+        pin_param = f"?pin={quote(job['pin'])}" if job["pin"] else ""
+        data, status = await self._post(PREPARE_UPLOAD_PATH + pin_param, prepare_body)
+        if status == 401:
+            raise RuntimeError("PIN required")
+        if status != 200:
+            error = data.get("error") if isinstance(data, dict) else None
+            raise RuntimeError(error or f"Prepare upload failed: {status}")
+        payload = data.get("data") if isinstance(data, dict) else None
+        session_id = str((payload or {}).get("sessionId") or "")
+        tokens = dict((payload or {}).get("files") or {})
+        if not session_id:
+            raise RuntimeError("Prepare upload returned no session")
+
+        job["session_id"] = session_id
+        job["total"] = len(tokens)
+        self._session_jobs[session_id] = job["id"]
+
+        group = self._groups.get(job["group"])
+        if group is not None:
+            job["state"] = STATE_WAITING
+            self._notify(job)
+            async with group["semaphore"]:
+                await self._upload(job, session_id, files_map, tokens)
+        else:
+            await self._upload(job, session_id, files_map, tokens)
+
+    async def _upload(
+        self,
+        job: Dict[str, Any],
+        session_id: str,
+        files_map: Dict[str, Dict[str, Any]],
+        tokens: Dict[str, str],
+    ):
+        job["state"] = STATE_SENDING
+        job["last_progress"] = time.monotonic()
+        self._notify(job)
+        batch_body = build_batch_body(session_id, files_map, tokens, job["folders"])
+        data, status = await self._post(UPLOAD_BATCH_PATH, batch_body)
+        if status not in (200, 207):
+            error = data.get("error") if isinstance(data, dict) else None
+            raise RuntimeError(error or f"Upload batch failed: {status}")
+
+        # The backend reports completion through notifications; fall back to an idle timeout
+        event = self._events[job["id"]]
+        while not event.is_set():
+            try:
+                await asyncio.wait_for(event.wait(), timeout=self.idle_timeout)
+            except asyncio.TimeoutError:
+                if time.monotonic() - job["last_progress"] >= self.idle_timeout:
+                    self._log_info(f"Send job {job['id']}: no progress for {self.idle_timeout:.0f}s")
+                    if not job["total"] or job["completed"] + job["failed"] < job["total"]:
+                        # Files without a result never reached the receiver as far as we know
+                        job["finish_reason"] = "timeout"
+                        job["error"] = f"No progress for {self.idle_timeout:.0f}s"
+                    break
+
+        reason = job.get("finish_reason", "completed")
+        if reason == "cancelled":
+            self._finish(job, STATE_CANCELLED)
+        elif reason != "completed" or (job["failed"] and not job["completed"]):
+            self._finish(job, STATE_FAILED)
+        else:
+            self._finish(job, STATE_DONE)
+
+    # ---- helpers ----------------------------------------------------------
+
+    def _job_for_session(self, session_id: str, file_id: str) -> Optional[Dict[str, Any]]:
+        job_id = self._session_jobs.get(session_id) if session_id else None
+        if job_id is None and file_id:
+            # File ids generated by build_prepare_body start with the job id
+            job_id = file_id.split("-", 1)[0]
+        job = self._jobs.get(job_id) if job_id else None
+        if job is None or job["state"] != STATE_SENDING:
+            return None
+        return job
+
+    def _wake(self, job: Dict[str, Any]):
+        event = self._events.get(job["id"])
+        if event is not None:
+            event.set()
+
+    def _finish(self, job: Dict[str, Any], state: str):
+        if job["state"] in FINAL_STATES:
+            return
+        job["state"] = state
+        job["finished"] = time.time()
+        self._log_info(
+            f"Send job {job['id']} -> {job['target']}: {state} "
+            f"({job['completed']}/{job['total']} sent, {job['failed']} failed)"
+        )
+        self._notify(job)
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["state"] in FINAL_STATES]
+        for job_id in finished[:max(len(finished) - self.max_finished, 0)]:
+            self._jobs.pop(job_id, None)
+        for group_id, group in list(self._groups.items()):
+            if not any(job_id in self._jobs for job_id in group["jobs"]):
+                self._groups.pop(group_id, None)
+
+    def _summary(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": job["id"],
+            "group": job["group"],
+            "target": job["target"],
+            "state": job["state"],
+            "sessionId": job["session_id"],
+            "fileCount": len(job["files"]),
+            "folderCount": len(job["folders"]),
+            "total": job["total"],
+            "completed": job["completed"],
+            "failed": job["failed"],
+            "failedFileIds": list(job["failed_file_ids"]),
+            "error": job["error"],
+            "created": job["created"],
+            "started": job["started"],
+            "finished": job["finished"],
+        }
+
+    def _notify(self, job: Dict[str, Any]):
+        try:
+            payload = {"job": self._summary(job), "queue": self.get_status()}
+            if job["group"]:
+                group = self.get_group(job["group"])
+                if group is not None:
+                    payload["group"] = {key: group[key] for key in ("id", "done", "totals")}
+            self._emit(payload)
+        except Exception as e:
+            self._log_error(f"Failed to emit send queue update: {e}")
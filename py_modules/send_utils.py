@@ -0,0 +1,171 @@
+"""
+Outgoing transfer bookkeeping (prepare-upload / upload-batch).
+Note: This module does NOT use decky directly. Logging is done via callbacks.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+PREPARE_UPLOAD_PATH = "/api/self/v1/prepare-upload"
+UPLOAD_BATCH_PATH = "/api/self/v1/upload-batch"
+
+
+def parse_prepare_upload(response: Any) -> Tuple[str, Dict[str, str]]:
+    """
+    Extract session id and per-file tokens from a prepare-upload response body.
+
+    Returns:
+        Tuple of (session_id, {fileId: token}); session_id is "" if missing
+    """
+    data = response.get("data") if isinstance(response, dict) else None
+    if not isinstance(data, dict):
+        return "", {}
+    return str(data.get("sessionId") or ""), dict(data.get("files") or {})
+
+
+def parse_batch_results(response: Any) -> Tuple[List[str], List[str]]:
+    """
+    Extract succeeded and failed file ids from an upload-batch response body.
+
+    Returns:
+        Tuple of (succeeded ids, failed ids)
+    """
+    result = response.get("result") if isinstance(response, dict) else None
+    if not isinstance(result, dict):
+        return [], []
+    succeeded, failed = [], []
+    for item in result.get("results") or []:
+        file_id = str(item.get("fileId", ""))
+        if not file_id:
+            continue
+        (succeeded if item.get("success") else failed).append(file_id)
+    return succeeded, failed
+
+
+def build_batch_files(files: Dict[str, Dict[str, Any]], tokens: Dict[str, str]) -> List[Dict[str, str]]:
+    """Build the upload-batch "files" list for entries that have a fileUrl."""
+    return [
+        {"fileId": file_id, "token": tokens.get(file_id, ""), "fileUrl": info["fileUrl"]}
+        for file_id, info in files.items()
+        if info.get("fileUrl")
+    ]
+
+
+class OutgoingSessionStore:
+    """Remembers the source files, tokens and per-file results of recent outgoing sessions."""
+
+    def __init__(self, max_sessions: int = 20):
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record_prepare(self, request: Dict[str, Any], response: Any, retry_of: str = "") -> str:
+        """
+        Record a successful prepare-upload.
+
+        Args:
+            request: prepare-upload request body (targetTo, files, folderPaths, ...)
+            response: prepare-upload response body
+            retry_of: Session id this session retries, if any
+
+        Returns:
+            The new session id ("" if the response had none)
+        """
+        session_id, tokens = parse_prepare_upload(response)
+        if not session_id:
+            return ""
+        with self._lock:
+            self._sessions[session_id] = {
+                "session_id": session_id,
+                "target": str(request.get("targetTo", "")),
+                "files": dict(request.get("files") or {}),
+                "folder_paths": list(request.get("folderPaths") or []),
+                "tokens": tokens,
+                "succeeded": [],
+                "failed": [],
+                "retry_of": retry_of,
+                "created": time.time(),
+            }
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def record_batch(self, request: Dict[str, Any], response: Any):
+        """Record the per-file results of an upload-batch call."""
+        session_id = str(request.get("sessionId", ""))
+        succeeded, failed = parse_batch_results(response)
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session["succeeded"] = sorted(set(session["succeeded"]) | set(succeeded))
+            session["failed"] = sorted((set(session["failed"]) | set(failed)) - set(succeeded))
+
+    def record_progress(self, session_id: str, file_id: str, success: bool):
+        """Record a per-file result reported by a send_progress notification."""
+        if not file_id:
+            return
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            if success:
+                session["succeeded"] = sorted(set(session["succeeded"]) | {file_id})
+                session["failed"] = [f for f in session["failed"] if f != file_id]
+            elif file_id not in session["succeeded"] and file_id not in session["failed"]:
+                session["failed"] = sorted(session["failed"] + [file_id])
+
+    def clear_failed(self, session_id: str, file_ids: List[str]):
+        """Forget failures that were since delivered by a retry session."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session["failed"] = [f for f in session["failed"] if f not in set(file_ids)]
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return dict(session) if session is not None else None
+
+    def failed_items(self, session_id: str) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Split the failed files of a session into retryable and unretryable ones.
+
+        Files added through folderPaths get their ids from the backend and have
+        no fileUrl here, so they cannot be resent individually.
+
+        Returns:
+            Tuple of ({fileId: prepare-upload file entry}, [unretryable fileIds])
+        """
+        session = self.get(session_id)
+        if session is None:
+            return {}, []
+        retryable, unretryable = {}, []
+        for file_id in session["failed"]:
+            info = session["files"].get(file_id)
+            if info and info.get("fileUrl"):
+                retryable[file_id] = info
+            else:
+                unretryable.append(file_id)
+        return retryable, unretryable
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """Summaries of remembered sessions, newest first."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return [
+            {
+                "sessionId": s["session_id"],
+                "target": s["target"],
+                "fileCount": len(s["files"]),
+                "folderPaths": s["folder_paths"],
+                "succeeded": len(s["succeeded"]),
+                "failedFileIds": s["failed"],
+                "retryOf": s["retry_of"],
+                "created": s["created"],
+            }
+            for s in reversed(sessions)
+        ]
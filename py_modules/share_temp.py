@@ -0,0 +1,180 @@
+"""
+Lifecycle of temp files shared through Download API sessions (upload_dir/share_temp).
+Note: This module does NOT use decky directly. Logging is done via callbacks.
+
+Text is stored under a name derived from its content hash, so sharing the
+same text again reuses the file. Files referenced by an open share session
+are kept; unreferenced ones are removed once older than the TTL, or oldest
+first when the directory exceeds its byte quota.
+"""
+
+import os
+import time
+import hashlib
+import threading
+from typing import Dict, Any, Callable, Iterable, List, Set
+
+CREATE_SHARE_SESSION_PATH = "/api/self/v1/create-share-session"
+CLOSE_SHARE_SESSION_PATH = "/api/self/v1/close-share-session"
+
+
+class ShareTempStore:
+    """Content-addressed share_temp directory with per-session references and GC."""
+
+    def __init__(
+        self,
+        base_dir: str,
+        ttl: float = 24 * 3600,
+        max_bytes: int = 64 * 1024 * 1024,
+        logger: Callable[[str], None] = None,
+    ):
+        """
+        Args:
+            base_dir: share_temp directory
+            ttl: Seconds an unreferenced file is kept after its last use
+            max_bytes: Byte quota for the directory (0 disables)
+            logger: Optional logging callback for errors
+        """
+        self.base_dir = base_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._log = logger or (lambda msg: None)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Set[str]] = {}
+
+    def write_text(self, text_content: str, file_name: str = "text.txt") -> Dict[str, Any]:
+        """
+        Store text content, reusing an existing file with the same content.
+
+        Returns:
+            { success, path?, reused?, error? }
+        """
+        try:
+            data = text_content.encode("utf-8")
+            ext = os.path.splitext(file_name or "")[1] or ".txt"
+            digest = hashlib.sha256(data).hexdigest()[:32]
+            path = os.path.join(self.base_dir, f"{digest}{ext}")
+            os.makedirs(self.base_dir, exist_ok=True)
+            reused = os.path.isfile(path) and os.path.getsize(path) == len(data)
+            if reused:
+                # Refresh last use for the TTL
+                os.utime(path)
+            else:
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                if self.max_bytes:
+                    self.collect(keep=path)
+            return {"success": True, "path": path, "reused": reused}
+        except Exception as e:
+            self._log(f"Failed to write temp text file: {e}")
+            return {"success": False, "error": str(e)}
+
+    def owns(self, path: str) -> bool:
+        """Check whether path lies inside the share_temp directory."""
+        base = os.path.abspath(self.base_dir)
+        return os.path.abspath(path).startswith(base + os.sep)
+
+    def bind_session(self, session_id: str, paths: Iterable[str]) -> int:
+        """
+        Reference share_temp files from a share session.
+
+        Returns:
+            Number of referenced files
+        """
+        owned = {os.path.abspath(p) for p in paths if self.owns(p)}
+        if not session_id or not owned:
+            return 0
+        with self._lock:
+            self._sessions.setdefault(session_id, set()).update(owned)
+        return len(owned)
+
+    def release_session(self, session_id: str) -> int:
+        """Drop the references of a closed share session; the files become collectable."""
+        with self._lock:
+            paths = self._sessions.pop(session_id, set())
+        now = time.time()
+        for path in paths:
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+        return len(paths)
+
+    def release_all(self) -> int:
+        """Drop every session reference, e.g. when the backend (and its share sessions) went away."""
+        with self._lock:
+            session_ids = list(self._sessions)
+        return sum(self.release_session(session_id) for session_id in session_ids)
+
+    def adopt_sessions(self, other: "ShareTempStore"):
+        """Take over the session references of a store this one replaces."""
+        with other._lock:
+            sessions = {sid: set(paths) for sid, paths in other._sessions.items()}
+        with self._lock:
+            for session_id, paths in sessions.items():
+                self._sessions.setdefault(session_id, set()).update(paths)
+
+    def _referenced(self) -> Set[str]:
+        with self._lock:
+            return set().union(*self._sessions.values()) if self._sessions else set()
+
+    def collect(self, keep: str = "") -> Dict[str, Any]:
+        """
+        Remove unreferenced files past the TTL, then the oldest unreferenced ones over the quota.
+
+        Args:
+            keep: A path that must survive this sweep (e.g. a file about to be shared)
+
+        Returns:
+            { removed, removed_bytes, kept, kept_bytes, referenced }
+        """
+        referenced = self._referenced()
+        if keep:
+            referenced.add(os.path.abspath(keep))
+        now = time.time()
+        entries: List[Dict[str, Any]] = []
+        try:
+            with os.scandir(self.base_dir) as it:
+                for entry in it:
+                    try:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entries.append({"path": os.path.abspath(entry.path), "size": st.st_size, "mtime": st.st_mtime})
+        except FileNotFoundError:
+            return {"removed": 0, "removed_bytes": 0, "kept": 0, "kept_bytes": 0, "referenced": len(referenced)}
+
+        entries.sort(key=lambda e: e["mtime"])
+        total = sum(e["size"] for e in entries)
+        removed, removed_bytes = 0, 0
+        for entry in entries:
+            if entry["path"] in referenced:
+                continue
+            expired = self.ttl > 0 and now - entry["mtime"] > self.ttl
+            over_quota = self.max_bytes > 0 and total > self.max_bytes
+            if not (expired or over_quota):
+                continue
+            try:
+                os.remove(entry["path"])
+            except OSError as e:
+                self._log(f"Failed to remove share temp file {entry['path']}: {e}")
+                continue
+            removed += 1
+            removed_bytes += entry["size"]
+            total -= entry["size"]
+        return {
+            "removed": removed,
+            "removed_bytes": removed_bytes,
+            "kept": len(entries) - removed,
+            "kept_bytes": total,
+            "referenced": len(referenced),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions = {sid: len(paths) for sid, paths in self._sessions.items()}
+        return {"base_dir": self.base_dir, "ttl": self.ttl, "max_bytes": self.max_bytes, "sessions": sessions}
@@ -0,0 +1,201 @@
+"""
+Backend process supervisor.
+Note: This module does NOT use decky directly. All callbacks are passed in.
+"""
+
+import time
+import asyncio
+import subprocess
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Any, Optional
+
+
+class BackendSupervisor:
+    """Watch the backend child process and restart it after unexpected exits."""
+
+    def __init__(
+        self,
+        get_process: Callable[[], Optional[subprocess.Popen]],
+        restart: Callable[[], Awaitable[bool]],
+        on_unexpected_exit: Callable[[Optional[int], bool, float], None] = None,
+        poll_interval: float = 1.0,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        max_restarts: int = 5,
+        crash_window: float = 300.0,
+        stable_after: float = 60.0,
+        logger_info: Callable[[str], None] = None,
+        logger_error: Callable[[str], None] = None,
+        logger_warning: Callable[[str], None] = None,
+    ):
+        """
+        Initialize the supervisor.
+
+        A process that exits while still referenced by get_process() is treated
+        as a crash; an intentional stop is expected to clear the reference first.
+
+        Args:
+            get_process: Callback returning the current backend process (or None)
+            restart: Coroutine factory that starts the backend, returning True when ready
+            on_unexpected_exit: Callback(exit_code, will_restart, delay) fired on each crash
+            poll_interval: Seconds between liveness checks
+            base_delay: First restart delay in seconds (doubles per consecutive crash)
+            max_delay: Upper bound for the restart delay
+            max_restarts: Crashes allowed within crash_window before giving up
+            crash_window: Sliding window in seconds for the crash-loop limit
+            stable_after: Uptime in seconds after which the backoff is reset
+            logger_info: Callback for info logging
+            logger_error: Callback for error logging
+            logger_warning: Callback for warning logging
+        """
+        self._get_process = get_process
+        self._restart = restart
+        self._on_unexpected_exit = on_unexpected_exit or (lambda code, will_restart, delay: None)
+        self.poll_interval = poll_interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_restarts = max_restarts
+        self.crash_window = crash_window
+        self.stable_after = stable_after
+
+        self._log_info = logger_info or (lambda msg: None)
+        self._log_error = logger_error or (lambda msg: None)
+        self._log_warning = logger_warning or (lambda msg: None)
+
+        self._task: Optional[asyncio.Task] = None
+        self._current_pid: Optional[int] = None
+        self._process_started: Optional[float] = None
+        self._crash_times: Deque[float] = deque()
+        self._consecutive_crashes = 0
+        self._gave_up_pid: Optional[int] = None
+
+        # Metrics
+        self.restart_count = 0
+        self.crash_count = 0
+        self.last_exit_code: Optional[int] = None
+        self.last_exit_time: Optional[float] = None
+        self.crash_loop = False
+
+    def is_running(self) -> bool:
+        """Check if the supervisor task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> bool:
+        """
+        Start the supervisor task on the running event loop.
+
+        Returns:
+            True if started (or already running)
+        """
+        if self.is_running():
+            return True
+        self._task = asyncio.ensure_future(self._run())
+        self._log_info("Backend supervisor started")
+        return True
+
+    async def stop(self):
+        """Stop the supervisor task."""
+        if not self.is_running():
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._log_info("Backend supervisor stopped")
+
+    def reset(self):
+        """Clear crash-loop state, e.g. after the user starts the backend manually."""
+        self._crash_times.clear()
+        self._consecutive_crashes = 0
+        self._gave_up_pid = None
+        self.crash_loop = False
+
+    def _observe(self, process: Optional[subprocess.Popen]):
+        pid = process.pid if process is not None else None
+        if pid != self._current_pid:
+            self._current_pid = pid
+            self._process_started = time.monotonic() if pid is not None else None
+        if (
+            self._process_started is not None
+            and self._consecutive_crashes
+            and time.monotonic() - self._process_started >= self.stable_after
+        ):
+            self._consecutive_crashes = 0
+
+    def _next_delay(self) -> float:
+        return min(self.base_delay * (2 ** max(self._consecutive_crashes - 1, 0)), self.max_delay)
+
+    async def _run(self):
+        while True:
+            try:
+                process = self._get_process()
+                self._observe(process)
+                if (
+                    process is not None
+                    and process.poll() is not None
+                    and process.pid != self._gave_up_pid
+                ):
+                    await self._handle_exit(process)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._log_error(f"Backend supervisor error: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _handle_exit(self, process: subprocess.Popen):
+        now = time.monotonic()
+        self.crash_count += 1
+        self._consecutive_crashes += 1
+        self.last_exit_code = process.returncode
+        self.last_exit_time = time.time()
+        self._process_started = None
+
+        self._crash_times.append(now)
+        while self._crash_times and now - self._crash_times[0] > self.crash_window:
+            self._crash_times.popleft()
+
+        if len(self._crash_times) > self.max_restarts:
+            self.crash_loop = True
+            self._gave_up_pid = process.pid
+            self._log_error(
+                f"Backend exited with code {process.returncode}; "
+                f"{len(self._crash_times)} crashes in {self.crash_window:.0f}s, giving up"
+            )
+            self._on_unexpected_exit(process.returncode, False, 0.0)
+            return
+
+        delay = self._next_delay()
+        self._log_warning(
+            f"Backend exited unexpectedly with code {process.returncode}; restarting in {delay:.1f}s"
+        )
+        self._on_unexpected_exit(process.returncode, True, delay)
+        await asyncio.sleep(delay)
+
+        # The backend may have been stopped or restarted by the user meanwhile
+        if self._get_process() is not process:
+            return
+        try:
+            ready = await self._restart()
+            self.restart_count += 1
+            self._log_info(f"Backend restarted by supervisor (ready={ready})")
+        except Exception as e:
+            self._log_error(f"Backend restart failed: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get supervisor metrics."""
+        process = self._get_process()
+        alive = process is not None and process.poll() is None
+        uptime = None
+        if alive and self._process_started is not None and process.pid == self._current_pid:
+            uptime = round(time.monotonic() - self._process_started, 1)
+        return {
+            "supervising": self.is_running(),
+            "uptime": uptime,
+            "restart_count": self.restart_count,
+            "crash_count": self.crash_count,
+            "last_exit_code": self.last_exit_code,
+            "last_exit_time": self.last_exit_time,
+            "crash_loop": self.crash_loop,
+        }
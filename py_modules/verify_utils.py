@@ -0,0 +1,130 @@
+"""
+Post-receive verification of saved files.
+Note: This module does NOT use decky directly. Logging is done via callbacks.
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Any, Callable, List, Optional
+
+LOW_PRIORITY_NICE = 19
+
+
+def lower_thread_priority(nice: int = LOW_PRIORITY_NICE):
+    """
+    Lower the CPU priority of the calling thread (Linux keeps a nice value per thread).
+
+    Meant as a ThreadPoolExecutor initializer; failures are ignored.
+    """
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), nice)
+    except (AttributeError, OSError):
+        pass
+
+
+def verify_received_files(
+    files: List[Dict[str, Any]],
+    checksum: bool = False,
+    hash_cache=None,
+    logger: Callable[[str], None] = None
+) -> Dict[str, Any]:
+    """
+    Check saved files against the sizes (and optional sha256) announced by the sender.
+
+    Args:
+        files: Entries with "fileId", "path", "size" (None = unknown, not checked) and optional "sha256"
+        checksum: Also hash each file with sha256 (compared when the sender announced one)
+        hash_cache: Optional HashCache; digests are read from and stored in it, so a
+                    later dedup pass does not read the files again
+        logger: Optional logging callback for errors
+
+    Returns:
+        { status, checked, ok, mismatched, missing, checksum, verifiedAt, files }
+        where status is "ok", "mismatch" or "missing"; files lists the files that failed
+        (every file, with its digest, when checksum is set)
+    """
+    results = []
+    for item in files:
+        path = item.get("path") or ""
+        expected_size = item.get("size")
+        result: Dict[str, Any] = {"fileId": item.get("fileId", ""), "path": path, "expectedSize": expected_size}
+        try:
+            st = os.stat(path)
+        except OSError:
+            result["status"] = "missing"
+            results.append(result)
+            continue
+        result["size"] = st.st_size
+        ok = expected_size is None or int(expected_size) == st.st_size
+        if checksum and ok:
+            from hash_utils import hash_file  # pyright: ignore[reportMissingImports]
+
+            try:
+                digest = hash_cache.get("sha256", path, st.st_size, st.st_mtime_ns) if hash_cache else None
+                if digest is None:
+                    digest = hash_file(path, "sha256")
+                    if hash_cache is not None:
+                        hash_cache.put("sha256", path, st.st_size, st.st_mtime_ns, digest)
+                result["sha256"] = digest
+                expected_hash = item.get("sha256")
+                if expected_hash:
+                    ok = str(expected_hash).lower() == digest
+            except Exception as e:
+                if logger:
+                    logger(f"Failed to hash {path}: {e}")
+                result["error"] = str(e)
+                ok = False
+        result["status"] = "ok" if ok else "mismatch"
+        results.append(result)
+
+    missing = [r["fileId"] for r in results if r["status"] == "missing"]
+    mismatched = [r["fileId"] for r in results if r["status"] == "mismatch"]
+    if missing:
+        status = "missing"
+    elif mismatched:
+        status = "mismatch"
+    else:
+        status = "ok"
+    return {
+        "status": status,
+        "checked": len(results),
+        "ok": len(results) - len(missing) - len(mismatched),
+        "mismatched": mismatched,
+        "missing": missing,
+        "checksum": checksum,
+        "verifiedAt": time.time(),
+        "files": [r for r in results if r["status"] != "ok"] if not checksum else results,
+    }
+
+
+def build_verify_list(
+    save_paths: Dict[str, str],
+    announced: Dict[str, Dict[str, Any]],
+    skip_ids: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Pair upload_end savePaths with the file metadata announced in upload_start.
+
+    Args:
+        save_paths: {fileId: saved path}
+        announced: {fileId: upload session file record (file_size, sha256?)}
+        skip_ids: File ids to leave out (e.g. failed files)
+
+    Returns:
+        Entries for verify_received_files
+    """
+    skipped = set(skip_ids or [])
+    items = []
+    for file_id, path in save_paths.items():
+        if file_id in skipped:
+            continue
+        info = announced.get(file_id) or {}
+        # upload_start records a missing size as 0; treat it as unknown so it is not a mismatch
+        items.append({
+            "fileId": file_id,
+            "path": path,
+            "size": info.get("file_size") or None,
+            "sha256": info.get("sha256"),
+        })
+    return items
@@ -1,36 +1,239 @@
 import { callable } from "@decky/api";
-import type { BackendStatus } from "../types/backend";
+import type { BackendStatus, BackendStartupHistory, PerfStats, ProfileResult, BackendResources, BackendPriorityStatus } from "../types/backend";
+import type { RegistryDevice } from "../types/devices";
 
 // Backend API
 export const startBackend = callable<[], BackendStatus>("start_backend");
 export const stopBackend = callable<[], BackendStatus>("stop_backend");
 export const getBackendStatus = callable<[], BackendStatus>("get_backend_status");
+export const getBackendStartupHistory = callable<[], BackendStartupHistory>(
+  "get_backend_startup_history"
+);
+
+export const tailBackendLog = callable<
+  [number?, number?],
+  { success: boolean; lines: string[]; offset: number; size?: number; reset?: boolean; error?: string }
+>("tail_backend_log");
+
+export const getBackendResources = callable<[number?], BackendResources>("get_backend_resources");
+export const setForegroundActive = callable<
+  [boolean],
+  { success: boolean; priority?: BackendPriorityStatus; error?: string }
+>("set_foreground_active");
+export const getPerfStats = callable<[boolean?], PerfStats>("get_perf_stats");
+export const startProfiling = callable<
+  ["cpu" | "memory", number?, number?],
+  { success: boolean; kind?: string; duration?: number; started_at?: number; error?: string }
+>("start_profiling");
+export const stopProfiling = callable<[], ProfileResult>("stop_profiling");
 
 // File API
 export const writeTempTextFile = callable<
   [string, string],
-  { success: boolean; path?: string; error?: string }
+  { success: boolean; path?: string; reused?: boolean; error?: string }
 >("write_temp_text_file");
 
+export interface FolderFileEntry {
+  path: string;
+  displayPath: string;
+  fileName: string;
+  size?: number;
+  mtime?: number;
+}
+
 export const listFolderFiles = callable<
   [string],
   {
     success: boolean;
-    files: Array<{ path: string; displayPath: string; fileName: string }>;
+    files: FolderFileEntry[];
     folderName?: string;
     count?: number;
+    bytes?: number;
+    cached?: boolean;
+    rescannedDirs?: number;
     error?: string;
   }
 >("list_folder_files");
 
+export interface SendManifestFile extends FolderFileEntry {
+  hash: string | null;
+  changed?: boolean;
+  error?: string;
+}
+
+export const buildSendManifest = callable<
+  [string, string?, string?],
+  {
+    success: boolean;
+    folderName?: string;
+    algorithm?: string;
+    files: SendManifestFile[];
+    count?: number;
+    bytes?: number;
+    hashedFiles?: number;
+    cachedHashes?: number;
+    elapsedMs?: number;
+    changedFiles?: string[];
+    changedBytes?: number;
+    removedFiles?: string[];
+    hasBaseline?: boolean;
+    error?: string;
+  }
+>("build_send_manifest");
+export const markSendManifestSent = callable<
+  [string, string],
+  { success: boolean; count?: number; error?: string }
+>("mark_send_manifest_sent");
+
+export const getFolderManifestStats = callable<
+  [],
+  { hits: number; misses: number; manifests: number; bytes: number; max_bytes: number }
+>("get_folder_manifest_stats");
+export const clearFolderManifests = callable<[string?], { success: boolean }>(
+  "clear_folder_manifests"
+);
+
+export interface FolderScanPage {
+  success: boolean;
+  scanId?: string;
+  files: FolderFileEntry[];
+  done: boolean;
+  cancelled?: boolean;
+  totals?: { count: number; bytes: number };
+  folderName?: string;
+  error?: string;
+}
+
+export const startFolderScan = callable<[string, number?, boolean?], FolderScanPage>(
+  "start_folder_scan"
+);
+export const nextFolderScanPage = callable<[string], FolderScanPage>("next_folder_scan_page");
+export const cancelFolderScan = callable<[string], { success: boolean; error?: string }>(
+  "cancel_folder_scan"
+);
+
+// Outgoing sessions / resend API
+export interface OutgoingSessionSummary {
+  sessionId: string;
+  target: string;
+  fileCount: number;
+  folderPaths: string[];
+  succeeded: number;
+  failedFileIds: string[];
+  retryOf: string;
+  created: number;
+}
+
+export const getOutgoingSessions = callable<[], OutgoingSessionSummary[]>("get_outgoing_sessions");
+export const retryFailed = callable<
+  [string, string?],
+  {
+    success: boolean;
+    status?: number;
+    sessionId?: string;
+    retried?: number;
+    succeededFileIds?: string[];
+    failedFileIds?: string[];
+    unretryableFileIds?: string[];
+    pinRequired?: boolean;
+    error?: string;
+  }
+>("retry_failed");
+
+// Send queue API
+export interface SendJob {
+  id: string;
+  group: string;
+  target: string;
+  state: "queued" | "preparing" | "waiting" | "sending" | "done" | "failed" | "cancelled";
+  sessionId: string;
+  fileCount: number;
+  folderCount: number;
+  total: number;
+  completed: number;
+  failed: number;
+  failedFileIds: string[];
+  error: string;
+  created: number;
+  started: number | null;
+  finished: number | null;
+}
+
+export interface SendQueueStatus {
+  queued: number;
+  running: number;
+  max_concurrent: number;
+  max_per_target: number;
+}
+
+export const enqueueSend = callable<
+  [string, string[]?, string[]?, string?],
+  { success: boolean; job?: SendJob; error?: string }
+>("enqueue_send");
+export interface FanoutSendGroup {
+  id: string;
+  done: boolean;
+  max_parallel: number;
+  targets: SendJob[];
+  totals: {
+    targets: number;
+    total: number;
+    completed: number;
+    failed: number;
+    targets_done: number;
+    targets_failed: number;
+  };
+  created: number;
+}
+
+export const enqueueFanoutSend = callable<
+  [string[], string[]?, string[]?, string?, number?],
+  { success: boolean; group?: FanoutSendGroup; error?: string }
+>("enqueue_fanout_send");
+export const getFanoutSend = callable<
+  [string],
+  { success: boolean; group?: FanoutSendGroup; error?: string }
+>("get_fanout_send");
+export const cancelSendJob = callable<[string], { success: boolean; error?: string }>(
+  "cancel_send_job"
+);
+export const getSendQueue = callable<[], { status: SendQueueStatus; jobs: SendJob[] }>(
+  "get_send_queue"
+);
+
 // Upload Sessions API
+export const getDevices = callable<[], { devices: RegistryDevice[]; ttl: number }>("get_devices");
+
+export const getEventsSince = callable<
+  [number, number?],
+  {
+    events: { seq: number; time: number; event: string; payload: any }[];
+    last_seq: number;
+    oldest_seq?: number;
+    truncated?: boolean;
+    error?: string;
+  }
+>("get_events_since");
+
 export const getUploadSessions = callable<[], any[]>("get_upload_sessions");
 export const clearUploadSessions = callable<[], { success: boolean }>("clear_upload_sessions");
 
 // Notification API
 export const getNotifyServerStatus = callable<
   [],
-  { running: boolean; socket_path: string; socket_exists: boolean }
+  {
+    running: boolean;
+    socket_path: string;
+    socket_exists: boolean;
+    emit_batches: {
+      batches: number;
+      events: number;
+      avg_batch_size: number | null;
+      max_batch_size: number;
+      last_batch_size: number;
+      pending: number;
+    };
+  }
 >("get_notify_server_status");
 
 // Factory Reset API
@@ -54,6 +257,57 @@ export interface ReceiveHistoryItem {
   successFiles?: number;
   failedFiles?: number;
   failedFileIds?: string[];
+  verification?: ReceiveVerification;
+  dedup?: DedupResult;
+}
+
+export interface DedupResult {
+  checked: number;
+  duplicates: number;
+  reflinked: number;
+  hardlinked: number;
+  bytes_reclaimed: number;
+  errors: number;
+}
+
+export interface ReceivedFile {
+  path: string;
+  name: string;
+  size: number;
+  mtime: number;
+  sessionId: string;
+  peer: string;
+  receivedAt: number;
+  exists: boolean;
+}
+
+export const searchReceivedFiles = callable<
+  [string, number?],
+  { success: boolean; results: ReceivedFile[]; error?: string }
+>("search_received_files");
+
+export const getDedupStats = callable<
+  [],
+  Omit<DedupResult, "checked" | "errors"> & { enabled: boolean; indexed: number; sessions: number }
+>("get_dedup_stats");
+
+export interface ReceiveVerification {
+  status: "ok" | "mismatch" | "missing";
+  checked: number;
+  ok: number;
+  mismatched: string[];
+  missing: string[];
+  checksum: boolean;
+  verifiedAt: number;
+  files: {
+    fileId: string;
+    path: string;
+    expectedSize: number | null;
+    size?: number;
+    sha256?: string;
+    status: "ok" | "mismatch" | "missing";
+    error?: string;
+  }[];
 }
 
 export const getReceiveHistory = callable<[], ReceiveHistoryItem[]>("get_receive_history");
@@ -88,9 +342,25 @@ export const getBackendConfig = callable<
     do_not_make_session_folder: boolean;
     disable_info_logging: boolean;
     scan_timeout: number;
+    log_max_bytes: number;
+    log_backup_count: number;
+    log_compress: boolean;
+    resource_sample_interval: number;
+    verify_checksum: boolean;
+    dedup_received: boolean;
+    free_space_margin_mb: number;
+    low_space_action: "warn" | "reject";
+    priority_policy: "off" | "auto" | "background";
+    priority_foreground_signal: "steam_game" | "manual";
+    background_cpu_affinity: string;
   }
 >("get_backend_config");
 
+export const getConfigCacheStats = callable<
+  [],
+  { hits: number; misses: number; entries: number }
+>("get_config_cache_stats");
+
 export const setBackendConfig = callable<
   [
     {
@@ -113,7 +383,25 @@ export const setBackendConfig = callable<
       do_not_make_session_folder?: boolean;
       disable_info_logging: boolean;
       scan_timeout: number | string;
+      log_max_bytes?: number;
+      log_backup_count?: number;
+      log_compress?: boolean;
+      resource_sample_interval?: number;
+      verify_checksum?: boolean;
+      dedup_received?: boolean;
+      free_space_margin_mb?: number;
+      low_space_action?: "warn" | "reject";
+      priority_policy?: "off" | "auto" | "background";
+      priority_foreground_signal?: "steam_game" | "manual";
+      background_cpu_affinity?: string;
     }
   ],
-  { success: boolean; restarted: boolean; running: boolean; error?: string }
+  {
+    success: boolean;
+    restarted: boolean;
+    running: boolean;
+    restart_fields?: string[];
+    changes?: { plugin: string[]; hot: string[]; restart: string[] };
+    error?: string;
+  }
 >("set_backend_config");
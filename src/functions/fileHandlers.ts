@@ -1,6 +1,6 @@
 import { toaster, openFilePicker, FileSelectionType } from "@decky/api";
 import fileOpener from "../utils/fileOpener";
-import { listFolderFiles } from "./api";
+import { startFolderScan, nextFolderScanPage } from "./api";
 import type { FileInfo } from "../types/file";
 
 export const createFileHandlers = (
@@ -51,25 +51,30 @@ export const createFileHandlers = (
       // Get the real folder path
       const folderPath = result.realpath ?? result.path;
       
-      const folderResult = await listFolderFiles(folderPath);
-      if (!folderResult.success || folderResult.files.length === 0) {
-        throw new Error(folderResult.error || "Folder is empty or inaccessible");
+      // Only totals are needed here, so page through the folder without file entries
+      let page = await startFolderScan(folderPath, 2000, false);
+      while (page.success && !page.done && page.scanId) {
+        page = await nextFolderScanPage(page.scanId);
+      }
+      const count = page.totals?.count ?? 0;
+      if (!page.success || count === 0) {
+        throw new Error(page.error || "Folder is empty or inaccessible");
       }
 
       // Add folder as a single item
       const folderFile: FileInfo = {
         id: `folder-${Date.now()}-${Math.random().toString(16).slice(2)}`,
-        fileName: folderResult.folderName || folderPath.split("/").pop() || "folder",
+        fileName: page.folderName || folderPath.split("/").pop() || "folder",
         sourcePath: folderPath,
         isFolder: true,
         folderPath: folderPath,
-        fileCount: folderResult.count,
+        fileCount: count,
       };
       addFile(folderFile);
 
       toaster.toast({
         title: "Folder selected",
-        body: `${folderResult.count} files from ${folderResult.folderName}`,
+        body: `${count} files from ${page.folderName}`,
       });
     } catch (error) {
       toaster.toast({
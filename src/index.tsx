@@ -899,7 +899,7 @@ export default definePlugin(() => {
     }
   };
 
-  const EmitEventListener = addEventListener("unix_socket_notification", (event: { type?: string; title?: string; message?: string; data?: any }) => {
+  const EmitEventListener = addEventListener("unix_socket_notification", (event: { type?: string; title?: string; message?: string; data?: any; _seq?: number }) => {
     // Handle device discovered/updated events - update device list without toast
     if (event.type === "device_discovered" || event.type === "device_updated") {
       const deviceData = event.data ?? {};
@@ -1,10 +1,117 @@
 type BackendStatus = {
     running: boolean;
     url: string;
+    ready?: boolean;
     error?: string;
+    supervisor?: BackendSupervisorMetrics;
+    priority?: BackendPriorityStatus | null;
   };
 
+type BackendPriorityStatus = {
+    policy: "off" | "auto" | "background";
+    signal: "steam_game" | "manual";
+    background_cpus: string;
+    foreground_active: boolean;
+    profile: "normal" | "background";
+    pid: number | null;
+    applied_at: number | null;
+    errors: Record<string, string>;
+  };
+
+type BackendSupervisorMetrics = {
+    supervising: boolean;
+    uptime: number | null;
+    restart_count: number;
+    crash_count: number;
+    last_exit_code: number | null;
+    last_exit_time: number | null;
+    crash_loop: boolean;
+  };
+
+type BackendStartupRecord = {
+    timestamp: number;
+    ready: boolean;
+    time_to_ready_ms: number;
+    reason: string;
+    pid: number | null;
+  };
+
+type BackendStartupHistory = {
+    history: BackendStartupRecord[];
+    summary: {
+      count: number;
+      failures: number;
+      min_ms: number | null;
+      avg_ms: number | null;
+      max_ms: number | null;
+    };
+  };
+
+
+
 
+type PerfSeries = {
+    calls: number;
+    errors: number;
+    total_ms: number;
+    avg_ms: number | null;
+    max_ms: number;
+    p50_ms: number | null;
+    p95_ms: number | null;
+    p99_ms: number | null;
+    buckets: number[];
+  };
+
+type PerfStats = {
+    enabled: boolean;
+    since: number;
+    bucket_bounds_ms: number[];
+    calls: Record<string, PerfSeries>;
+    upload_end: { session_id: string; finished: number; timings_ms: Record<string, number> }[];
+  };
+
+type ProfileResult = {
+    success: boolean;
+    kind?: "cpu" | "memory";
+    duration?: number;
+    path?: string;
+    summary?: Record<string, string | number>[];
+    error?: string;
+  };
+
+type BackendResourceSample = {
+    time: number;
+    pid: number;
+    cpu_percent: number | null;
+    rss_bytes: number | null;
+    threads: number;
+    read_bytes_per_sec: number | null;
+    write_bytes_per_sec: number | null;
+  };
 
+type BackendResources = {
+    running: boolean;
+    interval: number;
+    capacity?: number;
+    latest: BackendResourceSample | null;
+    samples: BackendResourceSample[];
+    summary?: {
+      count: number;
+      avg_cpu_percent: number | null;
+      max_cpu_percent: number | null;
+      max_rss_bytes: number | null;
+    };
+  };
 
-export type { BackendStatus };
\ No newline at end of file
+export type {
+  BackendStatus,
+  BackendSupervisorMetrics,
+  BackendPriorityStatus,
+  BackendStartupRecord,
+  BackendStartupHistory,
+  PerfSeries,
+  PerfStats,
+  ProfileResult,
+  BackendResourceSample,
+  BackendResources,
+};
\ No newline at end of file
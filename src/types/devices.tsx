@@ -9,6 +9,13 @@
     protocol?: string;
   };
 
+  type RegistryDevice = ScanDevice & {
+    fingerprint: string;
+    firstSeen: number;
+    lastSeen: number;
+    seenCount: number;
+  };
+
   type NetworkInfo = {
     interface_name: string;
     ip_address: string;
@@ -16,4 +23,4 @@
     number_int: number;
   };
   
-export type { ScanDevice, NetworkInfo };
\ No newline at end of file
+export type { ScanDevice, RegistryDevice, NetworkInfo };
\ No newline at end of file
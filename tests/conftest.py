@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Plugin helper modules are imported by name, as Decky puts py_modules on sys.path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "py_modules"))
@@ -0,0 +1,12 @@
+import json
+
+from config_utils import load_json_settings
+
+
+def test_nested_changes_do_not_leak_into_the_cache(tmp_path):
+    path = tmp_path / "baselines.json"
+    path.write_text(json.dumps({"peer": {"folder": {"a": "1"}}}))
+    first = load_json_settings(str(path), {})
+    first.setdefault("peer", {})["other"] = {"b": "2"}
+    first["peer"]["folder"]["a"] = "changed"
+    assert load_json_settings(str(path), {}) == {"peer": {"folder": {"a": "1"}}}
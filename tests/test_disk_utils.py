@@ -0,0 +1,42 @@
+import time
+
+from disk_utils import FreeSpaceChecker, receive_cancel_path
+
+
+def test_reject_uses_receiver_cancel_endpoint():
+    # /api/self/v1/cancel cancels our own outgoing sends, not an incoming session
+    assert receive_cancel_path("a b/1") == "/api/localsend/v2/cancel?sessionId=a%20b/1"
+
+
+def test_burst_of_sessions_is_checked_against_reservations(tmp_path, monkeypatch):
+    checker = FreeSpaceChecker(ttl=60)
+    monkeypatch.setattr(checker, "free_bytes", lambda path: 1000)
+    first = checker.check(str(tmp_path / "s1"), 600, margin=100, reserve_as="s1")
+    second = checker.check(str(tmp_path / "s2"), 600, margin=100, reserve_as="s2")
+    assert first["ok"] is True
+    assert second["ok"] is False and second["reserved"] == 600
+    assert checker.get_reservations() == {"s1": 600}
+
+    assert checker.release("s1") == 600
+    assert checker.check(str(tmp_path / "s2"), 600, margin=100, reserve_as="s2")["ok"] is True
+
+
+def test_written_bytes_are_not_reserved_twice(tmp_path, monkeypatch):
+    checker = FreeSpaceChecker(ttl=0)
+    free = {"bytes": 1000}
+    monkeypatch.setattr(checker, "free_bytes", lambda path: free["bytes"])
+    assert checker.check(str(tmp_path / "s1"), 600, reserve_as="s1")["ok"] is True
+
+    # s1 has written 500 of its 600 bytes
+    free["bytes"] = 500
+    second = checker.check(str(tmp_path / "s2"), 400, reserve_as="s2")
+    assert second["ok"] is True and second["reserved"] == 100
+
+
+def test_stale_reservations_expire(tmp_path, monkeypatch):
+    checker = FreeSpaceChecker(ttl=60, max_age=0.01)
+    monkeypatch.setattr(checker, "free_bytes", lambda path: 1000)
+    checker.check(str(tmp_path / "s1"), 900, reserve_as="s1")
+    time.sleep(0.02)
+    assert checker.check(str(tmp_path / "s2"), 900)["ok"] is True
+    assert checker.get_reservations() == {}
@@ -0,0 +1,31 @@
+import asyncio
+import threading
+
+from emit_batcher import EmitBatcher
+
+
+def test_loop_and_thread_emits_keep_submission_order():
+    async def run():
+        loop = asyncio.get_running_loop()
+        emitted = []
+
+        async def emit(event, payload):
+            # Yield mid-batch so a later batch could overtake an unordered emitter
+            await asyncio.sleep(0)
+            emitted.append(payload)
+
+        batcher = EmitBatcher(emit, get_loop=lambda: loop)
+        batcher.submit("e", 0)
+        thread = threading.Thread(target=lambda: batcher.submit("e", 1))
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+        batcher.submit("e", 2)
+        for _ in range(20):
+            await asyncio.sleep(0)
+        batcher.submit("e", 3)
+        await asyncio.sleep(0.05)
+        assert emitted == [0, 1, 2, 3]
+        assert batcher.get_metrics()["pending"] == 0
+
+    asyncio.run(run())
@@ -0,0 +1,29 @@
+from event_log import EventLog
+
+
+def test_chatty_burst_does_not_evict_main_events():
+    log = EventLog(capacity=3, chatty_capacity=2)
+    first = log.append("file_received", {"sessionId": "s1"})
+    for index in range(50):
+        log.append("unix_socket_notification", {"type": "device_discovered", "n": index}, chatty=True)
+    result = log.since(0)
+    assert [e["seq"] for e in result["events"]] == [first, 50, 51]
+    assert result["truncated"] is False
+
+
+def test_main_ring_eviction_sets_truncated():
+    log = EventLog(capacity=2, chatty_capacity=2)
+    for index in range(3):
+        log.append("file_received", {"n": index})
+    assert log.since(0)["truncated"] is True
+    assert log.since(1)["truncated"] is False
+
+
+def test_text_is_stored_as_capped_preview():
+    log = EventLog(max_text_chars=4)
+    payload = {"content": "abcdefgh", "data": {"content": "12345678"}}
+    log.append("text_received", payload)
+    stored = log.since(0)["events"][0]["payload"]
+    assert stored["content"] == "abcd" and stored["contentTruncated"] is True
+    assert stored["data"]["content"] == "1234"
+    assert payload["content"] == "abcdefgh"
@@ -0,0 +1,83 @@
+import asyncio
+import itertools
+
+from send_queue import PREPARE_UPLOAD_PATH, SendQueue, STATE_DONE, STATE_FAILED
+
+
+def _fake_backend(files_per_job: int):
+    sessions = itertools.count(1)
+
+    async def post(path, body):
+        if path.startswith(PREPARE_UPLOAD_PATH):
+            tokens = {file_id: "token" for file_id in body["files"]}
+            assert len(tokens) == files_per_job
+            return {"data": {"sessionId": f"s{next(sessions)}", "files": tokens}}, 200
+        return {}, 200
+
+    return post
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_event_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_event_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+def test_fanout_idle_timeout_fails_job_without_progress():
+    async def run():
+        queue = SendQueue(_fake_backend(2), idle_timeout=0.2)
+        group = queue.submit_fanout(["a", "b", "c"], files=["/x/1", "/x/2"], max_parallel=3)
+        jobs = {job["target"]: job for job in queue.get_jobs()}
+        await _wait_for(lambda: all(j["state"] == "sending" for j in queue.get_jobs()))
+        for target in ("a", "b"):
+            job = queue._jobs[jobs[target]["id"]]
+            for index in range(2):
+                queue.handle_notification("send_progress", {"sessionId": job["session_id"], "fileId": f"{job['id']}-{index}", "success": True})
+        await _wait_for(lambda: queue.get_group(group["id"])["done"])
+        states = {job["target"]: job for job in queue.get_group(group["id"])["targets"]}
+        assert states["a"]["state"] == STATE_DONE
+        assert states["b"]["state"] == STATE_DONE
+        assert states["c"]["state"] == STATE_FAILED
+        assert states["c"]["error"]
+
+    asyncio.run(run())
+
+
+def test_idle_timeout_with_every_file_reported_is_done():
+    async def run():
+        queue = SendQueue(_fake_backend(1), idle_timeout=0.1)
+        job = queue.submit("a", files=["/x/1"])
+        await _wait_for(lambda: queue._jobs[job["id"]]["state"] == "sending")
+        internal = queue._jobs[job["id"]]
+        # A failed result still counts as reported
+        queue.handle_notification("send_progress", {"sessionId": internal["session_id"], "fileId": "x", "success": False})
+        await _wait_for(lambda: internal["state"] in (STATE_DONE, STATE_FAILED))
+        assert internal["state"] == STATE_FAILED  # nothing completed
+        assert "No progress" not in internal["error"]
+
+    asyncio.run(run())
+
+
+def test_fanout_file_ids_route_to_their_job_without_session():
+    async def run():
+        batches = []
+        backend = _fake_backend(2)
+
+        async def post(path, body):
+            if "sessionId" in body:
+                batches.append(body)
+            return await backend(path, body)
+
+        queue = SendQueue(post, idle_timeout=5)
+        group = queue.submit_fanout(["a", "b"], files=["/x/1", "/x/2"], max_parallel=2)
+        await _wait_for(lambda: len(batches) == 2)
+        for batch in batches:
+            for entry in batch["files"]:
+                queue.handle_notification("send_progress", {"fileId": entry["fileId"], "success": True})
+        await _wait_for(lambda: queue.get_group(group["id"])["done"])
+        targets = queue.get_group(group["id"])["targets"]
+        assert [job["state"] for job in targets] == [STATE_DONE, STATE_DONE]
+        assert all(job["completed"] == 2 for job in targets)
+
+    asyncio.run(run())
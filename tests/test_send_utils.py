@@ -0,0 +1,16 @@
+from send_utils import OutgoingSessionStore
+
+
+def test_send_progress_failures_are_retryable():
+    store = OutgoingSessionStore()
+    request = {"targetTo": "peer", "files": {"f1": {"fileUrl": "file:///a"}, "f2": {"fileUrl": "file:///b"}}}
+    store.record_prepare(request, {"data": {"sessionId": "s1", "files": {"f1": "t1", "f2": "t2"}}})
+    # upload-batch returned before the transfers finished
+    store.record_batch({"sessionId": "s1"}, {"result": {"results": []}})
+
+    store.record_progress("s1", "f1", True)
+    store.record_progress("s1", "f2", False)
+
+    retryable, unretryable = store.failed_items("s1")
+    assert list(retryable) == ["f2"] and unretryable == []
+    assert store.get("s1")["succeeded"] == ["f1"]